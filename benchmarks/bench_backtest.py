@@ -0,0 +1,48 @@
+"""
+Year-long rolling-origin backtest: warm vs cold fits, 1 vs N workers.
+
+Backtests the harmonic forecaster with daily cutoffs over 365 days of
+hourly data (after a 30-day initial window), forecasting 24 hours per
+fold. Reports wall time per configuration and the overall error summary.
+
+Usage:
+    python benchmarks/bench_backtest.py [--backend harmonic] [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.backtest import backtest, summarize_backtest  # noqa: E402
+from src.data_generator import generate_scenario_data  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--backend', default='harmonic')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    history = generate_scenario_data(days=395, seed=0)[['ds', 'y']]
+    table = None
+    for warm_start in (False, True):
+        for workers in sorted({1, args.workers}):
+            start = time.perf_counter()
+            table = backtest(
+                history, horizon=24, initial=24 * 30, step=24,
+                workers=workers, backend=args.backend, warm_start=warm_start
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"warm_start={warm_start!s:>5} workers={workers:>2} "
+                f"folds={table['fold'].nunique()} {elapsed:8.2f}s"
+            )
+    print(summarize_backtest(table, by=None).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
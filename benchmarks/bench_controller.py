@@ -0,0 +1,45 @@
+"""
+Per-tick latency of the online dispatch controller.
+
+Replays a recording (CSV, Parquet or Arrow with 'net_load' and 'price'
+columns) through OnlineDispatchController one sample at a time and
+reports step() latency percentiles. Without a path, a synthetic one-year
+5-minute recording is used.
+
+Usage:
+    python benchmarks/bench_controller.py [recording] [--window 168]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from bench_dispatch import make_inputs  # noqa: E402
+from src.controller import OnlineDispatchController, replay  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('recording', nargs='?')
+    parser.add_argument('--window', type=int, default=168,
+                        help="threshold window in samples; 0 = P-square")
+    args = parser.parse_args(argv)
+
+    if args.recording:
+        source = args.recording
+    else:
+        net_load, prices = make_inputs(12 * 24 * 365)
+        source = net_load.to_frame('net_load').assign(price=prices)
+
+    controller = OnlineDispatchController(window=args.window or None)
+    results, latency = replay(source, controller)
+    print(f"ticks: {len(results):,}  window: {args.window or 'P-square'}")
+    for name, micros in latency.items():
+        print(f"{name:>6}: {micros:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Cost of rainflow degradation accounting on a battery sweep.
+
+Runs optimize_dispatch_batch for 10k battery configurations over one
+month of hourly data, then rainflow-counts every SoC trace and prices
+the wear (DispatchBatchResult.summary). Reports both times, with the
+Numba kernel and, on a subset, with the pure-Python one.
+
+Usage:
+    python benchmarks/bench_degradation.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.metrics import NUMBA_AVAILABLE, batch_cycle_metrics  # noqa: E402
+from src.optimizer import GridOptimizer  # noqa: E402
+from bench_dispatch import make_inputs  # noqa: E402
+
+N_HOURS = 24 * 30
+N_CONFIGS = 10_000
+PYTHON_CONFIGS = 500
+
+
+def main():
+    net_load, prices = make_inputs(N_HOURS)
+    rng = np.random.default_rng(0)
+    capacity = rng.uniform(50, 400, N_CONFIGS)
+    power = rng.uniform(10, 100, N_CONFIGS)
+
+    start = time.perf_counter()
+    batch = GridOptimizer().optimize_dispatch_batch(
+        net_load, prices, battery_capacity=capacity, max_power=power
+    )
+    dispatch_seconds = time.perf_counter() - start
+    print(f"dispatch of {N_CONFIGS} configs: {dispatch_seconds:.3f}s")
+
+    batch_cycle_metrics(batch.soc[:2], capacity[:2])  # JIT warm-up
+    start = time.perf_counter()
+    table = batch.summary(prices)
+    seconds = time.perf_counter() - start
+    kernel = 'numba' if NUMBA_AVAILABLE else 'python'
+    print(
+        f"cost + rainflow degradation ({kernel}): {seconds:.3f}s "
+        f"({seconds / dispatch_seconds:.0%} of dispatch)"
+    )
+
+    start = time.perf_counter()
+    batch_cycle_metrics(
+        batch.soc[:PYTHON_CONFIGS], capacity[:PYTHON_CONFIGS],
+        use_numba=False
+    )
+    per_trace = (time.perf_counter() - start) / PYTHON_CONFIGS
+    print(
+        f"pure-Python kernel: {per_trace * 1e3:.2f} ms/trace "
+        f"(~{per_trace * N_CONFIGS:.1f}s for {N_CONFIGS})"
+    )
+    print(table[['cost', 'equivalent_full_cycles',
+                 'degradation_cost']].describe().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Throughput benchmark for the battery dispatch kernel.
+
+Times GridOptimizer.optimize_dispatch on random net-load/price series of
+increasing length and reports simulated hours per second for the pure
+NumPy kernel and (when installed) the Numba-compiled kernel.
+
+Usage:
+    python benchmarks/bench_dispatch.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.optimizer import GridOptimizer, NUMBA_AVAILABLE  # noqa: E402
+
+# 1 day, 1 month, 1 year hourly, 1 year at 5-minute resolution.
+HORIZONS = [24, 24 * 30, 24 * 365, 12 * 24 * 365]
+
+
+def make_inputs(n, seed=0):
+    """Builds a synthetic daily-periodic net load and price series."""
+    rng = np.random.default_rng(seed)
+    hours = np.arange(n) % 24
+    net_load = pd.Series(
+        300 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 80, n)
+    )
+    prices = pd.Series(
+        0.1 + 0.05 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 0.01, n)
+    )
+    return net_load, prices
+
+
+def best_of(func, repeats=5):
+    """Returns the fastest wall time of several calls, in seconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    engines = {'numpy': False}
+    if NUMBA_AVAILABLE:
+        engines['numba'] = True
+
+    print(f"{'engine':>8} {'hours':>10} {'seconds':>10} {'hours/sec':>14}")
+    for name, use_numba in engines.items():
+        optimizer = GridOptimizer(use_numba=use_numba)
+        # Warm-up call so JIT compilation is not part of the timing.
+        optimizer.optimize_dispatch(*make_inputs(24))
+        for n in HORIZONS:
+            net_load, prices = make_inputs(n)
+            seconds = best_of(
+                lambda: optimizer.optimize_dispatch(net_load, prices)
+            )
+            print(f"{name:>8} {n:>10} {seconds:>10.5f} {n / seconds:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
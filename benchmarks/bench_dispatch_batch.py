@@ -0,0 +1,61 @@
+"""
+Benchmark for batched multi-battery dispatch.
+
+Compares sweeping battery configurations one GridOptimizer at a time with
+a single GridOptimizer.optimize_dispatch_batch call over the same
+one-month hourly net-load profile.
+
+Usage:
+    python benchmarks/bench_dispatch_batch.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.optimizer import GridOptimizer  # noqa: E402
+from bench_dispatch import make_inputs  # noqa: E402
+
+N_HOURS = 24 * 30
+SWEEP_SIZES = [10, 100, 1000, 10000]
+LOOP_CONFIGS = 10
+
+
+def main():
+    net_load, prices = make_inputs(N_HOURS)
+    rng = np.random.default_rng(0)
+
+    # Baseline: a handful of separate optimizers, one loop each.
+    # (One warm-up call first so JIT compilation is not timed.)
+    GridOptimizer().optimize_dispatch(net_load, prices)
+    start = time.perf_counter()
+    for capacity in np.linspace(50, 200, LOOP_CONFIGS):
+        GridOptimizer(battery_capacity=capacity).optimize_dispatch(
+            net_load, prices
+        )
+    loop_seconds = time.perf_counter() - start
+    print(f"{LOOP_CONFIGS} separate optimize_dispatch calls: "
+          f"{loop_seconds:.4f}s")
+
+    optimizer = GridOptimizer()
+    print(f"{'configs':>8} {'seconds':>10} {'configs/sec':>14}")
+    for n_configs in SWEEP_SIZES:
+        capacity = rng.uniform(50, 400, n_configs)
+        power = rng.uniform(10, 100, n_configs)
+        efficiency = rng.uniform(0.8, 0.95, n_configs)
+        start = time.perf_counter()
+        optimizer.optimize_dispatch_batch(
+            net_load, prices, battery_capacity=capacity,
+            max_power=power, efficiency=efficiency
+        )
+        seconds = time.perf_counter() - start
+        print(f"{n_configs:>8} {seconds:>10.4f} {n_configs / seconds:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Cost and runtime of the exact dispatch methods against the heuristic.
+
+Runs GridOptimizer with method='heuristic', 'lp' and 'dp' on the same
+synthetic TOU-priced profile and reports the total grid cost and the
+solve time for a one-month and a one-year hourly horizon.
+
+Usage:
+    python benchmarks/bench_exact.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.optimizer import GridOptimizer  # noqa: E402
+
+HORIZONS = [24 * 30, 24 * 365]
+METHODS = ['heuristic', 'lp', 'dp']
+
+
+def make_inputs(n, seed=0):
+    """Builds a net-load profile priced with the three-tier TOU tariff."""
+    rng = np.random.default_rng(seed)
+    hours = np.arange(n) % 24
+    net_load = pd.Series(
+        500 + 100 * np.sin(2 * np.pi * hours / 24 - np.pi / 2)
+        - 150 * np.maximum(np.sin(np.pi * (hours - 6) / 12), 0)
+        + rng.normal(0, 40, n)
+    )
+    tiers = np.select(
+        [(hours >= 16) & (hours < 20), (hours >= 6) & (hours < 22)],
+        [0.20, 0.10], 0.05
+    )
+    prices = pd.Series(np.maximum(tiers + rng.normal(0, 0.005, n), 0.01))
+    return net_load, prices
+
+
+def main():
+    # Warm-up so imports and JIT compilation are not part of the timings.
+    for method in METHODS:
+        GridOptimizer(method=method).optimize_dispatch(*make_inputs(48))
+
+    print(f"{'method':>10} {'hours':>7} {'seconds':>9} {'cost ($)':>14} "
+          f"{'vs heuristic':>13}")
+    for n in HORIZONS:
+        net_load, prices = make_inputs(n)
+        baseline = None
+        for method in METHODS:
+            optimizer = GridOptimizer(method=method)
+            start = time.perf_counter()
+            results = optimizer.optimize_dispatch(net_load, prices)
+            seconds = time.perf_counter() - start
+            cost = float((results['grid_import'] * prices).sum())
+            if baseline is None:
+                baseline = cost
+            print(f"{method:>10} {n:>7} {seconds:>9.3f} {cost:>14,.2f} "
+                  f"{cost - baseline:>13,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Scaling benchmark for forecast_many across worker counts.
+
+Fits one forecaster per synthetic feeder history and reports the wall
+time and speedup for an increasing number of worker processes.
+
+Usage:
+    python benchmarks/bench_forecast_many.py [backend] [n_series]
+"""
+import logging
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.data_generator import generate_demand_data  # noqa: E402
+from src.forecaster import forecast_many  # noqa: E402
+
+
+def main():
+    backend = sys.argv[1] if len(sys.argv) > 1 else 'prophet'
+    n_series = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    logging.getLogger('cmdstanpy').disabled = True
+    warnings.filterwarnings("ignore")
+
+    np.random.seed(0)
+    series = {i: generate_demand_data(days=30) for i in range(n_series)}
+
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    baseline = None
+    print(f"{n_series} series, backend={backend}")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'failed':>7}")
+    for workers in worker_counts:
+        start = time.perf_counter()
+        failed = sum(
+            result.error is not None
+            for result in forecast_many(series, horizon=24 * 7,
+                                        workers=workers, backend=backend)
+        )
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print(f"{workers:>8} {seconds:>9.2f} {baseline / seconds:>8.2f} "
+              f"{failed:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Throughput and peak memory of load_metered_data() on a large file.
+
+Writes a synthetic 1-second-resolution recording (demand, solar, wind,
+price) to CSV or Parquet once, then loads it onto an hourly grid in
+chunks. Reports file size, rows/s and the process's peak RSS, which
+stays bounded whatever the file size. The default 40M rows make a
+~3.4 GiB CSV or ~1.3 GiB Parquet file; the file is written in a child
+process so that writing it does not count towards the peak.
+
+Usage:
+    python benchmarks/bench_ingest.py [--rows 40000000] [--format csv]
+        [--chunksize 1000000] [--path FILE]
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.data_generator import iter_scenario_chunks  # noqa: E402
+from src.ingest import load_metered_data  # noqa: E402
+
+
+def write_recording(path, rows, fmt):
+    """Streams a synthetic 1-second recording to path."""
+    chunks = iter_scenario_chunks(
+        freq='1s', periods=rows, chunk_size=1_000_000, seed=0
+    )
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    writer_class = pa_csv.CSVWriter if fmt == 'csv' else pq.ParquetWriter
+    writer = None
+    for chunk in chunks:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = writer_class(path, table.schema)
+        writer.write_table(table)
+    writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=40_000_000)
+    parser.add_argument('--format', choices=('csv', 'parquet'),
+                        default='csv')
+    parser.add_argument('--chunksize', type=int, default=1_000_000)
+    parser.add_argument('--path', help="Reuse (or keep) this file.")
+    args = parser.parse_args(argv)
+
+    path = args.path or os.path.join(
+        tempfile.gettempdir(), f"bench_ingest_{args.rows}.{args.format}"
+    )
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        # In a child process, so writing does not count towards peak RSS.
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pool.submit(write_recording, path, args.rows, args.format).result()
+        print(f"Wrote {path} in {time.perf_counter() - start:.1f}s")
+    size = os.path.getsize(path)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    frame = load_metered_data(path, freq='h', chunksize=args.chunksize)
+    report = frame.attrs['ingest']
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    print(f"Peak RSS before loading: {baseline / 2 ** 20:.0f} MiB")
+    print(
+        f"{report['rows_read']:,} rows ({size / 2 ** 30:.2f} GiB) -> "
+        f"{len(frame):,} hourly rows in {report['seconds']:.1f}s: "
+        f"{report['rows_per_second']:,.0f} rows/s, "
+        f"{size / report['seconds'] / 2 ** 20:.0f} MiB/s, "
+        f"peak RSS {peak / 2 ** 20:.0f} MiB"
+    )
+    if not args.path:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Memory per simulated hour of default vs compact simulation runs.
+
+For each horizon, runs SmartGridSimulation with the harmonic forecaster
+in the default (float64) and compact (float32, no duplicate columns, no
+split copies) modes. Reports the bytes per simulated hour of the
+returned frame and the tracemalloc peak of the whole run.
+
+Usage:
+    python benchmarks/bench_memory.py
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.forecaster import DemandForecaster  # noqa: E402
+from src.simulation import SmartGridSimulation, memory_report  # noqa: E402
+
+HORIZON_DAYS = [30, 365, 730]
+
+
+def measure(days, compact):
+    """Returns (results bytes/hour, peak traced bytes/hour) of one run."""
+    sim = SmartGridSimulation(
+        simulation_days=days, forecaster=DemandForecaster(backend='harmonic'),
+        seed=0, verbose=False, compact=compact
+    )
+    tracemalloc.start()
+    results = sim.run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    report = memory_report(results)
+    return report['bytes_per_hour'], peak / report['hours']
+
+
+def main():
+    measure(2, False)  # Warm-up: imports and JIT compilation.
+    measure(2, True)
+    print(f"{'days':>6} {'mode':>8} {'result B/h':>11} {'peak B/h':>10}")
+    for days in HORIZON_DAYS:
+        for compact in (False, True):
+            result, peak = measure(days, compact)
+            mode = 'compact' if compact else 'default'
+            print(f"{days:>6} {mode:>8} {result:>11.1f} {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Single-pass scenario builder vs four generators plus three merges.
+
+Builds the same four signals (demand, solar, wind, price) both ways and
+reports wall time and traced peak memory for 1M+ hourly rows.
+
+Usage:
+    python benchmarks/bench_scenario_builder.py [rows]
+"""
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.data_generator import (  # noqa: E402
+    generate_demand_data,
+    generate_price_data,
+    generate_scenario_data,
+    generate_solar_data,
+    generate_wind_data,
+)
+
+
+def four_generators_and_merges(days):
+    """The previous SmartGridSimulation.run data path."""
+    demand = generate_demand_data(days=days)
+    solar = generate_solar_data(days=days)
+    wind = generate_wind_data(days=days)
+    prices = generate_price_data(days=days)
+    return demand.merge(solar, on='ds').merge(
+        wind, on='ds'
+    ).merge(prices, on='ds')
+
+
+def single_pass(days):
+    return generate_scenario_data(days=days, seed=0)
+
+
+def measure(func, days):
+    """Returns (seconds, peak traced MB, rows) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = len(func(days))
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6, rows
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    days = -(-rows // 24)
+
+    print(f"{'method':>28} {'rows':>10} {'seconds':>9} {'peak MB':>9}")
+    for name, func in [('four generators + merges', four_generators_and_merges),
+                       ('single-pass builder', single_pass)]:
+        seconds, peak_mb, n = measure(func, days)
+        print(f"{name:>28} {n:>10} {seconds:>9.3f} {peak_mb:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
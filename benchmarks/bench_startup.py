@@ -0,0 +1,55 @@
+"""
+Start-up time of the package and its entry points.
+
+Runs each import statement in a fresh interpreter several times and
+reports the median wall time. Exits non-zero when 'import src' is slower
+than the given bound.
+
+Usage:
+    python benchmarks/bench_startup.py [max_seconds]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+REPEATS = 5
+STATEMENTS = [
+    "pass",
+    "import src",
+    "from src import GridOptimizer",
+    "from src import generate_demand_data",
+    "from src import SmartGridSimulation",
+    "from src import DemandForecaster; DemandForecaster()",
+]
+
+
+def median_seconds(code):
+    """Median wall time of running 'code' in a fresh interpreter."""
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    max_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    results = {}
+    for code in STATEMENTS:
+        results[code] = median_seconds(code)
+        print(f"{results[code]:8.3f}s  {code}")
+
+    if results["import src"] > max_seconds:
+        print(f"FAIL: 'import src' took longer than {max_seconds:.2f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
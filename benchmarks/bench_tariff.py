@@ -0,0 +1,81 @@
+"""
+Throughput of the tariff engine.
+
+Bills a year of 1-minute smart-meter data (energy rates, real-time
+prices and two demand-charge tiers) and a battery sweep of 10k one-month
+hourly import profiles in one call each.
+
+Usage:
+    python benchmarks/bench_tariff.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.optimizer import GridOptimizer  # noqa: E402
+from src.tariff import Tariff, TariffPeriod  # noqa: E402
+from bench_dispatch import make_inputs  # noqa: E402
+
+N_CONFIGS = 10_000
+N_HOURS = 24 * 30
+
+
+def make_tariff(start, periods):
+    rng = np.random.default_rng(0)
+    real_time = pd.Series(
+        rng.normal(0, 0.01, periods),
+        index=pd.date_range(start, periods=periods, freq='5min')
+    )
+    return Tariff(
+        base_rate=0.08,
+        energy=[
+            TariffPeriod(0.12, hours=(7, 23)),
+            TariffPeriod(0.25, hours=(16, 21), months=range(6, 10),
+                         day_types=('weekday',)),
+        ],
+        demand=[TariffPeriod(12.0), TariffPeriod(8.0, hours=(16, 21))],
+        real_time=real_time,
+        holidays=['2023-01-02', '2023-07-04', '2023-12-25'],
+    )
+
+
+def main():
+    ds = pd.date_range('2023-01-01', '2023-12-31 23:59', freq='min')
+    rng = np.random.default_rng(1)
+    load = rng.normal(500, 100, len(ds))
+    tariff = make_tariff(ds[0], len(ds) // 5)
+
+    start = time.perf_counter()
+    monthly = tariff.monthly_bill(ds, load)
+    seconds = time.perf_counter() - start
+    print(
+        f"1-minute year ({len(ds):,} samples): {seconds * 1e3:.0f} ms "
+        f"({len(ds) / seconds / 1e6:.1f}M samples/s)"
+    )
+    print(monthly.round(0).to_string())
+
+    net_load, prices = make_inputs(N_HOURS)
+    hours = pd.date_range('2023-06-01', periods=N_HOURS, freq='h')
+    batch = GridOptimizer().optimize_dispatch_batch(
+        net_load, prices,
+        battery_capacity=rng.uniform(50, 400, N_CONFIGS)
+    )
+    start = time.perf_counter()
+    bills = tariff.bill(hours, batch.grid_import)
+    seconds = time.perf_counter() - start
+    print(
+        f"{N_CONFIGS} one-month profiles: {seconds * 1e3:.0f} ms "
+        f"({seconds / N_CONFIGS * 1e6:.1f} us/profile)"
+    )
+    print(bills.describe().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cold vs warm-started refit times over a 90-day rolling forecast.
+
+Starts from a 60-day training window and rolls it forward one day at a
+time for 90 days, either refitting a fresh DemandForecaster on the whole
+window (cold) or calling DemandForecaster.update with the new day (warm).
+
+Usage:
+    python benchmarks/bench_warm_start.py [backend ...]
+"""
+import logging
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.data_generator import generate_demand_data  # noqa: E402
+from src.forecaster import DemandForecaster  # noqa: E402
+
+WINDOW_DAYS = 60
+ROLL_DAYS = 90
+
+
+def roll(backend, data, warm):
+    """Runs the 90-day roll and returns the total refit time in seconds."""
+    forecaster = DemandForecaster(backend=backend)
+    forecaster.train(data.iloc[:WINDOW_DAYS * 24])
+
+    total = 0.0
+    for day in range(WINDOW_DAYS, WINDOW_DAYS + ROLL_DAYS):
+        start = time.perf_counter()
+        if warm:
+            forecaster.update(
+                data.iloc[day * 24:(day + 1) * 24], window=f'{WINDOW_DAYS}D'
+            )
+        else:
+            forecaster = DemandForecaster(backend=backend)
+            forecaster.train(
+                data.iloc[(day + 1 - WINDOW_DAYS) * 24:(day + 1) * 24]
+            )
+        total += time.perf_counter() - start
+    return total
+
+
+def main():
+    backends = sys.argv[1:] or ['harmonic', 'prophet']
+    logging.getLogger('cmdstanpy').disabled = True
+    warnings.filterwarnings("ignore")
+
+    np.random.seed(0)
+    data = generate_demand_data(days=WINDOW_DAYS + ROLL_DAYS)
+
+    print(f"{ROLL_DAYS} daily refits over a {WINDOW_DAYS}-day window")
+    print(f"{'backend':>10} {'cold (s)':>10} {'warm (s)':>10} "
+          f"{'warm/cold':>10}")
+    for backend in backends:
+        cold = roll(backend, data, warm=False)
+        warm = roll(backend, data, warm=True)
+        print(f"{backend:>10} {cold:>10.3f} {warm:>10.3f} "
+              f"{warm / cold:>10.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Stage-by-stage benchmark suite with scaling curves and regression gates.
+
+Times each pipeline stage separately (data generation, forecaster fit and
+predict, dispatch, result assembly, CSV and Parquet I/O) over a range of
+horizons. For each (stage, horizon) it records the best wall time of a
+few repeats, the throughput in rows per second and the tracemalloc peak
+(tracemalloc sees NumPy/pandas buffers but not Arrow's own allocator, so
+Parquet stages report mostly Python-side overhead). Results are written
+as JSON.
+
+With --compare, the fresh results are checked against a stored baseline.
+The script exits with status 1 when any stage is slower than the baseline
+by more than --threshold (a fraction, default 0.25). Peak memory is
+checked against the same threshold. Timing differences below
+--noise-floor seconds are ignored, so sub-millisecond stages on small
+horizons do not trip the gate on scheduler jitter.
+
+Usage:
+    python benchmarks/run_suite.py [--days 7 30 90 365] [--out FILE]
+        [--backend harmonic] [--compare BASELINE] [--threshold 0.25]
+        [--noise-floor 0.002]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+from src.data_generator import generate_scenario_data  # noqa: E402
+from src.forecaster import DemandForecaster  # noqa: E402
+from src.optimizer import GridOptimizer  # noqa: E402
+from src.results_store import read_results, write_results  # noqa: E402
+from src.simulation import assemble_results  # noqa: E402
+
+DEFAULT_DAYS = [7, 30, 90, 365]
+DEFAULT_OUT = os.path.join('benchmarks', 'results', 'suite.json')
+
+
+def measure(func, repeats=3):
+    """
+    Times func and records its peak traced allocation.
+
+    Returns:
+        tuple: (best wall seconds, peak bytes, last return value).
+    """
+    func()  # Warm-up: JIT compilation and first-touch costs are not timed.
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value = func()
+        timings.append(time.perf_counter() - start)
+    # Separate traced call so tracing overhead does not skew the timings.
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak, value
+
+
+def stage_functions(days, backend, workdir):
+    """
+    Builds the stage closures for one horizon, in pipeline order.
+
+    Each stage reuses the output of the previous one, so only the stage
+    itself is timed.
+    """
+    state = {}
+    periods = days * 24
+
+    def generate():
+        state['data'] = generate_scenario_data(days=2 * days, seed=0)
+        return state['data']
+
+    def fit():
+        history = state['data'].iloc[:periods]
+        forecaster = DemandForecaster(backend=backend)
+        forecaster.train(history[['ds', 'y']])
+        state['forecaster'] = forecaster
+
+    def predict():
+        state['forecast'] = state['forecaster'].predict(horizon_hours=periods)
+
+    def dispatch():
+        sim_data = state['data'].iloc[periods:].reset_index(drop=True)
+        net_load = sim_data['y'] - (sim_data['solar'] + sim_data['wind'])
+        state['sim_data'] = sim_data
+        state['dispatch'] = GridOptimizer().optimize_dispatch(
+            net_load, sim_data['price']
+        )
+
+    def assemble():
+        state['results'] = assemble_results(
+            state['sim_data'], state['forecast'], state['dispatch']
+        )
+
+    csv_path = os.path.join(workdir, 'results.csv')
+
+    def csv_write():
+        state['results'].to_csv(csv_path, index=False)
+
+    def csv_read():
+        pd.read_csv(csv_path, parse_dates=['ds'])
+
+    def parquet_write():
+        write_results(state['results'], root=workdir, run_id='bench')
+
+    def parquet_read():
+        read_results(root=workdir, run_id='bench')
+
+    return [
+        ('generate', generate), ('fit', fit), ('predict', predict),
+        ('dispatch', dispatch), ('assemble', assemble),
+        ('csv_write', csv_write), ('csv_read', csv_read),
+        ('parquet_write', parquet_write), ('parquet_read', parquet_read),
+    ]
+
+
+def run_suite(days_list, backend='harmonic', repeats=3):
+    """
+    Runs every stage for every horizon.
+
+    Returns:
+        dict: Environment metadata plus one record per (stage, days).
+    """
+    records = []
+    workdir = tempfile.mkdtemp(prefix='bench_suite_')
+    try:
+        for days in days_list:
+            for stage, func in stage_functions(days, backend, workdir):
+                seconds, peak, _ = measure(func, repeats=repeats)
+                rows = days * 24
+                records.append({
+                    'stage': stage,
+                    'days': days,
+                    'rows': rows,
+                    'seconds': seconds,
+                    'rows_per_second': rows / seconds if seconds else None,
+                    'peak_bytes': peak,
+                })
+                print(
+                    f"{stage:>14} {days:>5}d {seconds:>10.5f}s "
+                    f"{rows / max(seconds, 1e-12):>14,.0f} rows/s "
+                    f"{peak / 2 ** 20:>9.1f} MiB"
+                )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'backend': backend,
+        'results': records,
+    }
+
+
+def compare(current, baseline, threshold, noise_floor=0.002):
+    """
+    Lists the stages that regressed against the baseline.
+
+    Args:
+        current (dict): Output of run_suite().
+        baseline (dict): A previously stored run_suite() output.
+        threshold (float): Allowed relative slowdown/growth, e.g. 0.25.
+        noise_floor (float): Timing differences below this many seconds
+                             are never reported.
+
+    Returns:
+        list: Human-readable regression messages (empty if none).
+    """
+    previous = {
+        (r['stage'], r['days']): r for r in baseline['results']
+    }
+    regressions = []
+    for record in current['results']:
+        old = previous.get((record['stage'], record['days']))
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if not old[metric]:
+                continue
+            change = record[metric] / old[metric] - 1.0
+            if (metric == 'seconds'
+                    and record[metric] - old[metric] < noise_floor):
+                continue
+            if change > threshold:
+                regressions.append(
+                    f"{record['stage']} ({record['days']}d) {metric}: "
+                    f"{old[metric]:.4g} -> {record[metric]:.4g} "
+                    f"(+{change:.0%})"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--days', type=int, nargs='+', default=DEFAULT_DAYS)
+    parser.add_argument('--backend', default='harmonic')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--out', default=DEFAULT_OUT)
+    parser.add_argument('--compare', metavar='BASELINE')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--noise-floor', type=float, default=0.002)
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.days, backend=args.backend, repeats=args.repeats)
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(f"Wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(
+            current, baseline, args.threshold, args.noise_floor
+        )
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
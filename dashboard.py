@@ -4,20 +4,42 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import os
-from src.simulation import SmartGridSimulation
+import time
+from src.downsample import MultiResolutionSeries
+from src.forecaster import FORECAST_BACKENDS
+from src.jobs import SimulationJobManager
+from src.model_cache import ModelCache
+from src.pipeline import StageCache
+from src.results_store import read_results, write_results
 
 
 # Set page configuration (Title, Layout)
 st.set_page_config(page_title="Smart Grid Simulator", layout="wide")
 
+# Max points sent to the browser per chart trace.
+MAX_CHART_POINTS = 4000
+CHART_COLUMNS = [
+    'actual_demand', 'forecast_demand', 'solar', 'wind', 'grid_import',
+    'battery_flow', 'soc', 'price', 'cumulative_cost'
+]
+# Forecast interval columns, present when the run produced bands.
+BAND_COLUMNS = ['forecast_lower', 'forecast_upper']
 
-@st.cache_data
+
+@st.cache_resource
 def load_data():
     """
-    Loads the simulation results from the CSV file.
+    Loads the latest simulation results from the columnar results store.
 
-    @st.cache_data is a Streamlit decorator that caches the output.
+    The run is memory-mapped (Arrow IPC), so even large runs open almost
+    instantly. @st.cache_resource keeps the frame without pickling a copy
+    on every rerun (as @st.cache_data would). Falls back to the legacy
+    CSV file if no run has been stored yet.
     """
+    try:
+        return read_results('data/results', run_id='latest')
+    except FileNotFoundError:
+        pass
     try:
         df = pd.read_csv('data/simulation_results.csv')
         df['ds'] = pd.to_datetime(df['ds'])
@@ -26,14 +48,87 @@ def load_data():
         return None
 
 
-def run_simulation():
-    """Runs the simulation and clears cache."""
-    with st.spinner('Running simulation... This may take a moment.'):
-        sim = SmartGridSimulation(simulation_days=30)
-        results = sim.run()
-        results.to_csv('data/simulation_results.csv', index=False)
+@st.cache_resource
+def get_chart_pyramid(_df):
+    """
+    Builds the min/max pyramid used by every chart.
+
+    Charts query it for the selected time range, so at most
+    MAX_CHART_POINTS points per trace are sent whatever the run length.
+    (The leading underscore tells Streamlit not to hash the frame.)
+    """
+    chart_df = _df.assign(cumulative_cost=_df['cost'].cumsum())
+    columns = CHART_COLUMNS + [c for c in BAND_COLUMNS if c in _df]
+    return MultiResolutionSeries(chart_df, columns)
+
+
+@st.cache_resource
+def get_job_manager():
+    """
+    Background simulation runner shared by every session.
+
+    Runs happen off the script thread, so the dashboard stays responsive;
+    fitted models are reused when the training history is unchanged, and
+    with a fixed seed, changing only the battery settings reruns just the
+    dispatch.
+    """
+    return SimulationJobManager(
+        model_cache=ModelCache('data/model_cache'),
+        stage_cache=StageCache('data/stage_cache'),
+    )
+
+
+def simulation_controls():
+    """Renders the run parameters and submits a job on request."""
+    st.sidebar.header("Actions")
+    with st.sidebar.expander("Simulation Parameters"):
+        params = dict(
+            simulation_days=st.number_input(
+                "Simulation Days", min_value=1, max_value=365, value=30
+            ),
+            battery_capacity=st.number_input(
+                "Battery Capacity (MWh)", min_value=0.0, value=100.0
+            ),
+            max_power=st.number_input(
+                "Max Power (MW)", min_value=0.0, value=50.0
+            ),
+            efficiency=st.slider("Efficiency", 0.5, 1.0, 0.9),
+            forecaster_backend=st.selectbox(
+                "Forecaster", list(FORECAST_BACKENDS)
+            ),
+        )
+        seed = st.number_input("Seed (0 = random)", min_value=0, value=0)
+        params['seed'] = int(seed) or None
+
+    if st.sidebar.button("🔄 Run New Simulation"):
+        st.session_state['job'] = get_job_manager().submit(**params)
+
+
+def track_simulation_job():
+    """Shows progress of the running job and publishes its results."""
+    job = st.session_state.get('job')
+    if job is None:
+        return
+    if not job.done():
+        st.sidebar.progress(job.progress, text=f"Running: {job.stage}")
+        if st.sidebar.button("Cancel"):
+            job.cancel()
+        time.sleep(0.5)  # Poll instead of blocking on the job.
+        st.rerun()
+
+    del st.session_state['job']
+    if job.status == 'done':
+        write_results(
+            job.result(), root='data/results', run_id='latest',
+            format='arrow'
+        )
         load_data.clear()  # Clear the cache to reload new data
-    st.success('Simulation completed! Data updated.')
+        get_chart_pyramid.clear()
+        st.rerun()
+    elif job.status == 'cancelled':
+        st.sidebar.warning('Simulation cancelled.')
+    else:
+        st.sidebar.error(f'Simulation failed: {job.future.exception()}')
 
 
 def render_docs(file_path):
@@ -55,10 +150,8 @@ def render_dashboard(df):
     )
 
     # Sidebar Actions
-    st.sidebar.header("Actions")
-    if st.sidebar.button("🔄 Run New Simulation"):
-        run_simulation()
-        st.rerun()
+    simulation_controls()
+    track_simulation_job()
 
     if df is None:
         st.error(
@@ -80,6 +173,20 @@ def render_dashboard(df):
     st.sidebar.metric("Peak Grid Load", f"{peak_load:.2f} MW")
     st.sidebar.metric("Renewable Share", f"{renewable_share:.1f}%")
 
+    # Time range for the charts. Zooming in re-queries the pyramid at a
+    # finer level instead of plotting every row.
+    st.sidebar.header("Chart Range")
+    first, last = df['ds'].iloc[0], df['ds'].iloc[-1]
+    start, end = st.sidebar.slider(
+        "Time Range",
+        min_value=first.to_pydatetime(),
+        max_value=last.to_pydatetime(),
+        value=(first.to_pydatetime(), last.to_pydatetime()),
+    )
+    view = get_chart_pyramid(df).query(
+        start, end, max_points=MAX_CHART_POINTS
+    )
+
     # Main Charts
     tab1, tab2, tab3 = st.tabs(
         ["Demand & Forecast", "Grid & Battery", "Financials"]
@@ -88,11 +195,22 @@ def render_dashboard(df):
     with tab1:
         st.subheader("Demand Forecasting Performance")
         fig_demand = go.Figure()
+        if 'forecast_upper' in view:
+            fig_demand.add_trace(go.Scatter(
+                x=view['ds'], y=view['forecast_upper'], mode='lines',
+                line=dict(width=0), showlegend=False, hoverinfo='skip'
+            ))
+            fig_demand.add_trace(go.Scatter(
+                x=view['ds'], y=view['forecast_lower'], mode='lines',
+                line=dict(width=0), fill='tonexty',
+                fillcolor='rgba(99, 110, 250, 0.2)',
+                name='Forecast Interval'
+            ))
         fig_demand.add_trace(go.Scatter(
-            x=df['ds'], y=df['actual_demand'], name='Actual Demand'
+            x=view['ds'], y=view['actual_demand'], name='Actual Demand'
         ))
         fig_demand.add_trace(go.Scatter(
-            x=df['ds'], y=df['forecast_demand'], name='Forecast',
+            x=view['ds'], y=view['forecast_demand'], name='Forecast',
             line=dict(dash='dash')
         ))
         fig_demand.update_layout(
@@ -104,10 +222,10 @@ def render_dashboard(df):
         st.subheader("Renewable Generation")
         fig_ren = go.Figure()
         fig_ren.add_trace(go.Scatter(
-            x=df['ds'], y=df['solar'], name='Solar', fill='tozeroy'
+            x=view['ds'], y=view['solar'], name='Solar', fill='tozeroy'
         ))
         fig_ren.add_trace(go.Scatter(
-            x=df['ds'], y=df['wind'], name='Wind', fill='tozeroy'
+            x=view['ds'], y=view['wind'], name='Wind', fill='tozeroy'
         ))
         fig_ren.update_layout(
             xaxis_title='Time', yaxis_title='Power (MW)',
@@ -122,20 +240,20 @@ def render_dashboard(df):
         fig_grid = make_subplots(specs=[[{"secondary_y": True}]])
         fig_grid.add_trace(
             go.Scatter(
-                x=df['ds'], y=df['grid_import'], name='Grid Import (MW)'
+                x=view['ds'], y=view['grid_import'], name='Grid Import (MW)'
             ),
             secondary_y=False
         )
         fig_grid.add_trace(
             go.Scatter(
-                x=df['ds'], y=df['battery_flow'], name='Battery Flow (MW)',
+                x=view['ds'], y=view['battery_flow'], name='Battery Flow (MW)',
                 line=dict(color='green')
             ),
             secondary_y=False
         )
         fig_grid.add_trace(
             go.Scatter(
-                x=df['ds'], y=df['soc'], name='State of Charge (MWh)',
+                x=view['ds'], y=view['soc'], name='State of Charge (MWh)',
                 line=dict(color='purple', dash='dot')
             ),
             secondary_y=True
@@ -148,19 +266,17 @@ def render_dashboard(df):
 
     with tab3:
         st.subheader("Cost Analysis")
-        df['cumulative_cost'] = df['cost'].cumsum()
-
         col1, col2 = st.columns(2)
         with col1:
             fig_cost = px.line(
-                df, x='ds', y='cumulative_cost',
+                view, x='ds', y='cumulative_cost',
                 title='Cumulative Cost Over Time'
             )
             st.plotly_chart(fig_cost, use_container_width=True)
 
         with col2:
             fig_price = px.line(
-                df, x='ds', y='price',
+                view, x='ds', y='price',
                 title='Electricity Price Signal ($/MWh)'
             )
             st.plotly_chart(fig_price, use_container_width=True)
@@ -1,4 +1,5 @@
 from src.simulation import SmartGridSimulation
+from src.results_store import write_results
 import os
 import warnings
 warnings.filterwarnings("ignore")
@@ -11,7 +12,8 @@ def main():
     This script:
     1. Initializes the simulation environment.
     2. Runs the simulation (Data Gen -> Forecast -> Optimize).
-    3. Saves the results to 'data/simulation_results.csv'.
+    3. Saves the results to the columnar store in 'data/results'
+       (memory-mapped Arrow IPC, read by the dashboard).
     """
     print("Starting Smart Grid Simulation...")
 
@@ -25,10 +27,18 @@ def main():
 
     # Run the simulation
     results = sim.run()
-
-    # Save results to CSV
-    output_path = 'data/simulation_results.csv'
-    results.to_csv(output_path, index=False)
+    metrics = results.attrs['metrics']
+    print(
+        f"Total cost: {metrics['cost']:,.2f} | Battery: "
+        f"{metrics['equivalent_full_cycles']:.1f} equivalent full cycles, "
+        f"degradation cost {metrics['degradation_cost']:,.2f}"
+    )
+
+    # Save results to the columnar store (use results_store.export_csv
+    # if a CSV copy is needed)
+    output_path = write_results(
+        results, root='data/results', run_id='latest', format='arrow'
+    )
     print(f"Results saved to {output_path}")
     print("You can now run 'streamlit run dashboard.py' to view the results.")
 
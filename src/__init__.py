@@ -6,30 +6,73 @@ renewable energy integration, and battery storage optimization.
 
 Modules:
     data_generator: Synthetic data generation for grid simulation
-    forecaster: Demand forecasting using Prophet
+    ingest: Chunked, validated loading of metered CSV/Parquet data
+    forecaster: Demand forecasting (Prophet or harmonic regression)
+    backtest: Parallel rolling-origin backtests of the forecaster
+    model_cache: On-disk cache of fitted forecasting models
+    ensemble: Parallel Monte Carlo ensemble runner
+    results_store: Columnar (Parquet/Arrow) results storage
+    downsample: LTTB / min-max downsampling for charts
+    streaming_stats: Constant-memory running statistics and quantiles
     optimizer: Battery dispatch optimization
+    metrics: Rainflow cycle counting and battery degradation costs
+    tariff: Vectorized retail tariffs with demand charges
+    controller: Online (per-sample) dispatch controller and replay harness
     simulation: Main simulation orchestrator
+    pipeline: Content-hashed memo of simulation stage outputs
+    instrumentation: Per-stage timing, memory and profiling hooks
+    jobs: Background, cached simulation runs for the dashboard
+
+Public names are imported lazily on first attribute access, so
+'import src' stays cheap and Prophet is only loaded when a Prophet-backed
+forecaster is actually used.
 """
 
-from src.data_generator import (
-    generate_demand_data,
-    generate_solar_data,
-    generate_wind_data,
-    generate_price_data
-)
-from src.forecaster import DemandForecaster
-from src.optimizer import GridOptimizer
-from src.simulation import SmartGridSimulation
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "Smart Grid Simulator Team"
 
-__all__ = [
-    "generate_demand_data",
-    "generate_solar_data",
-    "generate_wind_data",
-    "generate_price_data",
-    "DemandForecaster",
-    "GridOptimizer",
-    "SmartGridSimulation",
-]
+# Public name -> module that defines it.
+_LAZY_ATTRIBUTES = {
+    "generate_demand_data": "src.data_generator",
+    "generate_solar_data": "src.data_generator",
+    "generate_wind_data": "src.data_generator",
+    "generate_price_data": "src.data_generator",
+    "generate_scenario_chunk": "src.data_generator",
+    "generate_scenario_data": "src.data_generator",
+    "iter_scenario_chunks": "src.data_generator",
+    "load_metered_data": "src.ingest",
+    "MeteredDataSource": "src.ingest",
+    "DemandForecaster": "src.forecaster",
+    "forecast_many": "src.forecaster",
+    "backtest": "src.backtest",
+    "summarize_backtest": "src.backtest",
+    "ModelCache": "src.model_cache",
+    "GridOptimizer": "src.optimizer",
+    "DegradationModel": "src.metrics",
+    "batch_cycle_metrics": "src.metrics",
+    "Tariff": "src.tariff",
+    "TariffPeriod": "src.tariff",
+    "OnlineDispatchController": "src.controller",
+    "SmartGridSimulation": "src.simulation",
+    "StageCache": "src.pipeline",
+    "SimulationJobManager": "src.jobs",
+    "Instrumentation": "src.instrumentation",
+    "run_ensemble": "src.ensemble",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Cache so __getattr__ runs once per name.
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,208 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.forecaster import DemandForecaster, _to_arrays
+
+# One rolling-origin fold, as row positions into the history: train on
+# [train_start, cutoff), then forecast and score [cutoff, cutoff + horizon).
+Fold = namedtuple('Fold', ['fold', 'train_start', 'cutoff'])
+
+
+def rolling_origin_folds(n_rows, horizon, initial, step, window=None):
+    """
+    Defines rolling-origin folds over a history of n_rows rows.
+
+    Args:
+        n_rows (int): Length of the history.
+        horizon (int): Rows forecast (and scored) per fold.
+        initial (int): Training rows before the first cutoff.
+        step (int): Rows the cutoff advances between folds.
+        window (int): Fixed training length (sliding window), or None to
+                      train on everything before the cutoff (expanding).
+
+    Returns:
+        list: Fold tuples in time order.
+    """
+    if initial < 1 or step < 1 or horizon < 1:
+        raise ValueError("initial, step and horizon must be positive.")
+    cutoffs = range(initial, n_rows - horizon + 1, step)
+    return [
+        Fold(i, 0 if window is None else max(cutoff - window, 0), cutoff)
+        for i, cutoff in enumerate(cutoffs)
+    ]
+
+
+def _backtest_block(ds_ns, y, folds, horizon, backend, params, uncertainty,
+                    warm_start, window_ns, cache):
+    """
+    Runs consecutive folds in one process; returns forecast matrices.
+
+    With warm_start, the model is trained once on the block's first fold
+    and then rolled forward fold to fold with update(), which reuses the
+    previous fit (harmonic normal equations / Prophet init) instead of
+    refitting from scratch.
+    """
+    forecaster = DemandForecaster(
+        backend=backend, cache=cache, uncertainty=uncertainty, **params
+    )
+    yhat = np.empty((len(folds), horizon))
+    lower = np.empty((len(folds), horizon))
+    upper = np.empty((len(folds), horizon))
+    previous = None
+    for row, fold in enumerate(folds):
+        if warm_start and previous is not None:
+            forecaster.update(
+                pd.DataFrame({
+                    'ds': pd.DatetimeIndex(ds_ns[previous:fold.cutoff]),
+                    'y': y[previous:fold.cutoff],
+                }),
+                window=window_ns
+            )
+        else:
+            forecaster.train(pd.DataFrame({
+                'ds': pd.DatetimeIndex(ds_ns[fold.train_start:fold.cutoff]),
+                'y': y[fold.train_start:fold.cutoff],
+            }))
+        previous = fold.cutoff
+        forecast = forecaster.predict(horizon)
+        yhat[row] = forecast['yhat'].to_numpy()
+        lower[row] = forecast['yhat_lower'].to_numpy()
+        upper[row] = forecast['yhat_upper'].to_numpy()
+    return yhat, lower, upper
+
+
+def _pinball(actual, predicted, q):
+    """Vectorized pinball (quantile) loss."""
+    diff = actual - predicted
+    return np.maximum(q * diff, (q - 1.0) * diff)
+
+
+def backtest(history, horizon=24, initial=24 * 30, step=24, window=None,
+             workers=None, backend='harmonic', warm_start=True, cache=None,
+             uncertainty='residual', interval_width=0.8, **params):
+    """
+    Rolling-origin backtest of a DemandForecaster configuration.
+
+    The folds are split into contiguous blocks, one per worker process.
+    Each block walks forward with warm-started updates, so only the first
+    fold of a block is a full fit. Errors are then computed for all folds
+    and horizon steps at once.
+
+    Args:
+        history (pd.DataFrame or pd.Series): ['ds', 'y'] frame or a Series
+                                             indexed by timestamp, at a
+                                             fixed step.
+        horizon (int): Steps forecast per fold.
+        initial (int): Training steps before the first cutoff.
+        step (int): Steps between cutoffs (24 = daily for hourly data).
+        window (int): Sliding training length in steps (None = expanding).
+        workers (int): Worker processes (default: CPU count, at most one
+                       per fold); 1 runs in the calling process.
+        backend (str): Forecaster backend name.
+        warm_start (bool): Roll fits forward between adjacent folds
+                           instead of refitting each fold cold.
+        cache (ModelCache): Optional fitted-model cache for cold fits.
+        uncertainty (str): Forecaster uncertainty mode; bands feed the
+                           pinball loss ('off' scores the median only).
+        interval_width (float): Coverage of the forecast bands, i.e. the
+                                quantiles scored are (1 -/+ width) / 2.
+        **params: Hyperparameters passed to the backend.
+
+    Returns:
+        pd.DataFrame: One row per (fold, horizon step) with columns
+                      ['fold', 'cutoff', 'horizon', 'y', 'yhat', 'ape',
+                      'se', 'pinball'], using compact dtypes. 'pinball' is
+                      the mean pinball loss over the lower, median and
+                      upper quantiles. Aggregate with summarize_backtest().
+    """
+    ds_ns, y = _to_arrays(history)
+    folds = rolling_origin_folds(len(y), horizon, initial, step, window)
+    if not folds:
+        raise ValueError("History is too short for a single fold.")
+
+    if backend in ('prophet', 'harmonic'):
+        params['interval_width'] = interval_width
+    window_ns = None
+    if window is not None:
+        window_ns = pd.Timedelta(int(window * (ds_ns[1] - ds_ns[0])), 'ns')
+
+    workers = min(workers or os.cpu_count() or 1, len(folds))
+    blocks = [list(b) for b in np.array_split(np.arange(len(folds)), workers)]
+    tasks = []
+    for block in blocks:
+        block_folds = [folds[i] for i in block]
+        start = block_folds[0].train_start
+        end = block_folds[-1].cutoff
+        # Ship only the rows this block trains on, re-based to 0.
+        shifted = [
+            Fold(f.fold, f.train_start - start, f.cutoff - start)
+            for f in block_folds
+        ]
+        tasks.append((
+            ds_ns[start:end], y[start:end], shifted, horizon, backend,
+            params, uncertainty, warm_start, window_ns, cache
+        ))
+
+    if workers == 1:
+        parts = [_backtest_block(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_backtest_block, *zip(*tasks)))
+    yhat, lower, upper = (np.concatenate(m) for m in zip(*parts))
+
+    cutoffs = np.array([fold.cutoff for fold in folds])
+    actual = y[cutoffs[:, None] + np.arange(horizon)[None, :]]
+    error = actual - yhat
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ape = np.abs(error) / np.abs(actual)
+    tail = (1.0 - interval_width) / 2
+    pinball = np.nanmean(np.stack([
+        _pinball(actual, lower, tail),
+        _pinball(actual, yhat, 0.5),
+        _pinball(actual, upper, 1.0 - tail),
+    ]), axis=0)
+
+    n_folds = len(folds)
+    return pd.DataFrame({
+        'fold': np.repeat(np.arange(n_folds, dtype=np.int32), horizon),
+        'cutoff': pd.DatetimeIndex(np.repeat(ds_ns[cutoffs], horizon)),
+        'horizon': np.tile(np.arange(1, horizon + 1, dtype=np.int16),
+                           n_folds),
+        'y': actual.ravel().astype(np.float32),
+        'yhat': yhat.ravel().astype(np.float32),
+        'ape': ape.ravel().astype(np.float32),
+        'se': (error ** 2).ravel().astype(np.float32),
+        'pinball': pinball.ravel().astype(np.float32),
+    })
+
+
+def summarize_backtest(table, by='horizon'):
+    """
+    Aggregates a backtest() table into MAPE, RMSE and pinball loss.
+
+    Args:
+        table (pd.DataFrame): Output of backtest().
+        by (str or list): Grouping columns, e.g. 'horizon', 'fold' or
+                          'cutoff'; None for a single overall row.
+
+    Returns:
+        pd.DataFrame: Columns ['mape' (%), 'rmse', 'pinball', 'count'].
+    """
+    metrics = table[['ape', 'se', 'pinball']].astype(np.float64)
+    grouped = metrics.groupby(table[by]) if by is not None else None
+    if grouped is None:
+        means = metrics.mean().to_frame().T
+        counts = pd.Series([len(table)])
+    else:
+        means = grouped.mean()
+        counts = grouped.size()
+    return pd.DataFrame({
+        'mape': 100 * means['ape'],
+        'rmse': np.sqrt(means['se']),
+        'pinball': means['pinball'],
+        'count': counts,
+    })
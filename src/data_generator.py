@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from src.tariff import TOU_TARIFF, _day_and_time
+
 
 def generate_demand_data(days=30, start_date='2023-01-01'):
     """
@@ -136,18 +138,202 @@ def generate_price_data(days=30, start_date='2023-01-01'):
     # Mid-peak: 06:00-16:00, 20:00-22:00 ($0.10/kWh)
     # On-peak:  16:00-20:00              ($0.20/kWh)
 
-    prices = []
-    for hour in dates.hour:
-        if 16 <= hour < 20:
-            prices.append(0.20)
-        elif 6 <= hour < 16 or 20 <= hour < 22:
-            prices.append(0.10)
-        else:
-            prices.append(0.05)
+    prices = TOU_TARIFF.energy_rates(dates)
 
     # Add some volatility (random fluctuations)
     # Market prices are never perfectly static.
-    prices = np.array(prices) + np.random.normal(0, 0.005, len(dates))
+    prices = prices + np.random.normal(0, 0.005, len(dates))
     prices = np.maximum(prices, 0.01)  # Ensure price is at least 1 cent
 
     return pd.DataFrame({'ds': dates, 'price': prices})
+
+
+# Column order of the signal block built by _scenario_signals.
+SCENARIO_COLUMNS = ('y', 'solar', 'wind', 'price')
+
+
+def _scenario_signals(ns, rng, out=None):
+    """
+    Computes demand, solar, wind and price for a block of timestamps.
+
+    Uses the same models as the generate_*_data functions above, but the
+    calendar features are derived once for all four signals and the hour
+    is fractional, so sub-hourly resolutions give smooth curves.
+
+    Args:
+        ns (np.ndarray): Timestamps as int64 nanoseconds (UTC-naive).
+        rng (np.random.Generator): Source of randomness for this block.
+        out (np.ndarray): Optional preallocated (4, n) float64 or float32
+                          array to write into, one row per
+                          SCENARIO_COLUMNS entry. The arithmetic runs in
+                          place in this array, so a float32 block is
+                          computed in float32 (the random draws are
+                          float64, rounded as they are added).
+
+    Returns:
+        np.ndarray: The (4, n) signal block.
+    """
+    n = len(ns)
+    if out is None:
+        out = np.empty((len(SCENARIO_COLUMNS), n))
+    demand, solar, wind, price = out
+
+    _, weekend, seconds_of_day = _day_and_time(ns)
+    hour = seconds_of_day / 3600.0
+
+    # Demand: base + daily sine + weekend dip + noise, clipped at 0.
+    np.sin(2 * np.pi * hour / 24 - np.pi / 2, out=demand)
+    demand *= 100
+    demand += 500
+    demand -= 50 * weekend
+    demand += rng.normal(0, 20, n)
+    np.maximum(demand, 0, out=demand)
+
+    # Solar: half sine between 06:00 and 18:00 times cloud cover.
+    np.sin(np.pi * (hour - 6) / 12, out=solar)
+    np.maximum(solar, 0, out=solar)
+    solar *= 200
+    solar *= rng.uniform(0.5, 1.0, n)
+
+    # Wind: cubic power curve of a Weibull wind speed, capped at rating.
+    wind[:] = rng.weibull(2, n)
+    wind *= 5
+    np.power(wind, 3, out=wind)
+    np.minimum(wind, 150, out=wind)
+
+    # Price: TOU tier (a table lookup) plus volatility, at least 1 cent.
+    price[:] = TOU_TARIFF.energy_rates(ns)
+    price += rng.normal(0, 0.005, n)
+    np.maximum(price, 0.01, out=price)
+
+    return out
+
+
+def _scenario_frame(ns, block):
+    """Wraps timestamps and a (4, n) signal block without copying it."""
+    df = pd.DataFrame(block.T, columns=list(SCENARIO_COLUMNS), copy=False)
+    df.insert(0, 'ds', pd.DatetimeIndex(ns))
+    return df
+
+
+def _step_ns(freq):
+    """Length of one fixed-size step (e.g. 'h', '5min') in nanoseconds."""
+    try:
+        return pd.tseries.frequencies.to_offset(freq).nanos
+    except ValueError:
+        raise ValueError(
+            f"Frequency '{freq}' is not a fixed duration (use e.g. 'h', "
+            "'15min' or '1min')."
+        )
+
+
+def generate_scenario_chunk(chunk_index, periods, seed, start_date='2023-01-01',
+                            freq='h', chunk_size=100_000):
+    """
+    Generates one fixed-size chunk of a streamed scenario.
+
+    Each chunk draws from its own np.random.Generator seeded by
+    SeedSequence(seed, spawn_key=(chunk_index,)). A chunk therefore only
+    depends on (seed, chunk_index, chunk_size), so chunks can be produced
+    out of order or in parallel processes and are bit-identical to the
+    ones from iter_scenario_chunks().
+
+    Args:
+        chunk_index (int): Position of the chunk in the scenario.
+        periods (int): Total number of time steps in the scenario.
+        seed (int): Root seed of the scenario.
+        start_date (str): Start date string (YYYY-MM-DD).
+        freq (str): Fixed time step, e.g. 'h', '15min', '1min'.
+        chunk_size (int): Number of rows per chunk.
+
+    Returns:
+        pd.DataFrame: Columns ['ds', 'y', 'solar', 'wind', 'price'].
+    """
+    first = chunk_index * chunk_size
+    last = min(first + chunk_size, periods)
+    if first >= last:
+        raise IndexError(f"Chunk {chunk_index} is past the scenario end.")
+
+    ns = (
+        pd.Timestamp(start_date).value
+        + np.arange(first, last, dtype=np.int64) * _step_ns(freq)
+    )
+    rng = np.random.default_rng(
+        np.random.SeedSequence(seed, spawn_key=(chunk_index,))
+    )
+    return _scenario_frame(ns, _scenario_signals(ns, rng))
+
+
+def iter_scenario_chunks(days=30, start_date='2023-01-01', freq='h',
+                         chunk_size=100_000, seed=None, periods=None):
+    """
+    Streams a synthetic scenario (demand, solar, wind, price) in chunks.
+
+    Only one chunk is held in memory at a time, so memory use is flat no
+    matter how long the horizon is (e.g. 10 years at 1-minute resolution
+    is ~5.3M rows yielded as ~53 chunks of 100k).
+
+    Args:
+        days (float): Length of the scenario in days.
+        start_date (str): Start date string (YYYY-MM-DD).
+        freq (str): Fixed time step, e.g. 'h', '15min', '1min'.
+        chunk_size (int): Number of rows per chunk.
+        seed (int): Root seed. None draws fresh entropy once, so all
+                    chunks of one call still belong to the same scenario.
+        periods (int): Number of time steps; overrides 'days' if given.
+
+    Yields:
+        pd.DataFrame: Chunks with columns ['ds', 'y', 'solar', 'wind',
+                      'price'].
+    """
+    if periods is None:
+        periods = int(days * 86_400_000_000_000 // _step_ns(freq))
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    n_chunks = -(-periods // chunk_size)  # ceiling division
+    for chunk_index in range(n_chunks):
+        yield generate_scenario_chunk(
+            chunk_index, periods, seed, start_date=start_date, freq=freq,
+            chunk_size=chunk_size
+        )
+
+
+def generate_scenario_data(days=30, start_date='2023-01-01', freq='h',
+                           seed=None, dtype=np.float64):
+    """
+    Builds demand, solar, wind and price in one pass into one DataFrame.
+
+    Replaces calling the four generate_*_data functions and merging their
+    outputs on 'ds': the timestamps and calendar features are computed
+    once, all signals are written into a single preallocated block, and
+    the DataFrame wraps that block without merges or extra copies.
+
+    Args:
+        days (float): Number of days to simulate.
+        start_date (str): Start date string (YYYY-MM-DD).
+        freq (str): Fixed time step, e.g. 'h', '15min', '1min'.
+        seed (int or np.random.Generator): Seed for reproducible data.
+                                           None draws the seed from the
+                                           global NumPy state, so
+                                           np.random.seed() still makes
+                                           runs reproducible.
+        dtype (np.dtype): float64 (default) or float32 for the signal
+                          columns; float32 halves their memory and draws
+                          the same random values, rounded.
+
+    Returns:
+        pd.DataFrame: Columns ['ds', 'y', 'solar', 'wind', 'price'].
+    """
+    step = _step_ns(freq)
+    periods = int(days * 86_400_000_000_000 // step)
+    ns = (
+        pd.Timestamp(start_date).value
+        + np.arange(periods, dtype=np.int64) * step
+    )
+    if seed is None:
+        # Like the generate_*_data functions, follow np.random.seed().
+        seed = np.random.randint(2**32, dtype=np.uint64)
+    rng = np.random.default_rng(seed)
+    block = np.empty((len(SCENARIO_COLUMNS), periods), dtype=dtype)
+    return _scenario_frame(ns, _scenario_signals(ns, rng, out=block))
@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+
+
+def _as_numeric(x):
+    """Timestamps become int64 nanoseconds; numbers become float64."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').view(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, for each of the n_out - 2 buckets
+    in between, the point forming the largest triangle with the previously
+    kept point and the mean of the next bucket. Visually important points
+    (peaks, dips) survive, unlike with plain striding.
+
+    Args:
+        x (array-like): Sorted x values (numbers or timestamps).
+        y (array-like): Values to downsample.
+        n_out (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_numeric(x)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket edges for the n - 2 interior points.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    previous = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        next_lo, next_hi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        next_x = x[next_lo:next_hi].mean()
+        next_y = y[next_lo:next_hi].mean()
+        # Twice the triangle area; the constant factor does not matter.
+        area = np.abs(
+            (x[previous] - next_x) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (next_y - y[previous])
+        )
+        previous = lo + int(np.argmax(area))
+        indices[b + 1] = previous
+    return indices
+
+
+def minmax_indices(y, n_out):
+    """
+    Min/max decimation: keeps the min and max of each of n_out/2 buckets.
+
+    Args:
+        y (array-like): Values to downsample.
+        n_out (int): Approximate number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted, unique indices of the kept points.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)  # ceiling division
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    valid = ~np.all(np.isnan(buckets), axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+    lows = offsets + np.nanargmin(buckets[valid], axis=1)
+    highs = offsets + np.nanargmax(buckets[valid], axis=1)
+    return np.unique(np.concatenate([lows, highs]))
+
+
+def downsample(df, columns, x='ds', max_points=4000, method='lttb'):
+    """
+    Reduces each column of a frame to at most ~max_points rows.
+
+    Args:
+        df (pd.DataFrame): Source data.
+        columns (list): Columns to downsample (each gets its own points).
+        x (str): Column with the x axis (usually 'ds').
+        max_points (int): Target number of points per column.
+        method (str): 'lttb' or 'minmax'.
+
+    Returns:
+        dict: column -> (x values, y values) ready to plot.
+    """
+    if method not in ('lttb', 'minmax'):
+        raise ValueError("method must be 'lttb' or 'minmax'.")
+    xs = df[x].to_numpy()
+    out = {}
+    for column in columns:
+        ys = df[column].to_numpy()
+        if method == 'lttb':
+            idx = lttb_indices(xs, ys, max_points)
+        else:
+            idx = minmax_indices(ys, max_points)
+        out[column] = (xs[idx], ys[idx])
+    return out
+
+
+class MultiResolutionSeries:
+    """
+    Precomputed min/max pyramid for fast zoomable charts.
+
+    Level 0 is the raw series; each further level aggregates 'factor'
+    buckets of the previous one into their min and max. A query for a
+    time range picks the finest level that fits in the point budget, so
+    zooming in returns finer detail without ever shipping the full series,
+    and peaks remain visible at every level.
+    """
+
+    def __init__(self, df, columns, x='ds', factor=4, min_buckets=500):
+        """
+        Args:
+            df (pd.DataFrame): Source data, sorted by x.
+            columns (list): Columns to index.
+            x (str): Timestamp column.
+            factor (int): Buckets merged per level.
+            min_buckets (int): Stop adding levels below this many buckets.
+        """
+        self.columns = list(columns)
+        self.x = x
+        ns = pd.DatetimeIndex(df[x]).asi8
+        raw = {c: df[c].to_numpy(dtype=np.float64) for c in self.columns}
+        # Each level: (bucket start times, {col: min}, {col: max}).
+        self.levels = [(ns, raw, raw)]
+
+        while len(self.levels[-1][0]) // factor >= min_buckets:
+            starts, mins, maxs = self.levels[-1]
+            groups = np.arange(0, len(starts), factor)
+            self.levels.append((
+                starts[groups],
+                {c: np.minimum.reduceat(mins[c], groups) for c in mins},
+                {c: np.maximum.reduceat(maxs[c], groups) for c in maxs},
+            ))
+
+    def query(self, start=None, end=None, max_points=4000):
+        """
+        Returns the series in [start, end] at the finest affordable level.
+
+        Args:
+            start, end (timestamp-like): Time range (None = open-ended).
+            max_points (int): Max rows in the result.
+
+        Returns:
+            pd.DataFrame: x column plus the indexed columns. Aggregated
+                          levels emit each bucket's min then max at the
+                          bucket start time.
+        """
+        lo_ns = None if start is None else pd.Timestamp(start).value
+        hi_ns = None if end is None else pd.Timestamp(end).value
+
+        for level, (starts, mins, maxs) in enumerate(self.levels):
+            lo = 0 if lo_ns is None else np.searchsorted(starts, lo_ns)
+            # Include the bucket that contains lo_ns on aggregated levels.
+            if level > 0 and lo > 0:
+                lo -= 1
+            hi = len(starts) if hi_ns is None else \
+                np.searchsorted(starts, hi_ns, side='right')
+            points = (hi - lo) * (1 if level == 0 else 2)
+            if points <= max_points or level == len(self.levels) - 1:
+                break
+
+        if level == 0:
+            data = {c: mins[c][lo:hi] for c in self.columns}
+            times = starts[lo:hi]
+        else:
+            data = {
+                c: np.column_stack(
+                    [mins[c][lo:hi], maxs[c][lo:hi]]
+                ).ravel()
+                for c in self.columns
+            }
+            times = np.repeat(starts[lo:hi], 2)
+        return pd.DataFrame({self.x: pd.DatetimeIndex(times), **data})
@@ -0,0 +1,206 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.forecaster import DemandForecaster
+from src.metrics import cycle_metrics
+from src.optimizer import GridOptimizer
+from src.simulation import SmartGridSimulation
+from src.streaming_stats import P2Quantile, RunningStats
+
+# KPIs recorded for every scenario, in shared-memory column order.
+KPI_NAMES = (
+    'total_cost', 'peak_import', 'soc_utilization',
+    'equivalent_full_cycles', 'degradation_cost',
+)
+
+
+def scenario_kpis(results, battery_capacity):
+    """
+    Reduces one simulation result to its KPI vector.
+
+    Args:
+        results (pd.DataFrame): Output of SmartGridSimulation.run().
+        battery_capacity (float): Battery capacity in MWh.
+
+    Returns:
+        np.ndarray: Values in KPI_NAMES order. SoC utilization is the
+                    fraction of the capacity range the battery swept;
+                    the cycle metrics come from results.attrs['metrics']
+                    (see src.metrics).
+    """
+    soc = results['soc'].to_numpy()
+    metrics = results.attrs.get('metrics') or cycle_metrics(
+        soc, battery_capacity
+    )
+    return np.array([
+        results['cost'].sum(),
+        results['grid_import'].max(),
+        (soc.max() - soc.min()) / battery_capacity,
+        metrics['equivalent_full_cycles'],
+        metrics['degradation_cost'],
+    ])
+
+
+def _run_scenario(seed, simulation_days, forecaster_backend,
+                  optimizer_params):
+    optimizer = GridOptimizer(**optimizer_params)
+    sim = SmartGridSimulation(
+        simulation_days=simulation_days,
+        forecaster=DemandForecaster(
+            backend=forecaster_backend, uncertainty='off'
+        ),
+        optimizer=optimizer,
+        seed=seed,
+        verbose=False,
+    )
+    return scenario_kpis(sim.run(), optimizer.battery_capacity)
+
+
+def _scenario_worker(shm_name, n_slots, slot, seed, simulation_days,
+                     forecaster_backend, optimizer_params):
+    """
+    Runs one scenario in a worker and writes its KPIs into shared memory.
+
+    Only the slot index travels back through the pool; the KPI row is
+    written straight into the parent's shared result array.
+    """
+    kpis = _run_scenario(
+        seed, simulation_days, forecaster_backend, optimizer_params
+    )
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        slots = np.ndarray(
+            (n_slots, len(KPI_NAMES)), dtype=np.float64, buffer=shm.buf
+        )
+        slots[slot] = kpis
+        del slots  # Release the buffer export before closing.
+    finally:
+        shm.close()
+    return slot
+
+
+class _KpiAggregator:
+    """Streaming per-KPI statistics; memory does not grow with N."""
+
+    def __init__(self, quantiles):
+        self.quantiles = quantiles
+        self.stats = [RunningStats() for _ in KPI_NAMES]
+        self.sketches = [
+            [P2Quantile(q) for q in quantiles] for _ in KPI_NAMES
+        ]
+
+    def update(self, kpis):
+        for i, value in enumerate(kpis):
+            self.stats[i].update(float(value))
+            for sketch in self.sketches[i]:
+                sketch.update(float(value))
+
+    def summary(self):
+        rows = {}
+        for i, name in enumerate(KPI_NAMES):
+            stats = self.stats[i]
+            row = {
+                'count': stats.count,
+                'mean': stats.mean,
+                'std': stats.std,
+                'min': stats.min,
+                'max': stats.max,
+            }
+            for q, sketch in zip(self.quantiles, self.sketches[i]):
+                row[f'q{q * 100:g}'] = sketch.value
+            rows[name] = row
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def run_ensemble(n_scenarios, simulation_days=30, workers=None, seed=None,
+                 forecaster_backend='harmonic', optimizer_params=None,
+                 quantiles=(0.05, 0.5, 0.95)):
+    """
+    Runs a Monte Carlo ensemble of independently seeded simulations.
+
+    Scenario i is seeded with SeedSequence(seed, spawn_key=(i,)), so the
+    ensemble is reproducible and independent of scheduling. Workers write
+    their KPI rows into a small shared-memory array of 2 * workers slots
+    that is recycled as results are folded into streaming statistics
+    (Welford mean/std and P-square quantiles), so memory stays flat for
+    any N. Rows are folded in scenario order, so any number of workers
+    gives the same summary; scenarios run at most one slot count ahead
+    of the next row to fold, which bounds the rows waiting for it.
+
+    Args:
+        n_scenarios (int): Number of realizations to run.
+        simulation_days (int): Days simulated per scenario.
+        workers (int): Worker processes (default: CPU count).
+                       workers=1 runs in the calling process.
+        seed (int): Root seed of the ensemble (None = random).
+        forecaster_backend (str): DemandForecaster backend per scenario.
+                                  'harmonic' keeps scenarios cheap.
+        optimizer_params (dict): Keyword arguments for GridOptimizer.
+        quantiles (tuple): Quantiles to estimate for each KPI.
+
+    Returns:
+        pd.DataFrame: One row per KPI in KPI_NAMES with count, mean, std,
+                      min, max and one column per quantile (e.g. 'q95').
+    """
+    workers = workers or os.cpu_count() or 1
+    optimizer_params = optimizer_params or {}
+    root = np.random.SeedSequence(seed)
+    aggregator = _KpiAggregator(quantiles)
+
+    def scenario_seed(i):
+        return np.random.SeedSequence(root.entropy, spawn_key=(i,))
+
+    if workers == 1:
+        for i in range(n_scenarios):
+            aggregator.update(_run_scenario(
+                scenario_seed(i), simulation_days, forecaster_backend,
+                optimizer_params
+            ))
+        return aggregator.summary()
+
+    n_slots = min(2 * workers, max(n_scenarios, 1))
+    shm = shared_memory.SharedMemory(
+        create=True, size=n_slots * len(KPI_NAMES) * 8
+    )
+    try:
+        slots = np.ndarray(
+            (n_slots, len(KPI_NAMES)), dtype=np.float64, buffer=shm.buf
+        )
+        free_slots = list(range(n_slots))
+        next_scenario = 0
+        next_to_fold = 0
+        pending = {}
+        finished = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while next_scenario < n_scenarios or pending:
+                # Run at most n_slots scenarios ahead of the next one to
+                # fold, so a straggler cannot make 'finished' grow.
+                while (free_slots and next_scenario < n_scenarios
+                       and next_scenario < next_to_fold + n_slots):
+                    future = pool.submit(
+                        _scenario_worker, shm.name, n_slots,
+                        free_slots.pop(), scenario_seed(next_scenario),
+                        simulation_days, forecaster_backend,
+                        optimizer_params
+                    )
+                    pending[future] = next_scenario
+                    next_scenario += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    slot = future.result()
+                    finished[pending.pop(future)] = slots[slot].copy()
+                    free_slots.append(slot)
+                # P-square quantiles depend on the update order, so rows
+                # are folded in scenario order, as with workers=1.
+                while next_to_fold in finished:
+                    aggregator.update(finished.pop(next_to_fold))
+                    next_to_fold += 1
+        del slots
+    finally:
+        shm.close()
+        shm.unlink()
+    return aggregator.summary()
@@ -1,36 +1,581 @@
-import subprocess
-import sys
-from prophet import Prophet
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from statistics import NormalDist
 
+import numpy as np
+import pandas as pd
 
-class DemandForecaster:
+
+def _prophet_class():
+    """
+    Imports Prophet on first use.
+
+    Prophet pulls in cmdstanpy (and optionally plotly) and takes seconds to
+    import, so it is only loaded once a Prophet-backed forecaster is built.
+    """
+    from prophet import Prophet
+    return Prophet
+
+
+# How predict() fills yhat_lower/yhat_upper:
+# - 'samples': the backend's own intervals (Prophet's Monte Carlo trend
+#   simulation, optionally with fewer samples; harmonic: normal bands).
+# - 'residual': yhat plus empirical quantiles of the in-sample residuals,
+#   computed once per fit in one vectorized pass.
+# - 'off': no intervals (NaN bands), the fastest option.
+UNCERTAINTY_MODES = ('samples', 'residual', 'off')
+
+
+def _check_uncertainty(mode):
+    if mode not in UNCERTAINTY_MODES:
+        raise ValueError(
+            f"Unknown uncertainty mode '{mode}'. "
+            f"Choose one of {UNCERTAINTY_MODES}."
+        )
+
+
+def _residual_bounds(residuals, interval_width):
+    """Lower/upper residual quantiles for a central interval."""
+    tail = (1.0 - interval_width) / 2
+    lower, upper = np.quantile(residuals, [tail, 1.0 - tail])
+    return float(lower), float(upper)
+
+
+def _stan_init(model):
+    """
+    Extracts a fitted Prophet model's parameters as a Stan init.
+
+    Passing this to Prophet.fit(init=...) starts the optimizer from the
+    previous solution instead of from scratch.
     """
-    A wrapper class for the Facebook Prophet forecasting model.
+    params = {
+        name: model.params[name][0][0] for name in ['k', 'm', 'sigma_obs']
+    }
+    for name in ['delta', 'beta']:
+        params[name] = model.params[name][0]
+    return params
+
+
+class ProphetBackend:
+    """
+    Forecasting backend built on the Facebook Prophet model.
 
     Prophet is an additive regression model that works well with time-series
     data that has strong seasonal effects (daily, weekly, yearly) and is
     robust to missing data.
     """
 
-    def __init__(self):
+    name = 'prophet'
+
+    def __init__(self, **params):
         """
         Initializes the Prophet model.
 
         We explicitly enable 'daily_seasonality' because electricity demand
         has a very strong 24-hour pattern (low at night, high in evening).
+
+        Args:
+            **params: Extra keyword arguments passed to Prophet().
+        """
+        self.params = {'daily_seasonality': True, **params}
+        self.model = _prophet_class()(**self.params)
+        self._residual_bounds = None
+
+    def fit(self, history_df, warm_start=False):
+        """
+        Fits Prophet on a DataFrame with columns ['ds', 'y'].
+
+        Args:
+            history_df (pd.DataFrame): Training data.
+            warm_start (bool): Seed the optimizer with the parameters of the
+                               previous fit, if there is one.
+        """
+        self._residual_bounds = None
+        init = None
+        if self.model.history is not None:
+            # A Prophet object can only be fit once.
+            if warm_start:
+                init = _stan_init(self.model)
+            self.model = _prophet_class()(**self.params)
+
+        if init is None:
+            self.model.fit(history_df)
+            return
+        try:
+            self.model.fit(history_df, init=init)
+        except (RuntimeError, ValueError):
+            # The parameter shapes changed (e.g. weekly seasonality switched
+            # on as the history grew), so the old solution does not apply.
+            self.model = _prophet_class()(**self.params)
+            self.model.fit(history_df)
+
+    def update(self, new_df, window=None):
+        """
+        Appends new observations and refits, warm-started.
+
+        Args:
+            new_df (pd.DataFrame): New rows with columns ['ds', 'y'].
+            window (pd.Timedelta): Keep only this much trailing history.
+        """
+        if self.model.history is None:
+            raise ValueError("Model has not been trained yet.")
+        history = pd.concat(
+            [self.model.history[['ds', 'y']], new_df[['ds', 'y']]],
+            ignore_index=True
+        )
+        if window is not None:
+            cutoff = history['ds'].iloc[-1] - pd.Timedelta(window)
+            history = history[history['ds'] > cutoff]
+        self.fit(history, warm_start=True)
+
+    def _predict_point(self, df):
+        """Prophet predict() without the Monte Carlo uncertainty step."""
+        samples = self.model.uncertainty_samples
+        self.model.uncertainty_samples = 0
+        try:
+            return self.model.predict(df)
+        finally:
+            self.model.uncertainty_samples = samples
+
+    def predict(self, horizon_hours, uncertainty='samples', samples=None):
+        """
+        Forecasts the next 'horizon_hours' hours after the history.
+
+        Only the future rows are built and predicted; the history is not
+        re-predicted.
+
+        Args:
+            horizon_hours (int): Number of hours to forecast.
+            uncertainty (str): 'samples', 'residual' or 'off'
+                               (see UNCERTAINTY_MODES).
+            samples (int): Monte Carlo samples for 'samples' mode
+                           (default: Prophet's uncertainty_samples).
+
+        Returns:
+            pd.DataFrame: Columns ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+                          (plus Prophet's component columns).
+        """
+        _check_uncertainty(uncertainty)
+        if self.model.history is None:
+            raise ValueError("Model has not been trained yet.")
+
+        # Create a dataframe with the future dates only
+        future = self.model.make_future_dataframe(
+            periods=horizon_hours, freq='h', include_history=False
+        )
+
+        if uncertainty == 'samples':
+            default = self.model.uncertainty_samples
+            if samples is not None:
+                self.model.uncertainty_samples = samples
+            try:
+                return self.model.predict(future)
+            finally:
+                self.model.uncertainty_samples = default
+
+        forecast = self._predict_point(future)
+        if uncertainty == 'off':
+            forecast['yhat_lower'] = np.nan
+            forecast['yhat_upper'] = np.nan
+            return forecast
+
+        if self._residual_bounds is None:
+            history = self.model.history
+            fitted = self._predict_point(None)['yhat'].to_numpy()
+            self._residual_bounds = _residual_bounds(
+                history['y'].to_numpy() - fitted, self.model.interval_width
+            )
+        lower, upper = self._residual_bounds
+        forecast['yhat_lower'] = forecast['yhat'] + lower
+        forecast['yhat_upper'] = forecast['yhat'] + upper
+        return forecast
+
+    def to_json(self):
+        """Serializes the fitted model with Prophet's JSON format."""
+        from prophet.serialize import model_to_json
+        return model_to_json(self.model)
+
+    def load_json(self, text):
+        """Restores a model produced by to_json()."""
+        from prophet.serialize import model_from_json
+        self._residual_bounds = None
+        self.model = model_from_json(text)
+
+
+class HarmonicBackend:
+    """
+    NumPy-only harmonic regression forecaster.
+
+    Models demand as a linear trend plus Fourier terms for the daily and
+    weekly cycles:
+
+        y(t) = a + b*t + sum_k [c_k sin(2*pi*k*t/P) + d_k cos(2*pi*k*t/P)]
+
+    with t in days and P = 1 (daily) or 7 (weekly). The coefficients are
+    found with a single least-squares solve, so fitting takes milliseconds
+    instead of a Stan optimization.
+
+    The solve uses the normal equations (X'X, X'y), which are kept between
+    fits. Rolling the history forward therefore only adds the new rows and
+    subtracts the dropped ones instead of rebuilding the full design.
+    """
+
+    name = 'harmonic'
+
+    def __init__(self, daily_order=4, weekly_order=3, trend=True,
+                 interval_width=0.8, freq='h'):
+        """
+        Args:
+            daily_order (int): Number of daily Fourier pairs (Prophet: 4).
+            weekly_order (int): Number of weekly Fourier pairs (Prophet: 3).
+                                Only used when the history spans at least
+                                two weeks, like Prophet's auto rule.
+            trend (bool): Include a linear trend term.
+            interval_width (float): Coverage of yhat_lower/yhat_upper.
+            freq (str): Step of the forecast horizon.
+        """
+        self.params = {
+            'daily_order': daily_order,
+            'weekly_order': weekly_order,
+            'trend': trend,
+            'interval_width': interval_width,
+            'freq': freq,
+        }
+        self.coef = None
+        self.sigma = None
+        self.origin = None
+        self.last_ds = None
+        self.use_weekly = False
+        # Training history and normal-equation statistics for warm starts.
+        self.ds_ns = None
+        self.y = None
+        self.xtx = None
+        self.xty = None
+        self.yty = 0.0
+        self._residual_bounds = None
+
+    def _design(self, ns):
+        """
+        Builds the regression matrix for the given timestamps.
+
+        Args:
+            ns (np.ndarray): Timestamps as int64 nanoseconds.
+
+        Returns:
+            np.ndarray: Design matrix, one row per timestamp.
         """
-        self.model = Prophet(daily_seasonality=True)
+        t = (ns - self.origin) / 86_400e9  # days since the first sample
+        columns = [np.ones_like(t)]
+        if self.params['trend']:
+            columns.append(t)
+        cycles = [(1.0, self.params['daily_order'])]
+        if self.use_weekly:
+            cycles.append((7.0, self.params['weekly_order']))
+        for period, order in cycles:
+            k = np.arange(1, order + 1)
+            angle = 2 * np.pi * np.outer(t / period, k)
+            columns.extend([np.sin(angle), np.cos(angle)])
+        return np.column_stack(columns)
+
+    def _accumulate(self, ns, y, sign=1.0):
+        """Adds (sign=1) or removes (sign=-1) rows from the statistics."""
+        if len(ns) == 0:
+            return
+        x = self._design(ns)
+        self.xtx += sign * (x.T @ x)
+        self.xty += sign * (x.T @ y)
+        self.yty += sign * float(y @ y)
+
+    def _fit_arrays(self, ns, y, warm_start):
+        use_weekly = bool(
+            self.params['weekly_order'] > 0
+            and ns[-1] - ns[0] >= pd.Timedelta(days=14).value
+        )
+        reuse = (
+            warm_start
+            and self.xtx is not None
+            and use_weekly == self.use_weekly
+            and self.ds_ns[0] <= ns[0] <= self.ds_ns[-1] <= ns[-1]
+        )
+        if reuse:
+            # Only a forward roll qualifies: the rows both histories share
+            # must be identical, or the statistics would keep stale values.
+            n_drop = np.searchsorted(self.ds_ns, ns[0])
+            n_kept = len(self.ds_ns) - n_drop
+            reuse = (
+                np.array_equal(self.ds_ns[n_drop:], ns[:n_kept])
+                and np.array_equal(self.y[n_drop:], y[:n_kept])
+            )
 
-    def train(self, history_df):
+        if reuse:
+            # Rolling window: drop rows that fell out of the history and
+            # add the ones after the previous end.
+            self._accumulate(self.ds_ns[:n_drop], self.y[:n_drop], -1.0)
+            self._accumulate(ns[n_kept:], y[n_kept:])
+        else:
+            self.origin = ns[0]
+            self.use_weekly = use_weekly
+            n_cols = self._design(ns[:1]).shape[1]
+            self.xtx = np.zeros((n_cols, n_cols))
+            self.xty = np.zeros(n_cols)
+            self.yty = 0.0
+            self._accumulate(ns, y)
+
+        self.ds_ns = ns
+        self.y = y
+        self._residual_bounds = None
+        self.last_ds = pd.Timestamp(ns[-1])
+        self.coef, *_ = np.linalg.lstsq(self.xtx, self.xty, rcond=None)
+        # Residual sum of squares straight from the statistics.
+        rss = (
+            self.yty - 2 * self.coef @ self.xty
+            + self.coef @ self.xtx @ self.coef
+        )
+        self.sigma = float(np.sqrt(max(rss, 0.0) / len(y)))
+
+    def fit(self, history_df, warm_start=False):
         """
-        Trains the Prophet model on historical data.
+        Fits the harmonic model on a DataFrame with columns ['ds', 'y'].
+
+        Args:
+            history_df (pd.DataFrame): Training data.
+            warm_start (bool): Reuse the statistics of the previous fit when
+                               the new history is a forward roll of it.
+        """
+        ns = pd.DatetimeIndex(history_df['ds']).asi8
+        y = np.ascontiguousarray(history_df['y'], dtype=np.float64)
+        self._fit_arrays(ns, y, warm_start)
+
+    def update(self, new_df, window=None):
+        """
+        Appends new observations and refits incrementally.
+
+        Only the new rows (and any rows dropped by 'window') touch the
+        normal equations, so a daily roll costs O(24) design rows.
+
+        Args:
+            new_df (pd.DataFrame): New rows with columns ['ds', 'y'].
+            window (pd.Timedelta): Keep only this much trailing history.
+        """
+        if self.ds_ns is None:
+            raise ValueError("Model has not been trained yet.")
+        ns = np.concatenate(
+            [self.ds_ns, pd.DatetimeIndex(new_df['ds']).asi8]
+        )
+        y = np.concatenate(
+            [self.y, np.asarray(new_df['y'], dtype=np.float64)]
+        )
+        if window is not None:
+            start = np.searchsorted(
+                ns, ns[-1] - pd.Timedelta(window).value, side='right'
+            )
+            ns, y = ns[start:], y[start:]
+        self._fit_arrays(ns, y, warm_start=True)
+
+    def predict(self, horizon_hours, uncertainty='samples', samples=None):
+        """
+        Forecasts the next 'horizon_hours' steps after the history.
+
+        Args:
+            horizon_hours (int): Number of steps to forecast.
+            uncertainty (str): 'samples' (normal bands from the residual
+                               standard deviation; nothing is sampled),
+                               'residual' (empirical residual quantiles)
+                               or 'off'.
+            samples (int): Ignored; accepted for interface compatibility.
+
+        Returns:
+            pd.DataFrame: Columns ['ds', 'yhat', 'yhat_lower', 'yhat_upper'].
+        """
+        _check_uncertainty(uncertainty)
+        if self.coef is None:
+            raise ValueError("Model has not been trained yet.")
+
+        step = pd.tseries.frequencies.to_offset(self.params['freq'])
+        future = pd.date_range(
+            start=self.last_ds + step, periods=horizon_hours, freq=step
+        )
+        yhat = self._design(future.asi8) @ self.coef
+        width = self.params['interval_width']
+        if uncertainty == 'off':
+            lower = upper = np.nan
+        elif uncertainty == 'residual' and self.ds_ns is not None:
+            if self._residual_bounds is None:
+                residuals = self.y - self._design(self.ds_ns) @ self.coef
+                self._residual_bounds = _residual_bounds(residuals, width)
+            lower, upper = self._residual_bounds
+        else:
+            # Normal bands (also the 'residual' fallback for models
+            # restored without their history).
+            z = NormalDist().inv_cdf(0.5 + width / 2)
+            lower, upper = -z * self.sigma, z * self.sigma
+        return pd.DataFrame({
+            'ds': future,
+            'yhat': yhat,
+            'yhat_lower': yhat + lower,
+            'yhat_upper': yhat + upper,
+        })
+
+    def to_json(self):
+        """
+        Serializes the fitted coefficients, plus the training history and
+        normal equations so a restored model can still be update()d.
+        """
+        if self.coef is None:
+            raise ValueError("Model has not been trained yet.")
+        return json.dumps({
+            'coef': self.coef.tolist(),
+            'sigma': self.sigma,
+            'origin': int(self.origin),
+            'last_ds': self.last_ds.isoformat(),
+            'use_weekly': self.use_weekly,
+            'ds_ns': self.ds_ns.tolist(),
+            'y': self.y.tolist(),
+            'xtx': self.xtx.tolist(),
+            'xty': self.xty.tolist(),
+            'yty': self.yty,
+        })
+
+    def load_json(self, text):
+        """Restores a model produced by to_json()."""
+        state = json.loads(text)
+        self._residual_bounds = None
+        self.coef = np.asarray(state['coef'])
+        self.sigma = state['sigma']
+        self.origin = state['origin']
+        self.last_ds = pd.Timestamp(state['last_ds'])
+        self.use_weekly = state['use_weekly']
+        # Entries written before the history was stored can predict but
+        # not update().
+        if 'ds_ns' in state:
+            self.ds_ns = np.asarray(state['ds_ns'], dtype=np.int64)
+            self.y = np.asarray(state['y'], dtype=np.float64)
+            self.xtx = np.asarray(state['xtx'])
+            self.xty = np.asarray(state['xty'])
+            self.yty = state['yty']
+
+
+# Registry of available forecasting backends, keyed by name.
+FORECAST_BACKENDS = {}
+
+
+def register_backend(backend_cls, name=None):
+    """
+    Makes a backend class available to DemandForecaster.
+
+    A backend must accept its hyperparameters as keyword arguments, expose
+    them as 'params', and implement fit(history_df) and
+    predict(horizon_hours) with the same contract as ProphetBackend.
+    predict(horizon_hours, uncertainty, samples) enables the uncertainty
+    modes.
+    Implementing to_json()/load_json(text) enables the model cache, and
+    fit(history_df, warm_start)/update(new_df, window) enable warm starts.
+
+    Args:
+        backend_cls (type): The backend class.
+        name (str): Registry key (defaults to backend_cls.name).
+
+    Returns:
+        type: The backend class, so this can be used as a decorator.
+    """
+    FORECAST_BACKENDS[name or backend_cls.name] = backend_cls
+    return backend_cls
+
+
+register_backend(ProphetBackend)
+register_backend(HarmonicBackend)
+
+
+class DemandForecaster:
+    """
+    Demand forecaster with a pluggable model backend.
+
+    The default backend wraps Facebook Prophet. The 'harmonic' backend is a
+    NumPy-only Fourier regression that fits in milliseconds, which makes it
+    the better choice when forecasting many series.
+    """
+
+    def __init__(self, backend='prophet', cache=None, uncertainty='samples',
+                 uncertainty_samples=None, **params):
+        """
+        Args:
+            backend (str): Name of a registered backend
+                           (see FORECAST_BACKENDS).
+            cache (ModelCache): Optional on-disk cache of fitted models.
+                                On a hit, train() loads instead of refits.
+            uncertainty (str): How yhat_lower/yhat_upper are produced:
+                               'samples' (backend default; for Prophet,
+                               Monte Carlo trend simulation), 'residual'
+                               (fast in-sample residual quantiles) or
+                               'off' (no bands, fastest).
+            uncertainty_samples (int): Sample count for 'samples' mode,
+                                       e.g. 100 instead of Prophet's 1000.
+            **params: Hyperparameters passed to the backend.
+        """
+        _check_uncertainty(uncertainty)
+        if backend not in FORECAST_BACKENDS:
+            raise ValueError(
+                f"Unknown forecaster backend '{backend}'. "
+                f"Choose one of {sorted(FORECAST_BACKENDS)}."
+            )
+        self.backend_name = backend
+        self.backend = FORECAST_BACKENDS[backend](**params)
+        self.cache = cache
+        self.uncertainty = uncertainty
+        self.uncertainty_samples = uncertainty_samples
+
+    @property
+    def model(self):
+        """The underlying model (the Prophet instance for 'prophet')."""
+        return getattr(self.backend, 'model', self.backend)
+
+    def train(self, history_df, warm_start=False):
+        """
+        Trains the model on historical data.
 
         Args:
             history_df (pd.DataFrame): DataFrame with columns ['ds', 'y'].
                                        'ds': Timestamp
                                        'y': The value to predict (Demand)
+            warm_start (bool): Start from the previous fit's parameters
+                               (Prophet init / reused harmonic statistics)
+                               instead of a cold fit.
+        """
+        if self.cache is None:
+            self._fit(history_df, warm_start)
+            return
+
+        key = self.cache.make_key(
+            history_df, self.backend_name, self.backend.params
+        )
+        text = self.cache.get(key)
+        if text is not None:
+            self.backend.load_json(text)
+            return
+
+        self._fit(history_df, warm_start)
+        self.cache.put(key, self.backend.to_json())
+
+    def _fit(self, history_df, warm_start):
+        # Only pass the flag when set, so minimal backends without warm
+        # start support keep working.
+        if warm_start:
+            self.backend.fit(history_df, warm_start=True)
+        else:
+            self.backend.fit(history_df)
+
+    def update(self, new_observations, window=None):
+        """
+        Rolls the model forward with new observations (warm-started).
+
+        Args:
+            new_observations (pd.DataFrame): New rows with ['ds', 'y'].
+            window (pd.Timedelta or str): Keep only this much trailing
+                                          history, e.g. '30D'.
         """
-        self.model.fit(history_df)
+        self.backend.update(new_observations, window=window)
 
     def predict(self, horizon_hours):
         """
@@ -45,24 +590,114 @@ class DemandForecaster:
                                         'yhat_upper']
                           'yhat': The predicted value.
         """
-        # Check if model is trained
-        if not hasattr(self.model, 'params') or self.model.params is None:
-            # Prophet < 1.0 might behave differently, but let's assume
-            # standard behavior.
-            pass
+        # Backends without uncertainty options only see the default call.
+        if self.uncertainty == 'samples' and self.uncertainty_samples is None:
+            return self.backend.predict(horizon_hours)
+        return self.backend.predict(
+            horizon_hours, uncertainty=self.uncertainty,
+            samples=self.uncertainty_samples
+        )
 
-        # Create a dataframe with future dates
-        try:
-            future = self.model.make_future_dataframe(
-                periods=horizon_hours, freq='H'
-            )
-        except Exception:
-            # If make_future_dataframe fails, it's likely because the model
-            # isn't fitted
-            raise ValueError("Model has not been trained yet.")
 
-        # Generate the forecast
-        forecast = self.model.predict(future)
+# One streamed result of forecast_many(); exactly one of 'forecast' and
+# 'error' is set.
+ForecastResult = namedtuple('ForecastResult', ['series_id', 'forecast', 'error'])
+
+
+def _to_arrays(series):
+    """
+    Converts a history to compact (int64 timestamps, float64 values) arrays.
+
+    Args:
+        series (pd.DataFrame or pd.Series): A frame with ['ds', 'y'] or a
+                                            Series indexed by timestamp.
+
+    Returns:
+        tuple: (ds_ns, y) NumPy arrays.
+    """
+    if isinstance(series, pd.Series):
+        ds, y = series.index, series.values
+    else:
+        ds, y = series['ds'], series['y']
+    return (
+        pd.DatetimeIndex(ds).asi8,
+        np.ascontiguousarray(y, dtype=np.float64),
+    )
+
+
+def _forecast_task(series_id, ds_ns, y, horizon, backend, params):
+    """
+    Fits and predicts one series; runs inside a worker process.
+
+    Works on plain arrays in and out so that only a few buffers cross the
+    process boundary. Exceptions are returned rather than raised so one bad
+    series cannot take down the whole batch.
+    """
+    try:
+        forecaster = DemandForecaster(backend=backend, **params)
+        forecaster.train(pd.DataFrame({
+            'ds': pd.DatetimeIndex(ds_ns), 'y': y
+        }))
+        forecast = forecaster.predict(horizon)
+        arrays = (
+            pd.DatetimeIndex(forecast['ds']).asi8,
+            forecast['yhat'].to_numpy(dtype=np.float64),
+            forecast['yhat_lower'].to_numpy(dtype=np.float64),
+            forecast['yhat_upper'].to_numpy(dtype=np.float64),
+        )
+        return series_id, arrays, None
+    except Exception as exc:
+        return series_id, None, exc
+
+
+def _to_result(series_id, arrays, error):
+    if error is not None:
+        return ForecastResult(series_id, None, error)
+    ds_ns, yhat, lower, upper = arrays
+    forecast = pd.DataFrame({
+        'ds': pd.DatetimeIndex(ds_ns),
+        'yhat': yhat,
+        'yhat_lower': lower,
+        'yhat_upper': upper,
+    })
+    return ForecastResult(series_id, forecast, None)
+
+
+def forecast_many(series_by_id, horizon, workers=None, backend='prophet',
+                  **params):
+    """
+    Forecasts many series in parallel across a process pool.
+
+    Each history is reduced to a pair of NumPy arrays before it is sent to a
+    worker, and results are yielded as soon as each fit finishes (so not in
+    input order). A failure in one series is reported in its result instead
+    of aborting the others.
+
+    Args:
+        series_by_id (dict): Maps a series id to its history, either a
+                             DataFrame with ['ds', 'y'] or a Series indexed
+                             by timestamp.
+        horizon (int): Number of hours to forecast per series.
+        workers (int): Number of worker processes (default: CPU count).
+                       workers=1 runs everything in the calling process.
+        backend (str): Forecaster backend name ('harmonic' is the fastest).
+        **params: Hyperparameters passed to the backend.
+
+    Yields:
+        ForecastResult: (series_id, forecast DataFrame, error).
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = (
+        (series_id, *_to_arrays(series), horizon, backend, params)
+        for series_id, series in series_by_id.items()
+    )
+
+    if workers == 1:
+        for task in tasks:
+            yield _to_result(*_forecast_task(*task))
+        return
 
-        # Return only the future part (the last 'horizon_hours' rows)
-        return forecast.tail(horizon_hours)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_forecast_task, *task) for task in tasks]
+        for future in as_completed(futures):
+            yield _to_result(*future.result())
@@ -0,0 +1,447 @@
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_generator import SCENARIO_COLUMNS, _scenario_frame, _step_ns
+from src.results_store import _pyarrow
+
+CANONICAL_COLUMNS = ('ds',) + SCENARIO_COLUMNS
+# Demand and generation are physical flows; prices may go negative.
+NON_NEGATIVE_COLUMNS = ('y', 'solar', 'wind')
+FILL_METHODS = ('interpolate', 'ffill', 'none')
+# pyarrow's CSV reader reads many blocks ahead, so its memory use scales
+# with the block size; small blocks keep it bounded at no cost in speed.
+CSV_BLOCK_BYTES = 4 * 2 ** 20
+
+# Counters of one load. Value counters are summed over the four signal
+# columns, so one row with a bad price and a bad demand counts twice.
+IngestReport = namedtuple(
+    'IngestReport',
+    ['rows_read', 'invalid_timestamps', 'outside_grid', 'invalid_values',
+     'out_of_range', 'gaps_filled', 'gaps_left', 'seconds',
+     'rows_per_second']
+)
+
+
+def _file_format(path):
+    name = str(path).lower()
+    if name.endswith(('.csv', '.csv.gz', '.csv.bz2')):
+        return 'csv'
+    if name.endswith(('.parquet', '.pq')):
+        return 'parquet'
+    raise ValueError(
+        f"Unsupported data file '{path}'. Use CSV or Parquet."
+    )
+
+
+def _open_csv(path, columns=None, value_columns=()):
+    pa = _pyarrow()
+    import pyarrow.csv as pa_csv
+    # Types are otherwise inferred from the first block only, where e.g.
+    # night-time solar may be all integers.
+    convert = pa_csv.ConvertOptions(
+        column_types={col: pa.float64() for col in value_columns},
+        include_columns=columns
+    )
+    return pa_csv.open_csv(
+        path, read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+        convert_options=convert
+    )
+
+
+def _source_columns(path, fmt):
+    """Column names in the file, read from the header / schema only."""
+    if fmt == 'csv':
+        return list(_open_csv(path).schema.names)
+    _pyarrow()
+    import pyarrow.parquet as pq
+    return list(pq.ParquetFile(path).schema_arrow.names)
+
+
+def _read_chunks(path, fmt, columns, chunksize, value_columns=()):
+    """
+    Yields DataFrames with only 'columns': Parquet in batches of
+    chunksize rows, CSV in blocks of CSV_BLOCK_BYTES.
+    """
+    if fmt == 'csv':
+        reader = None
+        while True:
+            try:
+                if reader is None:
+                    reader = _open_csv(path, columns, value_columns)
+                batch = reader.read_next_batch()
+            except StopIteration:
+                return
+            except _pyarrow().ArrowInvalid as exc:
+                raise ValueError(f"Malformed data in '{path}': {exc}")
+            yield batch.to_pandas()
+    _pyarrow()
+    import pyarrow.parquet as pq
+    # pre_buffer would read all row groups' column chunks up front.
+    parquet = pq.ParquetFile(path, pre_buffer=False)
+    for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+        yield batch.to_pandas()
+
+
+def _to_utc_ns(values, timestamp_format):
+    """
+    Parses timestamps to UTC-naive int64 nanoseconds (NaT -> min int).
+
+    Offset-aware timestamps are converted to UTC; naive ones are taken
+    to be UTC already.
+    """
+    parsed = pd.to_datetime(
+        values, errors='coerce', utc=True, format=timestamp_format
+    )
+    return pd.DatetimeIndex(parsed).tz_localize(None).as_unit('ns').asi8
+
+
+def _fill_gaps(values, method, max_gap):
+    """
+    Fills NaN runs in place; runs longer than max_gap are left as NaN.
+
+    Only gaps between the first and last observed value are filled;
+    nothing is extrapolated into leading or trailing gaps.
+
+    Returns:
+        int: Number of values filled.
+    """
+    missing = np.isnan(values)
+    if method == 'none' or not missing.any() or missing.all():
+        return 0
+    known = ~missing
+    first = np.argmax(known)
+    last = len(values) - 1 - np.argmax(known[::-1])
+    fillable = missing.copy()
+    fillable[:first] = False
+    fillable[last + 1:] = False
+    if max_gap is not None:
+        # Run boundaries of the missing mask, then each run's length.
+        edges = np.diff(np.concatenate(([0], missing.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        too_long = ends - starts > max_gap
+        for start, end in zip(starts[too_long], ends[too_long]):
+            fillable[start:end] = False
+    positions = np.arange(len(values))
+    if method == 'interpolate':
+        filled = np.interp(
+            positions[fillable], positions[known], values[known]
+        )
+    else:
+        # Index of the last known value at or before each position.
+        previous = np.maximum.accumulate(np.where(known, positions, 0))
+        filled = values[previous[fillable]]
+    values[fillable] = filled
+    return int(fillable.sum())
+
+
+def _check_coverage(path, freq, means):
+    """
+    Raises if some signal has no value at the start or end of the grid,
+    i.e. the file does not cover the requested time span.
+    """
+    known = ~np.isnan(means)
+    n = means.shape[1]
+    leading = max(
+        int(np.argmax(row)) if row.any() else n for row in known
+    )
+    trailing = max(
+        int(np.argmax(row[::-1])) if row.any() else n for row in known
+    )
+    if leading or trailing:
+        raise ValueError(
+            f"'{path}' does not cover the requested {freq} grid: "
+            f"{leading} steps missing at the start and {trailing} at "
+            "the end."
+        )
+
+
+class _GridAccumulator:
+    """
+    Per-bin sums and counts of the signals on a regular time grid.
+
+    Without a fixed start the grid grows backwards, and without a fixed
+    length forwards, to cover the data as chunks arrive, so no separate
+    pass over the file is needed to find its time span. The buffers grow
+    geometrically and the grid is a view into them, so growing is
+    amortized O(1) per bin however many chunks arrive.
+    """
+
+    def __init__(self, start_ns, step, periods):
+        self.origin = start_ns
+        self.step = step
+        self.fixed_start = start_ns is not None
+        self.fixed_length = self.fixed_start and periods is not None
+        size = periods if self.fixed_length else 0
+        self._allocate(size, 0, size)
+
+    def _allocate(self, capacity, offset, size):
+        # Buffers of 'capacity' bins; the grid is [offset, offset + size).
+        self._sums = np.zeros((len(SCENARIO_COLUMNS), capacity))
+        self._counts = np.zeros(
+            (len(SCENARIO_COLUMNS), capacity), dtype=np.int64
+        )
+        self._rows = np.zeros(capacity, dtype=np.int64)
+        self.offset = offset
+        self.size = size
+
+    @property
+    def sums(self):
+        return self._sums[:, self.offset:self.offset + self.size]
+
+    @property
+    def counts(self):
+        return self._counts[:, self.offset:self.offset + self.size]
+
+    @property
+    def rows(self):
+        return self._rows[self.offset:self.offset + self.size]
+
+    def _grow(self, low, high):
+        if self.origin is None:
+            self.origin = low - low % self.step
+        front = 0
+        if not self.fixed_start:
+            front = max(-((low - self.origin) // self.step), 0)
+        back = 0
+        if not self.fixed_length:
+            back = max((high - self.origin) // self.step + 1
+                       - self.size - front, 0)
+        if not (front or back):
+            return
+        size = self.size + front + back
+        capacity = len(self._rows)
+        if front > self.offset or self.offset + self.size + back > capacity:
+            sums, counts, rows = self.sums, self.counts, self.rows
+            capacity = max(2 * capacity, size)
+            # Leave headroom on the side(s) the grid can still grow to.
+            slack = capacity - size
+            head = (slack // 2 if front else 0) if not self.fixed_start else 0
+            self._allocate(capacity, head, size)
+            self.sums[:, front:front + len(rows)] = sums
+            self.counts[:, front:front + len(rows)] = counts
+            self.rows[front:front + len(rows)] = rows
+        else:
+            self.offset -= front
+            self.size = size
+        self.origin -= front * self.step
+
+    def bins(self, ns):
+        """
+        Maps valid timestamps to bins, growing the grid if allowed.
+
+        Returns:
+            tuple: (bins, on_grid mask).
+        """
+        if len(ns):
+            self._grow(ns.min(), ns.max())
+        bins = (ns - (self.origin or 0)) // self.step
+        on_grid = (bins >= 0) & (bins < len(self.rows))
+        rows = self.rows  # A view into the buffer, updated in place.
+        rows += np.bincount(bins[on_grid], minlength=len(rows))
+        return bins, on_grid
+
+    def add(self, row, bins, values):
+        size = len(self.rows)
+        self.sums[row] += np.bincount(bins, weights=values, minlength=size)
+        self.counts[row] += np.bincount(bins, minlength=size)
+
+    def means(self, periods):
+        """
+        Per-bin means of the first 'periods' bins (all if None), NaN where
+        a bin is empty.
+
+        Returns:
+            tuple: (grid start ns, (4, periods) means, rows cut off).
+        """
+        size = len(self.rows) if periods is None else periods
+        sums = np.full((len(SCENARIO_COLUMNS), size), np.nan)
+        counts = np.zeros((len(SCENARIO_COLUMNS), size), dtype=np.int64)
+        kept = min(size, len(self.rows))
+        sums[:, :kept] = self.sums[:, :kept]
+        counts[:, :kept] = self.counts[:, :kept]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        return self.origin, means, int(self.rows[kept:].sum())
+
+
+def load_metered_data(path, start=None, periods=None, freq='h',
+                      columns=None, chunksize=1_000_000, fill='interpolate',
+                      max_gap=None, dtype=np.float64, timestamp_format=None):
+    """
+    Loads metered demand, renewables and prices onto a regular time grid.
+
+    The file is streamed in chunks with pyarrow, so peak memory is a few
+    chunks plus the grid however large the file is, and the time span need
+    not be known up front. Each chunk is validated with vectorized checks:
+    unparseable timestamps and missing, non-finite or negative (demand,
+    solar, wind) values are dropped and counted. Valid values are binned
+    onto the grid by floor of their timestamp and averaged per bin, which
+    resamples finer data (e.g. 1-minute SCADA) down to 'freq' and
+    tolerates unordered or duplicated rows. Empty bins are then filled
+    according to 'fill'.
+
+    Args:
+        path (str): CSV (optionally compressed) or Parquet file.
+        start (str or pd.Timestamp): First grid timestamp (UTC). Defaults
+                                     to the first timestamp in the file,
+                                     floored to 'freq'.
+        periods (int): Grid length. Defaults to the file's time span.
+        freq (str): Grid step, e.g. 'h' or '15min'.
+        columns (dict): Canonical -> source column name for any of 'ds',
+                        'y', 'solar', 'wind', 'price' that are named
+                        differently in the file.
+        chunksize (int): Rows per Parquet batch (CSV is read in blocks
+                         of CSV_BLOCK_BYTES).
+        fill (str): 'interpolate' (linear, default), 'ffill' or 'none'.
+                    Only gaps between observed values are filled.
+        max_gap (int): Longest gap in steps that is filled (None = any).
+        dtype (np.dtype): float64 (default) or float32 signal columns.
+        timestamp_format (str): strftime format of text timestamps that
+                                are not ISO 8601 (ISO ones are parsed
+                                by the CSV reader itself).
+
+    Returns:
+        pd.DataFrame: Columns ['ds', 'y', 'solar', 'wind', 'price'], as
+                      generate_scenario_data() returns them. The
+                      IngestReport is in attrs['ingest'] as a dict.
+
+    Raises:
+        ValueError: If columns are missing, a CSV value column holds
+                    text, or (unless fill='none') the file does not cover
+                    the grid or gaps remain after filling.
+    """
+    if fill not in FILL_METHODS:
+        raise ValueError(
+            f"Unknown fill method '{fill}'. Choose one of {FILL_METHODS}."
+        )
+    started = time.perf_counter()
+    fmt = _file_format(path)
+    names = {col: (columns or {}).get(col, col) for col in CANONICAL_COLUMNS}
+    missing = [
+        source for source in names.values()
+        if source not in _source_columns(path, fmt)
+    ]
+    if missing:
+        raise ValueError(f"'{path}' is missing columns: {missing}.")
+
+    step = _step_ns(freq)
+    grid = _GridAccumulator(
+        None if start is None else pd.Timestamp(start).value, step, periods
+    )
+    rows_read = bad_ts = outside = invalid = out_of_range = 0
+    value_columns = [names[col] for col in SCENARIO_COLUMNS]
+    for chunk in _read_chunks(path, fmt, list(names.values()), chunksize,
+                              value_columns):
+        rows_read += len(chunk)
+        ns = _to_utc_ns(chunk[names['ds']], timestamp_format)
+        valid_ts = ns != np.iinfo(np.int64).min
+        bad_ts += int((~valid_ts).sum())
+        bins, on_grid = grid.bins(ns[valid_ts])
+        outside += int((~on_grid).sum())
+        bins = bins[on_grid]
+        for row, col in enumerate(SCENARIO_COLUMNS):
+            values = pd.to_numeric(
+                chunk[names[col]], errors='coerce'
+            ).to_numpy(dtype=np.float64)[valid_ts][on_grid]
+            keep = np.isfinite(values)
+            invalid += int((~keep).sum())
+            if col in NON_NEGATIVE_COLUMNS:
+                negative = keep & (values < 0)
+                out_of_range += int(negative.sum())
+                keep &= ~negative
+            grid.add(row, bins[keep], values[keep])
+
+    if grid.origin is None:
+        raise ValueError(f"No valid timestamps in '{path}'.")
+    start_ns, means, cut_off = grid.means(periods)
+    outside += cut_off
+    filled = 0
+    for row in range(len(SCENARIO_COLUMNS)):
+        filled += _fill_gaps(means[row], fill, max_gap)
+    if fill != 'none':
+        _check_coverage(path, freq, means)
+    gaps = np.isnan(means).sum(axis=1)
+    if fill != 'none' and gaps.any():
+        detail = ', '.join(
+            f"{col}: {int(count)}"
+            for col, count in zip(SCENARIO_COLUMNS, gaps) if count
+        )
+        raise ValueError(
+            f"Unfilled gaps on the {freq} grid ({detail} steps); "
+            "raise max_gap or check the data coverage."
+        )
+
+    ns = start_ns + np.arange(means.shape[1], dtype=np.int64) * step
+    frame = _scenario_frame(ns, means.astype(dtype, copy=False))
+    seconds = time.perf_counter() - started
+    frame.attrs['ingest'] = IngestReport(
+        rows_read, bad_ts, outside, invalid, out_of_range, filled,
+        int(gaps.sum()), seconds, rows_read / seconds if seconds else None
+    )._asdict()
+    return frame
+
+
+class MeteredDataSource:
+    """
+    A metered data file that SmartGridSimulation reads instead of
+    generating synthetic data.
+
+    Example:
+        source = MeteredDataSource('scada.parquet', start='2024-01-01',
+                                   columns={'y': 'load_mw'})
+        SmartGridSimulation(simulation_days=30, data_source=source).run()
+    """
+
+    def __init__(self, path, start=None, **options):
+        """
+        Args:
+            path (str): CSV or Parquet file.
+            start (str or pd.Timestamp): First timestamp used (default:
+                                         the first one in the file).
+            **options: Other load_metered_data() arguments (columns,
+                       chunksize, fill, max_gap, timestamp_format).
+        """
+        self.path = path
+        self.start = start
+        self.options = options
+
+    def load(self, days, dtype=np.float64):
+        """
+        Loads 'days' days of hourly data from the start.
+
+        Returns:
+            pd.DataFrame: As load_metered_data().
+
+        Raises:
+            ValueError: If the file does not cover the 'days' requested
+                        (also with fill='none').
+        """
+        frame = load_metered_data(
+            self.path, start=self.start, periods=int(days * 24), freq='h',
+            dtype=dtype, **self.options
+        )
+        _check_coverage(
+            self.path, 'h', frame[list(SCENARIO_COLUMNS)].to_numpy().T
+        )
+        return frame
+
+    def describe(self):
+        """
+        Returns:
+            dict: Path, size, modification time and options, which change
+                  whenever the loaded data may change (for cache keys).
+        """
+        stat = os.stat(self.path)
+        return {
+            'path': os.path.abspath(self.path),
+            'bytes': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'start': None if self.start is None else str(self.start),
+            'options': {key: str(value) for key, value in
+                        sorted(self.options.items())},
+        }
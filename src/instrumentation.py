@@ -0,0 +1,220 @@
+import io
+import json
+import logging
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+
+# One measured pipeline stage. peak_bytes is None when memory tracing is
+# off; rows and rows_per_second are None when the stage reports no rows.
+StageRecord = namedtuple(
+    'StageRecord',
+    ['stage', 'wall_seconds', 'cpu_seconds', 'peak_bytes', 'rows',
+     'rows_per_second']
+)
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+
+class MemorySink:
+    """Keeps every record in a list (handy for tests and notebooks)."""
+
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class LoggingSink:
+    """Writes one log line per stage."""
+
+    def __init__(self, logger=None, level=logging.INFO):
+        """
+        Args:
+            logger (logging.Logger): Target logger; defaults to this
+                                     module's logger.
+            level (int): Log level of the stage lines.
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def emit(self, record):
+        peak = (
+            'n/a' if record.peak_bytes is None
+            else f"{record.peak_bytes / 2 ** 20:.1f} MiB"
+        )
+        self.logger.log(
+            self.level, "stage=%s wall=%.4fs cpu=%.4fs peak=%s rows=%s",
+            record.stage, record.wall_seconds, record.cpu_seconds, peak,
+            record.rows
+        )
+
+
+class JsonLinesSink:
+    """Appends each record as one JSON object per line to a file."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): File to append to (created if missing).
+        """
+        self.path = path
+
+    def emit(self, record):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record._asdict()) + '\n')
+
+
+class _StageHandle:
+    """Yielded by Instrumentation.stage(); set .rows inside the block."""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+
+
+def _start_profiler(profiler):
+    if profiler == 'pyinstrument':
+        from pyinstrument import Profiler
+        prof = Profiler()
+        prof.start()
+    else:
+        import cProfile
+        prof = cProfile.Profile()
+        prof.enable()
+    return prof
+
+
+def _stop_profiler(profiler, prof):
+    """Stops the profiler and returns its report as text."""
+    if profiler == 'pyinstrument':
+        prof.stop()
+        return prof.output_text()
+    import pstats
+    prof.disable()
+    out = io.StringIO()
+    pstats.Stats(prof, stream=out).sort_stats('cumulative').print_stats(30)
+    return out.getvalue()
+
+
+class Instrumentation:
+    """
+    Per-stage wall time, CPU time and peak allocation for a pipeline run.
+
+    Use stage() as a context manager around each stage. A StageRecord is
+    sent to every sink as each stage finishes, and the records are kept
+    in `records`. One stage can also be profiled, with the report kept
+    in `profiles`.
+
+    Example:
+        inst = Instrumentation(sinks=[LoggingSink()], profile_stage='train')
+        sim = SmartGridSimulation(instrumentation=inst)
+        results = sim.run()
+        results.attrs['instrumentation']['stages']
+    """
+
+    def __init__(self, sinks=None, trace_memory=True, profile_stage=None,
+                 profiler='cprofile'):
+        """
+        Args:
+            sinks (list): Objects with an emit(record) method.
+            trace_memory (bool): Record peak allocations with tracemalloc.
+                                 Tracing slows allocation-heavy stages.
+            profile_stage (str): Name of a stage to profile, or None.
+            profiler (str): 'cprofile' (standard library) or
+                            'pyinstrument' (must be installed).
+        """
+        if profiler not in PROFILERS:
+            raise ValueError(
+                f"Unknown profiler '{profiler}'. "
+                f"Choose from {', '.join(PROFILERS)}."
+            )
+        self.sinks = list(sinks or [])
+        self.trace_memory = trace_memory
+        self.profile_stage = profile_stage
+        self.profiler = profiler
+        self.records = []
+        self.profiles = {}
+        # Running peak traced memory of each open (possibly nested) stage.
+        self._peaks = []
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Measures the enclosed block as one stage.
+
+        Args:
+            name (str): Stage name.
+            rows (int): Rows processed, if known up front. Can also be set
+                        on the yielded handle inside the block.
+
+        Yields:
+            _StageHandle: Handle whose `rows` attribute may be set.
+        """
+        handle = _StageHandle(name)
+        handle.rows = rows
+
+        tracing = self.trace_memory
+        started_tracing = tracing and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if tracing:
+            # reset_peak() is global: fold the peak the enclosing stage has
+            # seen so far into its running maximum before resetting.
+            if self._peaks:
+                self._peaks[-1] = max(
+                    self._peaks[-1], tracemalloc.get_traced_memory()[1]
+                )
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            self._peaks.append(baseline)
+
+        prof = None
+        if name == self.profile_stage:
+            prof = _start_profiler(self.profiler)
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            yield handle
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            if prof is not None:
+                self.profiles[name] = _stop_profiler(self.profiler, prof)
+            peak = None
+            if tracing:
+                top = max(
+                    self._peaks.pop(), tracemalloc.get_traced_memory()[1]
+                )
+                peak = max(top - baseline, 0)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], top)
+                if started_tracing:
+                    tracemalloc.stop()
+
+        rate = handle.rows / wall if handle.rows and wall > 0 else None
+        self.emit(StageRecord(name, wall, cpu, peak, handle.rows, rate))
+
+    def reset(self):
+        """Forgets the records and profiles of previous runs."""
+        self.records = []
+        self.profiles = {}
+
+    def emit(self, record):
+        """Stores a record and forwards it to every sink."""
+        self.records.append(record)
+        for sink in self.sinks:
+            sink.emit(record)
+
+    def summary(self):
+        """
+        Returns:
+            dict: {'stages': [record dicts], 'profiles': {stage: text}},
+                  the form attached to a run's results.attrs.
+        """
+        return {
+            'stages': [record._asdict() for record in self.records],
+            'profiles': dict(self.profiles),
+        }
@@ -0,0 +1,207 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from src.forecaster import DemandForecaster
+from src.optimizer import GridOptimizer
+from src.simulation import SimulationCancelled, SmartGridSimulation
+
+
+class SimulationJob:
+    """
+    Handle on a simulation running in the background.
+
+    Attributes:
+        key (tuple): Normalized run parameters (the cache/dedup key).
+        params (dict): The run parameters.
+        stage (str): Pipeline stage currently running.
+        progress (float): Fraction of stages started, 0.0 to 1.0.
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.key = tuple(sorted(params.items()))
+        self.stage = 'queued'
+        self.progress = 0.0
+        self.future = None
+        self._cancel_event = threading.Event()
+        # Set by the manager: forgets a job that is cancelled before it
+        # starts, since its worker never runs to clean up after it.
+        self._on_cancelled = None
+
+    def _on_progress(self, stage, fraction):
+        self.stage = stage
+        self.progress = fraction
+
+    @property
+    def status(self):
+        """One of 'queued', 'running', 'done', 'failed' or 'cancelled'."""
+        if self.future is None or not self.future.done():
+            if self._cancel_event.is_set():
+                return 'cancelled'
+            return 'queued' if self.stage == 'queued' else 'running'
+        if self.future.cancelled():
+            return 'cancelled'
+        error = self.future.exception()
+        if isinstance(error, SimulationCancelled):
+            return 'cancelled'
+        return 'failed' if error is not None else 'done'
+
+    def done(self):
+        """True once the job has finished, failed or been cancelled."""
+        return self.status in ('done', 'failed', 'cancelled')
+
+    def cancel(self):
+        """
+        Requests cancellation; the run stops at the next stage boundary.
+        """
+        self._cancel_event.set()
+        # Succeeds only if the job has not started.
+        if self.future is not None and self.future.cancel():
+            if self._on_cancelled is not None:
+                self._on_cancelled(self)
+
+    def result(self, timeout=None):
+        """
+        Waits for and returns the results DataFrame.
+
+        Every call returns a fresh copy, so callers may modify it without
+        affecting other readers of the (possibly cached) job.
+
+        Raises:
+            SimulationCancelled: If the job was cancelled.
+            Exception: Whatever the simulation raised.
+        """
+        return self.future.result(timeout=timeout).copy()
+
+
+class SimulationJobManager:
+    """
+    Runs parameterized simulations in a background thread pool.
+
+    Submitting the same parameters while a run is in flight returns the
+    existing job instead of starting a second one, and finished results
+    are kept in a small LRU cache keyed by the parameters. Runs with
+    seed=None draw new random data, so they are deduplicated while in
+    flight but never served from the cache.
+    """
+
+    def __init__(self, max_workers=1, cache_size=8, model_cache=None,
+                 stage_cache=None):
+        """
+        Args:
+            max_workers (int): Simulations allowed to run at the same time.
+            cache_size (int): Finished runs kept in the results cache.
+            model_cache (ModelCache): Optional fitted-model cache shared by
+                                      the forecasters of every run.
+            stage_cache (StageCache): Optional stage memo shared by every
+                                      run, so changing only the battery
+                                      settings skips data generation and
+                                      training. StageCache is not
+                                      thread-safe; share it only with
+                                      max_workers=1.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='simulation'
+        )
+        self._lock = threading.Lock()
+        self._active = {}
+        self._finished = OrderedDict()
+        self.cache_size = cache_size
+        self.model_cache = model_cache
+        self.stage_cache = stage_cache
+
+    def submit(self, simulation_days=30, battery_capacity=100, max_power=50,
+               efficiency=0.9, seed=None, forecaster_backend='prophet'):
+        """
+        Starts (or reuses) a simulation run.
+
+        Args:
+            simulation_days (int): Days simulated after the history.
+            battery_capacity (float): Battery capacity in MWh.
+            max_power (float): Battery power rating in MW.
+            efficiency (float): Round-trip efficiency.
+            seed (int): Data seed; None draws new random data.
+            forecaster_backend (str): DemandForecaster backend name.
+
+        Returns:
+            SimulationJob: A new job, the in-flight job with the same
+                           parameters, or a finished job from the cache.
+        """
+        job = SimulationJob({
+            'simulation_days': int(simulation_days),
+            'battery_capacity': float(battery_capacity),
+            'max_power': float(max_power),
+            'efficiency': float(efficiency),
+            'seed': seed,
+            'forecaster_backend': forecaster_backend,
+        })
+        with self._lock:
+            if job.key in self._finished:
+                self._finished.move_to_end(job.key)
+                return self._finished[job.key]
+            existing = self._active.get(job.key)
+            if existing is not None and not existing._cancel_event.is_set():
+                return existing
+            self._active[job.key] = job
+            job._on_cancelled = self._forget
+            job.future = self._executor.submit(self._run, job)
+        return job
+
+    def _forget(self, job):
+        with self._lock:
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+
+    def _run(self, job):
+        params = job.params
+        sim = SmartGridSimulation(
+            simulation_days=params['simulation_days'],
+            forecaster=DemandForecaster(
+                backend=params['forecaster_backend'], cache=self.model_cache,
+                # Cheap bands for the dashboard, no Monte Carlo sampling.
+                uncertainty='residual'
+            ),
+            optimizer=GridOptimizer(
+                battery_capacity=params['battery_capacity'],
+                max_power=params['max_power'],
+                efficiency=params['efficiency'],
+            ),
+            seed=params['seed'],
+            verbose=False,
+            stage_cache=self.stage_cache,
+        )
+        results = None
+        try:
+            results = sim.run(
+                progress=job._on_progress,
+                should_cancel=job._cancel_event.is_set,
+            )
+        finally:
+            # Move the job from in flight to cached in one step, so a
+            # duplicate submit() never finds it in neither.
+            with self._lock:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+                if results is not None and params['seed'] is not None:
+                    self._finished[job.key] = job
+                    while len(self._finished) > self.cache_size:
+                        self._finished.popitem(last=False)
+        return results
+
+    def cached_keys(self):
+        """
+        Returns:
+            list: Parameter keys of the cached finished runs.
+        """
+        with self._lock:
+            return list(self._finished)
+
+    def shutdown(self, cancel=True):
+        """Stops the pool, cancelling running jobs if requested."""
+        if cancel:
+            with self._lock:
+                active = list(self._active.values())
+            for job in active:
+                job.cancel()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,235 @@
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+
+
+def _rainflow(series, points, ranges, counts):
+    """
+    Rainflow-counts one series in a single pass (ASTM E1049, 3-point).
+
+    The series is first reduced to its reversals (flat steps and interior
+    points of monotonic runs dropped). The reversals then go through a
+    stack: whenever the newest range is at least as large as the one
+    before it, that earlier range is closed as a full cycle (or a half
+    cycle if it contains the starting point). What remains on the stack
+    at the end is counted as half cycles. Every point is pushed and
+    popped at most once, so the count is O(n).
+
+    Args:
+        series (np.ndarray): Values, e.g. an SoC trace.
+        points (np.ndarray): Workspace of len(series); also used as the
+                             stack, which never overtakes the read index.
+        ranges (np.ndarray): Output cycle ranges, len(series).
+        counts (np.ndarray): Output cycle counts (1.0 or 0.5).
+
+    Returns:
+        int: Number of cycles written to ranges/counts.
+    """
+    n_points = 0
+    for x in series:
+        if n_points and x == points[n_points - 1]:
+            continue
+        if (n_points >= 2 and (points[n_points - 1] - points[n_points - 2])
+                * (x - points[n_points - 1]) > 0):
+            points[n_points - 1] = x  # Same direction: extend the run.
+        else:
+            points[n_points] = x
+            n_points += 1
+
+    n_cycles = 0
+    top = 0
+    for i in range(n_points):
+        points[top] = points[i]
+        top += 1
+        while top >= 3:
+            newest = abs(points[top - 1] - points[top - 2])
+            previous = abs(points[top - 2] - points[top - 3])
+            if newest < previous:
+                break
+            ranges[n_cycles] = previous
+            if top == 3:
+                # The range includes the starting point: half cycle.
+                counts[n_cycles] = 0.5
+                points[0] = points[1]
+                points[1] = points[2]
+                top = 2
+            else:
+                counts[n_cycles] = 1.0
+                points[top - 3] = points[top - 1]
+                top -= 2
+            n_cycles += 1
+    for i in range(top - 1):
+        ranges[n_cycles] = abs(points[i + 1] - points[i])
+        counts[n_cycles] = 0.5
+        n_cycles += 1
+    return n_cycles
+
+
+def _cycle_totals(soc, initial_soc, battery_capacity, dod_exponent):
+    """Per-row (cycle count, sum of depths, sum of depth ** exponent)."""
+    n_rows, n_hours = soc.shape
+    series = np.empty(n_hours + 1)
+    points = np.empty(n_hours + 1)
+    ranges = np.empty(n_hours + 1)
+    counts = np.empty(n_hours + 1)
+    totals = np.zeros((n_rows, 3))
+    for row in range(n_rows):
+        series[0] = initial_soc[row]
+        series[1:] = soc[row]
+        n_cycles = _rainflow(series, points, ranges, counts)
+        capacity = battery_capacity[row]
+        for k in range(n_cycles):
+            depth = ranges[k] / capacity if capacity > 0 else 0.0
+            totals[row, 0] += counts[k]
+            totals[row, 1] += counts[k] * depth
+            totals[row, 2] += counts[k] * depth ** dod_exponent
+    return totals
+
+
+# Numba is optional, as for the dispatch kernel; compiled on first use.
+NUMBA_AVAILABLE = find_spec('numba') is not None
+_jit_kernels = None
+
+
+def _kernels(use_numba):
+    """Returns (rainflow, cycle_totals), compiling them once if asked."""
+    global _jit_kernels
+    if use_numba and not NUMBA_AVAILABLE:
+        raise ImportError("use_numba=True requires numba to be installed.")
+    if use_numba is None:
+        use_numba = NUMBA_AVAILABLE
+    if not use_numba:
+        return _rainflow, _cycle_totals
+    if _jit_kernels is None:
+        from numba import njit
+        from numba.extending import register_jitable
+        # Lets the compiled _cycle_totals call _rainflow by name.
+        register_jitable(_rainflow)
+        _jit_kernels = (
+            njit(cache=True)(_rainflow), njit(cache=True)(_cycle_totals)
+        )
+    return _jit_kernels
+
+
+def rainflow(soc, initial_soc=None, use_numba=None):
+    """
+    Rainflow cycle counting of one SoC trace.
+
+    Args:
+        soc (array-like): State of charge after each hour (MWh).
+        initial_soc (float): SoC before the first hour, prepended to the
+                             trace if given (GridOptimizer starts at 50%
+                             of capacity).
+        use_numba (bool): Force (True) or disable (False) the JIT path.
+                          None uses Numba whenever it is installed.
+
+    Returns:
+        tuple: (ranges, counts) arrays; ranges are cycle depths in MWh and
+               counts are 1.0 for full cycles and 0.5 for half cycles.
+    """
+    series = np.asarray(soc, dtype=np.float64).ravel()
+    if initial_soc is not None:
+        series = np.concatenate(([float(initial_soc)], series))
+    kernel, _ = _kernels(use_numba)
+    points = np.empty(len(series))
+    ranges = np.empty(len(series))
+    counts = np.empty(len(series))
+    n_cycles = kernel(series, points, ranges, counts)
+    return ranges[:n_cycles], counts[:n_cycles]
+
+
+class DegradationModel:
+    """
+    Cycle-depth battery wear: a cycle of depth of discharge d (fraction
+    of capacity) uses up d ** dod_exponent / cycle_life of the battery's
+    life, i.e. the cycle life at depth d is cycle_life * d ** -dod_exponent.
+    With an exponent above 1, shallow cycles wear the battery less per
+    MWh cycled than deep ones. Used-up life is costed at the replacement
+    cost of the capacity.
+    """
+
+    def __init__(self, cycle_life=5000, dod_exponent=1.5,
+                 replacement_cost=150.0):
+        """
+        Args:
+            cycle_life (float): Full (100% DoD) cycles to end of life.
+            dod_exponent (float): Exponent of the depth-of-discharge
+                                  curve (1.0 = wear proportional to energy
+                                  throughput).
+            replacement_cost (float): Cost of replacing capacity in $/kWh,
+                                      like 'price'; degradation costs are
+                                      capacity (MWh) x replacement cost x
+                                      life used, the same units as
+                                      'cost' (MWh x price).
+        """
+        self.cycle_life = float(cycle_life)
+        self.dod_exponent = float(dod_exponent)
+        self.replacement_cost = float(replacement_cost)
+
+
+CYCLE_METRICS = (
+    'cycles', 'equivalent_full_cycles', 'life_used', 'degradation_cost'
+)
+
+
+def batch_cycle_metrics(soc, battery_capacity, initial_soc=None,
+                        model=None, use_numba=None):
+    """
+    Cycle and degradation metrics for many SoC traces at once.
+
+    Args:
+        soc (array-like): SoC traces, shape (n_configs, n_hours) (or one
+                          trace of shape (n_hours,)).
+        battery_capacity (array-like): Capacity per trace in MWh (scalar
+                                       or shape (n_configs,)).
+        initial_soc (array-like): SoC before the first hour per trace
+                                  (default: 50% of capacity).
+        model (DegradationModel): Wear curve and replacement cost.
+        use_numba (bool): As for rainflow().
+
+    Returns:
+        pd.DataFrame: One row per trace with CYCLE_METRICS columns:
+                      rainflow cycle count, equivalent full cycles (sum of
+                      cycle depths), fraction of battery life used and its
+                      replacement cost.
+    """
+    model = model or DegradationModel()
+    soc = np.atleast_2d(np.asarray(soc, dtype=np.float64))
+    n_rows = soc.shape[0]
+    capacity = np.broadcast_to(
+        np.asarray(battery_capacity, dtype=np.float64), (n_rows,)
+    ).copy()
+    if initial_soc is None:
+        initial = capacity * 0.5
+    else:
+        initial = np.broadcast_to(
+            np.asarray(initial_soc, dtype=np.float64), (n_rows,)
+        ).copy()
+
+    _, cycle_totals = _kernels(use_numba)
+    # Strided views (e.g. DispatchBatchResult.soc) are read in place.
+    totals = cycle_totals(soc, initial, capacity, model.dod_exponent)
+    life_used = totals[:, 2] / model.cycle_life
+    return pd.DataFrame({
+        'cycles': totals[:, 0],
+        'equivalent_full_cycles': totals[:, 1],
+        'life_used': life_used,
+        # MWh x $/kWh, the same convention as 'cost' (MWh x price).
+        'degradation_cost': life_used * capacity * model.replacement_cost,
+    })
+
+
+def cycle_metrics(soc, battery_capacity, initial_soc=None, model=None,
+                  use_numba=None):
+    """
+    Cycle and degradation metrics of one SoC trace.
+
+    Returns:
+        dict: The CYCLE_METRICS values (see batch_cycle_metrics).
+    """
+    row = batch_cycle_metrics(
+        soc, battery_capacity, initial_soc=initial_soc, model=model,
+        use_numba=use_numba
+    ).iloc[0]
+    return {name: float(row[name]) for name in CYCLE_METRICS}
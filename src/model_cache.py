@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class ModelCache:
+    """
+    Content-addressed on-disk cache of fitted forecasting models.
+
+    Each entry is keyed by a SHA-256 hash of the training frame plus the
+    backend name and hyperparameters, so refitting the same history with
+    the same settings becomes a file load. Entries are stored as JSON (the
+    backend's own serialization) and evicted least-recently-used first
+    once the entry count or total size exceeds the configured limits.
+    """
+
+    def __init__(self, directory='data/model_cache', max_entries=64,
+                 max_bytes=None):
+        """
+        Args:
+            directory (str): Folder holding the cached models.
+            max_entries (int): Max number of models kept (None = no limit).
+            max_bytes (int): Max total size in bytes (None = no limit).
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(history_df, backend_name, params):
+        """
+        Hashes a training frame together with the model settings.
+
+        Args:
+            history_df (pd.DataFrame): Training data with ['ds', 'y'].
+            backend_name (str): Name of the forecasting backend.
+            params (dict): Backend hyperparameters.
+
+        Returns:
+            str: Hex digest identifying the fitted model.
+        """
+        digest = hashlib.sha256()
+        digest.update(pd.DatetimeIndex(history_df['ds']).asi8.tobytes())
+        digest.update(
+            np.ascontiguousarray(history_df['y'], dtype=np.float64).tobytes()
+        )
+        settings = {'backend': backend_name, 'params': params}
+        digest.update(
+            json.dumps(settings, sort_keys=True, default=str).encode()
+        )
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """
+        Looks up a serialized model.
+
+        Args:
+            key (str): Key from make_key().
+
+        Returns:
+            str: The serialized model, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        # Touch the file so the modification time tracks recency of use.
+        os.utime(path)
+        self.hits += 1
+        return text
+
+    def put(self, key, text):
+        """
+        Stores a serialized model and applies the eviction policy.
+
+        Args:
+            key (str): Key from make_key().
+            text (str): The serialized model.
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)  # Atomic, so readers never see halves.
+        self._evict()
+
+    def entries(self):
+        """
+        Lists the cached models, least recently used first.
+
+        Returns:
+            list: (key, size_in_bytes, last_used_timestamp) tuples.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((name[:-5], stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def _evict(self):
+        entries = self.entries()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (
+            (self.max_entries is not None
+             and len(entries) > self.max_entries)
+            or (self.max_bytes is not None and total_bytes > self.max_bytes)
+        ):
+            key, size, _ = entries.pop(0)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Removes every cached model."""
+        for key, _, _ in self.entries():
+            os.remove(self._path(key))
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hit/miss/eviction counters and the current cache size.
+        """
+        entries = self.entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+        }
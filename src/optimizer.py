@@ -1,32 +1,513 @@
+from importlib.util import find_spec
+
 import pandas as pd
 import numpy as np
 
+from src.metrics import batch_cycle_metrics
+
+
+def _rule_actions(net_load, prices, max_power):
+    """
+    Computes the rule-based action for every hour in one vectorized pass.
+
+    The heuristic decision (before the SoC constraint is applied) only
+    depends on the load, the price and the horizon-wide thresholds, so it
+    does not need to live inside the sequential loop.
+
+    Args:
+        net_load (np.ndarray): Contiguous float64 net load (MW).
+        prices (np.ndarray): Contiguous float64 prices ($/kWh).
+        max_power (float): Max charge/discharge rate in MW.
+
+    Returns:
+        np.ndarray: Desired battery flow per hour, clipped to the
+                    inverter rating (+ve = Charge, -ve = Discharge).
+    """
+    price_low = np.percentile(prices, 25)
+    price_high = np.percentile(prices, 75)
+    load_peak = np.percentile(net_load, 90)
+
+    # Same priority order as the decision logic in optimize_dispatch:
+    # np.select picks the first condition that is True.
+    actions = np.select(
+        [
+            net_load < 0,
+            net_load > load_peak,
+            prices > price_high,
+            prices < price_low,
+        ],
+        [
+            -net_load,
+            -(net_load - load_peak),
+            -max_power,
+            max_power,
+        ],
+        default=0.0,
+    )
+    return np.clip(actions, -max_power, max_power)
+
+
+def _apply_soc_limits(actions, battery_capacity, efficiency, initial_soc):
+    """
+    Steps the State of Charge recurrence over pre-computed actions.
+
+    This is the only part of the dispatch that is inherently sequential.
+    It is written against plain floats and arrays so that it can be
+    compiled with Numba unchanged.
+
+    Args:
+        actions (np.ndarray): Desired battery flow per hour (MW).
+        battery_capacity (float): Max energy storage in MWh.
+        efficiency (float): Round-trip efficiency (0.0 to 1.0).
+        initial_soc (float): State of Charge before the first hour (MWh).
+
+    Returns:
+        tuple: (battery_flow, soc) arrays of the same length as actions.
+    """
+    n = actions.shape[0]
+    battery_flow = np.empty(n)
+    soc = np.empty(n)
+    current_soc = initial_soc
+
+    for i in range(n):
+        action = actions[i]
+        if action > 0:  # Charging
+            max_possible_charge = (
+                (battery_capacity - current_soc) / efficiency
+            )
+            action = min(action, max_possible_charge)
+            # Clamp so rounding (x / eff * eff) cannot overshoot capacity.
+            current_soc = min(current_soc + action * efficiency,
+                              battery_capacity)
+        else:  # Discharging
+            max_possible_discharge = current_soc * efficiency
+            if abs(action) > max_possible_discharge:
+                action = -max_possible_discharge
+            current_soc = max(current_soc + action / efficiency, 0.0)
+
+        battery_flow[i] = action
+        soc[i] = current_soc
+
+    return battery_flow, soc
+
+
+# Numba is optional; without it the NumPy kernel is used. It is only
+# imported (and the kernel compiled) on first use to keep imports fast.
+NUMBA_AVAILABLE = find_spec('numba') is not None
+_apply_soc_limits_jit = None
+
+
+def _jit_kernel():
+    """Returns the Numba-compiled _apply_soc_limits, compiling it once."""
+    global _apply_soc_limits_jit
+    if _apply_soc_limits_jit is None:
+        from numba import njit
+        _apply_soc_limits_jit = njit(cache=True)(_apply_soc_limits)
+    return _apply_soc_limits_jit
+
+
+def dispatch_kernel(net_load, prices, battery_capacity, max_power,
+                    efficiency, initial_soc=None, use_numba=None):
+    """
+    Array-native version of the heuristic battery dispatch.
+
+    Produces exactly the same schedule as GridOptimizer.optimize_dispatch
+    but works on contiguous NumPy arrays end to end.
+
+    Args:
+        net_load (array-like): Demand - (Solar + Wind) per hour (MW).
+        prices (array-like): Electricity prices ($/kWh).
+        battery_capacity (float): Max energy storage in MWh.
+        max_power (float): Max charge/discharge rate in MW.
+        efficiency (float): Round-trip efficiency (0.0 to 1.0).
+        initial_soc (float): Starting SoC in MWh (default: 50% capacity).
+        use_numba (bool): Force (True) or disable (False) the JIT path.
+                          None uses Numba whenever it is installed.
+
+    Returns:
+        tuple: (battery_flow, soc) as float64 arrays.
+    """
+    load = np.ascontiguousarray(net_load, dtype=np.float64)
+    price = np.ascontiguousarray(prices, dtype=np.float64)
+    if initial_soc is None:
+        initial_soc = battery_capacity * 0.5
+
+    if use_numba and not NUMBA_AVAILABLE:
+        raise ImportError("use_numba=True requires numba to be installed.")
+    if use_numba is None:
+        use_numba = NUMBA_AVAILABLE
+
+    actions = _rule_actions(load, price, float(max_power))
+    kernel = _jit_kernel() if use_numba else _apply_soc_limits
+    return kernel(
+        actions, float(battery_capacity), float(efficiency),
+        float(initial_soc)
+    )
+
+
+def _lp_constraints(n, efficiency):
+    """
+    Builds the SoC balance constraint matrix of an n-hour dispatch LP.
+
+    It only depends on the horizon length and the efficiency, so callers
+    solving many same-length windows can build it once and reuse it.
+
+    Returns:
+        scipy.sparse.csr_matrix: Shape (n, 3 * n) over [c, d, s].
+    """
+    from scipy.sparse import coo_matrix
+
+    t = np.arange(n)
+    c_idx, d_idx, s_idx = t, t + n, t + 2 * n
+    rows = np.concatenate([t, t, t, t[1:]])
+    cols = np.concatenate([s_idx, c_idx, d_idx, s_idx[:-1]])
+    vals = np.concatenate([
+        np.ones(n),
+        np.full(n, -efficiency),
+        np.full(n, 1.0 / efficiency),
+        -np.ones(n - 1),
+    ])
+    return coo_matrix((vals, (rows, cols)), shape=(n, 3 * n)).tocsr()
+
+
+def _solve_lp(prices, battery_capacity, max_power, efficiency,
+              initial_soc, a_eq=None):
+    """
+    Solves the cost-optimal dispatch exactly as a sparse linear program.
+
+    Variables per hour t are the charge c_t, the discharge d_t (both MW at
+    the grid side) and the State of Charge s_t. The SoC balance
+
+        s_t = s_{t-1} + efficiency * c_t - d_t / efficiency
+
+    gives a banded constraint matrix with four non-zeros per row, which is
+    assembled directly in COO form in O(n) and handed to HiGHS.
+
+    Args:
+        prices (np.ndarray): Prices ($/kWh) per hour.
+        battery_capacity (float): Max energy storage in MWh.
+        max_power (float): Max charge/discharge rate in MW.
+        efficiency (float): Round-trip efficiency (0.0 to 1.0).
+        initial_soc (float): State of Charge before the first hour (MWh).
+        a_eq (scipy.sparse.csr_matrix): Pre-built _lp_constraints(n, ...)
+                                        matrix, or None to build it here.
+
+    Returns:
+        tuple: (battery_flow, soc) as float64 arrays.
+    """
+    from scipy.optimize import linprog
+
+    n = prices.shape[0]
+    t = np.arange(n)
+    c_idx, d_idx, s_idx = t, t + n, t + 2 * n
+    if a_eq is None:
+        a_eq = _lp_constraints(n, efficiency)
+    b_eq = np.zeros(n)
+    b_eq[0] = initial_soc
+
+    # Grid cost is sum(price * (net_load + c - d)); net_load is a constant.
+    objective = np.concatenate([prices, -prices, np.zeros(n)])
+    bounds = np.empty((3 * n, 2))
+    bounds[:2 * n] = (0.0, max_power)
+    bounds[2 * n:] = (0.0, battery_capacity)
+
+    res = linprog(objective, A_eq=a_eq, b_eq=b_eq, bounds=bounds,
+                  method='highs')
+    if res.status != 0:
+        raise RuntimeError(f"LP dispatch failed: {res.message}")
+
+    x = res.x
+    battery_flow = x[c_idx] - x[d_idx]
+    soc = np.clip(x[s_idx], 0.0, battery_capacity)
+    return battery_flow, soc
+
+
+def _lp_unsafe(prices):
+    """
+    True if the LP may charge and discharge in the same hour.
+
+    The LP has no complementarity constraint between c_t and d_t, so at a
+    negative price it profits from wasting energy through both at once,
+    and the net flow no longer matches the SoC change. Such horizons are
+    solved with the DP, whose moves are net flows.
+    """
+    return prices.shape[0] > 0 and prices.min() < 0
+
+
+def _dp_transitions(battery_capacity, max_power, efficiency, soc_levels):
+    """
+    Pre-computes the SoC grid and the feasible moves between its levels.
+
+    Args:
+        battery_capacity (float): Max energy storage in MWh.
+        max_power (float): Max charge/discharge rate in MW.
+        efficiency (float): Round-trip efficiency (0.0 to 1.0).
+        soc_levels (int): Number of discrete SoC levels.
+
+    Returns:
+        tuple: (levels, offsets, flows) where offsets are the allowed level
+               steps per hour and flows the grid-side MW of each step.
+    """
+    levels = np.linspace(0.0, battery_capacity, soc_levels)
+    step = levels[1] - levels[0]
+    # Charging delta is limited by P * eff, discharging by P / eff.
+    max_up = int(np.floor(max_power * efficiency / step + 1e-9))
+    max_down = int(np.floor(max_power / efficiency / step + 1e-9))
+    offsets = np.arange(-max_down, max_up + 1)
+    delta = offsets * step
+    flows = np.where(delta > 0, delta / efficiency, delta * efficiency)
+    return levels, offsets, flows
+
+
+def _dp_tables(battery_capacity, max_power, efficiency, soc_levels):
+    """
+    Everything the DP needs that does not depend on the prices.
+
+    Returns:
+        tuple: (levels, offsets, flows, successor, pad) where successor
+               maps (level, move) to an index into a value vector padded
+               with 'pad' +inf entries on each side.
+    """
+    levels, offsets, flows = _dp_transitions(
+        battery_capacity, max_power, efficiency, soc_levels
+    )
+    pad = max(-offsets[0], offsets[-1])
+    successor = np.arange(soc_levels)[:, None] + offsets[None, :] + pad
+    return levels, offsets, flows, successor, pad
+
+
+def _solve_dp(prices, battery_capacity, max_power, efficiency, initial_soc,
+              soc_levels, tables=None):
+    """
+    Solves the cost-optimal dispatch by dynamic programming over SoC.
+
+    The SoC is discretized into soc_levels states. The backward pass is
+    vectorized over (state, move) pairs, so each hour costs one gather and
+    one argmin over a (soc_levels, n_moves) matrix.
+
+    Args:
+        prices (np.ndarray): Prices ($/kWh) per hour.
+        battery_capacity (float): Max energy storage in MWh.
+        max_power (float): Max charge/discharge rate in MW.
+        efficiency (float): Round-trip efficiency (0.0 to 1.0).
+        initial_soc (float): State of Charge before the first hour (MWh).
+        soc_levels (int): Number of discrete SoC levels.
+        tables (tuple): Pre-computed _dp_tables(...) for these battery
+                        parameters, or None to compute them here.
+
+    Returns:
+        tuple: (battery_flow, soc) as float64 arrays.
+    """
+    if tables is None:
+        tables = _dp_tables(
+            battery_capacity, max_power, efficiency, soc_levels
+        )
+    levels, offsets, flows, successor, pad = tables
+    n = prices.shape[0]
+
+    value = np.full(soc_levels + 2 * pad, np.inf)
+    value[pad:pad + soc_levels] = 0.0
+    policy = np.empty((n, soc_levels), dtype=np.int32)
+
+    for t in range(n - 1, -1, -1):
+        q = prices[t] * flows[None, :] + value[successor]
+        best = np.argmin(q, axis=1)
+        policy[t] = best
+        value[pad:pad + soc_levels] = q[np.arange(soc_levels), best]
+
+    battery_flow = np.empty(n)
+    soc = np.empty(n)
+    state = int(np.argmin(np.abs(levels - initial_soc)))
+    for t in range(n):
+        move = policy[t, state]
+        battery_flow[t] = flows[move]
+        state += offsets[move]
+        soc[t] = levels[state]
+    return battery_flow, soc
+
+
+def _rule_components(net_load, prices):
+    """
+    Row-wise version of the rule-based decision for 2-D inputs.
+
+    Splits each desired action into a part that only depends on the load
+    and a sign that multiplies the (per-configuration) inverter rating, so
+    the decision can be shared by every battery configuration.
+
+    Args:
+        net_load (np.ndarray): Net load, shape (rows, n_hours).
+        prices (np.ndarray): Prices, shape (rows, n_hours).
+
+    Returns:
+        tuple: (base, sign) arrays; the desired action of a battery with
+               rating P is base + sign * P.
+    """
+    price_low = np.percentile(prices, 25, axis=1, keepdims=True)
+    price_high = np.percentile(prices, 75, axis=1, keepdims=True)
+    load_peak = np.percentile(net_load, 90, axis=1, keepdims=True)
+
+    net_load, prices = np.broadcast_arrays(net_load, prices)
+    absorb = net_load < 0
+    shave = ~absorb & (net_load > load_peak)
+    rest = ~(absorb | shave)
+    sell = rest & (prices > price_high)
+    buy = rest & ~sell & (prices < price_low)
+
+    base = np.where(
+        absorb, -net_load, np.where(shave, -(net_load - load_peak), 0.0)
+    )
+    sign = np.where(sell, -1.0, np.where(buy, 1.0, 0.0))
+    return base, sign
+
+
+class DispatchBatchResult:
+    """
+    Array-backed results of GridOptimizer.optimize_dispatch_batch.
+
+    Every 2-D array has shape (n_configs, n_hours); row i holds the
+    schedule of the i-th battery configuration.
+    """
+
+    def __init__(self, battery_capacity, max_power, efficiency, net_load,
+                 battery_flow, soc):
+        """
+        Args:
+            battery_capacity (np.ndarray): Capacity per config (MWh).
+            max_power (np.ndarray): Inverter rating per config (MW).
+            efficiency (np.ndarray): Efficiency per config.
+            net_load (np.ndarray): Net load, shape (n_hours,) when shared
+                                   by all configs or (n_configs, n_hours).
+            battery_flow (np.ndarray): Battery flow (MW), +ve = Charge.
+            soc (np.ndarray): State of Charge after each hour (MWh).
+        """
+        self.battery_capacity = battery_capacity
+        self.max_power = max_power
+        self.efficiency = efficiency
+        self.net_load = net_load
+        self.battery_flow = battery_flow
+        self.soc = soc
+
+    def __len__(self):
+        return self.battery_flow.shape[0]
+
+    @property
+    def grid_import(self):
+        """np.ndarray: Net load + battery flow, computed on demand."""
+        return self.net_load + self.battery_flow
+
+    def to_frame(self, i):
+        """
+        Returns configuration i in the optimize_dispatch layout.
+
+        Args:
+            i (int): Row index of the configuration.
+
+        Returns:
+            pd.DataFrame: Columns ['net_load', 'battery_flow', 'soc',
+                                   'grid_import'].
+        """
+        net_load = self.net_load if self.net_load.ndim == 1 \
+            else self.net_load[i]
+        return pd.DataFrame({
+            'net_load': net_load,
+            'battery_flow': self.battery_flow[i],
+            'soc': self.soc[i],
+            'grid_import': net_load + self.battery_flow[i]
+        })
+
+    def summary(self, prices, degradation=None):
+        """
+        Grid cost next to battery cycling and wear, per configuration.
+
+        Args:
+            prices (array-like): Prices ($/kWh) the sweep was run with,
+                                 shape (n_hours,) or (n_configs, n_hours).
+            degradation (DegradationModel): Wear curve and replacement
+                                            cost (default: the defaults).
+
+        Returns:
+            pd.DataFrame: One row per config with battery_capacity,
+                          max_power, efficiency, cost and the
+                          metrics.CYCLE_METRICS columns.
+        """
+        price = np.asarray(prices, dtype=np.float64)
+        if price.ndim == 1:
+            # sum((net_load + flow) * price) without the grid_import temp.
+            cost = self.battery_flow @ price + self.net_load @ price
+        else:
+            cost = np.einsum('ij,ij->i', self.grid_import, price)
+        table = batch_cycle_metrics(
+            self.soc, self.battery_capacity, model=degradation
+        )
+        table.insert(0, 'cost', cost)
+        table.insert(0, 'efficiency', self.efficiency)
+        table.insert(0, 'max_power', self.max_power)
+        table.insert(0, 'battery_capacity', self.battery_capacity)
+        return table
+
+
+DISPATCH_METHODS = ('heuristic', 'lp', 'dp')
+
 
 class GridOptimizer:
     """
     Optimizes battery dispatch (charge/discharge) to balance the grid.
 
-    Uses a heuristic (rule-based) approach to:
+    The default method uses a heuristic (rule-based) approach to:
     1. Store excess renewable energy (Solar/Wind > Demand).
     2. Discharge during peak demand to prevent grid overload.
     3. Perform price arbitrage (Buy low, Sell high).
+
+    The exact methods minimize the grid cost sum(grid_import * price)
+    under the same capacity, power and efficiency constraints:
+    - 'lp': Sparse linear program solved with SciPy's HiGHS. Horizons
+      with negative prices fall back to 'dp' (see _lp_unsafe).
+    - 'dp': Dynamic program over a discretized State of Charge.
     """
 
-    def __init__(self, battery_capacity=100, max_power=50, efficiency=0.9):
+    def __init__(self, battery_capacity=100, max_power=50, efficiency=0.9,
+                 use_numba=None, method='heuristic', soc_levels=101):
         """
         Args:
             battery_capacity (float): Max energy storage in MWh.
             max_power (float): Max charge/discharge rate in MW.
             efficiency (float): Round-trip efficiency (0.0 to 1.0).
+            use_numba (bool): Use the Numba-compiled kernel. None (default)
+                              enables it whenever Numba is installed.
+            method (str): 'heuristic' (default), 'lp' or 'dp'.
+            soc_levels (int): Number of SoC levels for the 'dp' method.
+                              An odd count keeps 50% SoC on the grid.
         """
+        if method not in DISPATCH_METHODS:
+            raise ValueError(
+                f"Unknown dispatch method '{method}'. "
+                f"Choose one of {DISPATCH_METHODS}."
+            )
+        if soc_levels < 2:
+            raise ValueError(
+                f"soc_levels must be at least 2 (got {soc_levels})."
+            )
         self.battery_capacity = battery_capacity
         self.max_power = max_power
         self.efficiency = efficiency
+        self.use_numba = use_numba
+        self.method = method
+        self.soc_levels = soc_levels
 
     def optimize_dispatch(self, net_load, prices):
         """
         Calculates the optimal battery schedule.
 
+        With the default 'heuristic' method the decision logic is applied
+        in priority order:
+        1. Absorb excess renewables (net load < 0).
+        2. Peak shaving above the 90th percentile of net load.
+        3. Price arbitrage: discharge above the 75th price percentile,
+           charge below the 25th.
+        Every action is then clipped to the inverter rating and to the
+        energy that can be stored in / drawn from the battery.
+        The 'lp' and 'dp' methods return the cost-minimizing schedule.
+
         Args:
             net_load (pd.Series): Demand - (Solar + Wind).
                                   Positive = Deficit (Need Grid/Battery).
@@ -37,69 +518,24 @@ class GridOptimizer:
             pd.DataFrame: Results with columns ['net_load', 'battery_flow',
                                                 'soc', 'grid_import'].
         """
-        n = len(net_load)
-        battery_flow = np.zeros(n)  # +ve = Charge, -ve = Discharge
-        soc = np.zeros(n)           # State of Charge (MWh)
-        current_soc = self.battery_capacity * 0.5  # Start at 50% charge
-
-        # Calculate thresholds for decision making
-        # We use percentiles to adapt to the specific data range.
-        price_low = np.percentile(prices, 25)   # Cheap electricity
-        price_high = np.percentile(prices, 75)  # Expensive electricity
-        load_peak = np.percentile(net_load, 90)  # Very high demand
-
-        for i in range(n):
-            load = net_load.iloc[i]
-            price = prices.iloc[i]
-            action = 0  # Default: Do nothing
-
-            # --- DECISION LOGIC ---
-
-            # Priority 1: Absorb Excess Renewables (Self-Consumption)
-            # If load is negative, we have free energy. Charge it!
-            if load < 0:
-                action = -load  # Charge exactly the excess amount
-
-            # Priority 2: Peak Shaving (Grid Stability)
-            # If demand is too high, discharge to help the grid.
-            elif load > load_peak:
-                action = -(load - load_peak)  # Discharge to cap the peak
-
-            # Priority 3: Price Arbitrage (Economics)
-            # If price is high, sell (discharge).
-            elif price > price_high:
-                action = -self.max_power
-            # If price is low, buy (charge).
-            elif price < price_low:
-                action = self.max_power
-
-            # --- CONSTRAINTS CHECK ---
-
-            # 1. Power Limit: Cannot exceed max inverter rating
-            action = np.clip(action, -self.max_power, self.max_power)
-
-            # 2. Energy Limit (SoC): Cannot overcharge or over-discharge
-            if action > 0:  # Charging
-                # Max energy we can fit into the battery
-                max_possible_charge = (
-                    (self.battery_capacity - current_soc) / self.efficiency
-                )
-                action = min(action, max_possible_charge)
-                # Update SoC (Accounting for efficiency loss)
-                current_soc += action * self.efficiency
-
-            else:  # Discharging
-                # Max energy we can take out of the battery
-                max_possible_discharge = current_soc * self.efficiency
-                if abs(action) > max_possible_discharge:
-                    action = -max_possible_discharge
-                # Update SoC (Discharging reduces stored energy)
-                # Note: Efficiency applies on output
-                current_soc += action / self.efficiency
-
-            # Store results
-            battery_flow[i] = action
-            soc[i] = current_soc
+        if self.method == 'heuristic':
+            battery_flow, soc = dispatch_kernel(
+                net_load, prices,
+                battery_capacity=self.battery_capacity,
+                max_power=self.max_power,
+                efficiency=self.efficiency,
+                use_numba=self.use_numba,
+            )
+        else:
+            price = np.ascontiguousarray(prices, dtype=np.float64)
+            args = (
+                price, float(self.battery_capacity), float(self.max_power),
+                float(self.efficiency), self.battery_capacity * 0.5
+            )
+            if self.method == 'lp' and not _lp_unsafe(price):
+                battery_flow, soc = _solve_lp(*args)
+            else:
+                battery_flow, soc = _solve_dp(*args, self.soc_levels)
 
         # Calculate Grid Import
         # Grid Import = Net Load + Battery Charging (positive flow)
@@ -112,3 +548,170 @@ class GridOptimizer:
             'soc': soc,
             'grid_import': grid_import
         })
+
+    def optimize_dispatch_batch(self, net_load, prices, battery_capacity=None,
+                                max_power=None, efficiency=None,
+                                dtype=np.float64):
+        """
+        Runs the heuristic dispatch for many battery configurations at once.
+        (The batch path always uses the rule-based logic, whatever the
+        optimizer's method.)
+
+        The SoC recurrence is stepped hour by hour for all configurations
+        together, so the Python-level loop runs n_hours times regardless of
+        how many configurations are evaluated. Row i of the result is
+        identical to optimize_dispatch on a GridOptimizer built with the
+        i-th parameters.
+
+        Args:
+            net_load (array-like): Net load (MW), shape (n_hours,) shared by
+                                   every config, or (n_configs, n_hours).
+            prices (array-like): Prices ($/kWh), shape (n_hours,) or
+                                 (n_configs, n_hours).
+            battery_capacity (array-like): Capacity per config (MWh).
+            max_power (array-like): Inverter rating per config (MW).
+            efficiency (array-like): Efficiency per config.
+                Any parameter left as None uses this optimizer's value.
+                Scalars are broadcast against the other vectors.
+            dtype (np.dtype): Storage dtype of the result arrays. Use
+                              np.float32 to halve memory on large sweeps.
+
+        Returns:
+            DispatchBatchResult: Array-backed schedules of all configs.
+        """
+        load = np.asarray(net_load, dtype=np.float64)
+        price = np.asarray(prices, dtype=np.float64)
+        if load.ndim not in (1, 2) or price.ndim not in (1, 2):
+            raise ValueError("net_load and prices must be 1-D or 2-D.")
+
+        capacity, power, eff = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(
+                self.battery_capacity if battery_capacity is None
+                else battery_capacity, dtype=np.float64)),
+            np.atleast_1d(np.asarray(
+                self.max_power if max_power is None else max_power,
+                dtype=np.float64)),
+            np.atleast_1d(np.asarray(
+                self.efficiency if efficiency is None else efficiency,
+                dtype=np.float64)),
+        )
+        n_configs = max(
+            capacity.shape[0],
+            load.shape[0] if load.ndim == 2 else 1,
+            price.shape[0] if price.ndim == 2 else 1,
+        )
+        capacity, power, eff = (
+            np.broadcast_to(a, (n_configs,)).copy()
+            for a in (capacity, power, eff)
+        )
+
+        base, sign = _rule_components(np.atleast_2d(load),
+                                      np.atleast_2d(price))
+        n_hours = base.shape[1]
+
+        # Allocate hour-major so each step writes one contiguous row; the
+        # transposed views handed back are (n_configs, n_hours).
+        battery_flow = np.empty((n_hours, n_configs), dtype=dtype)
+        soc = np.empty((n_hours, n_configs), dtype=dtype)
+        current_soc = capacity * 0.5
+
+        for i in range(n_hours):
+            action = np.clip(base[:, i] + sign[:, i] * power, -power, power)
+            charging = action > 0
+
+            # Same constraint logic as _apply_soc_limits, per config.
+            charge = np.minimum(action, (capacity - current_soc) / eff)
+            max_possible_discharge = current_soc * eff
+            discharge = np.where(
+                -action > max_possible_discharge,
+                -max_possible_discharge, action
+            )
+            action = np.where(charging, charge, discharge)
+            current_soc = np.where(
+                charging, np.minimum(current_soc + action * eff, capacity),
+                np.maximum(current_soc + action / eff, 0.0)
+            )
+
+            battery_flow[i] = action
+            soc[i] = current_soc
+
+        return DispatchBatchResult(
+            battery_capacity=capacity,
+            max_power=power,
+            efficiency=eff,
+            net_load=load,
+            battery_flow=battery_flow.T,
+            soc=soc.T,
+        )
+
+
+class RollingDispatcher:
+    """
+    Re-plans dispatch over a short sliding window (receding horizon / MPC).
+
+    Work that does not depend on the window's data is done once and reused
+    by every plan() call: the DP transition tables, and the LP constraint
+    matrix for each window length (only the objective and the initial SoC
+    change between windows). The heuristic has no set-up to share.
+
+    Note: SciPy's HiGHS interface does not accept a starting basis, so LP
+    windows are solved from scratch on the cached matrix.
+    """
+
+    def __init__(self, optimizer, window=24):
+        """
+        Args:
+            optimizer (GridOptimizer): Battery parameters and method.
+            window (int): Planning horizon in hours.
+        """
+        self.optimizer = optimizer
+        self.window = window
+        self._lp_matrices = {}
+        self._dp_tables = None
+        if optimizer.method == 'dp':
+            self._dp_tables = _dp_tables(
+                float(optimizer.battery_capacity), float(optimizer.max_power),
+                float(optimizer.efficiency), optimizer.soc_levels
+            )
+
+    def plan(self, net_load, prices, soc):
+        """
+        Plans dispatch for one window starting from the current SoC.
+
+        Args:
+            net_load (np.ndarray): Forecast net load over the window.
+            prices (np.ndarray): Prices ($/kWh) over the window.
+            soc (float): State of Charge at the start of the window (MWh).
+
+        Returns:
+            tuple: (battery_flow, soc) arrays over the window.
+        """
+        opt = self.optimizer
+        if opt.method == 'heuristic':
+            return dispatch_kernel(
+                net_load, prices,
+                battery_capacity=opt.battery_capacity,
+                max_power=opt.max_power,
+                efficiency=opt.efficiency,
+                initial_soc=soc,
+                use_numba=opt.use_numba,
+            )
+
+        price = np.ascontiguousarray(prices, dtype=np.float64)
+        args = (
+            price, float(opt.battery_capacity), float(opt.max_power),
+            float(opt.efficiency), float(soc)
+        )
+        if opt.method == 'lp' and not _lp_unsafe(price):
+            n = price.shape[0]
+            a_eq = self._lp_matrices.get(n)
+            if a_eq is None:
+                a_eq = _lp_constraints(n, float(opt.efficiency))
+                self._lp_matrices[n] = a_eq
+            return _solve_lp(*args, a_eq=a_eq)
+        if self._dp_tables is None:
+            self._dp_tables = _dp_tables(
+                float(opt.battery_capacity), float(opt.max_power),
+                float(opt.efficiency), opt.soc_levels
+            )
+        return _solve_dp(*args, opt.soc_levels, tables=self._dp_tables)
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+from collections import OrderedDict, deque, namedtuple
+
+import pandas as pd
+
+# Output of one stage of the simulation graph. 'digest' is the content
+# hash of 'value' (None when the stage is not cacheable, e.g. unseeded
+# data) and 'cached' tells whether it was reused instead of computed.
+StageOutput = namedtuple('StageOutput', ['value', 'digest', 'cached'])
+
+# Stage graph of SmartGridSimulation.run(): stage -> stages it reads.
+# In rolling mode 'dispatch' also reads 'train' and produces the forecast.
+STAGE_GRAPH = OrderedDict([
+    ('generate', ()),
+    ('split', ('generate',)),
+    ('train', ('split',)),
+    ('forecast', ('train', 'split')),
+    ('dispatch', ('split',)),
+    ('assemble', ('split', 'forecast', 'dispatch')),
+])
+
+
+def _update_digest(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(b'frame')
+        digest.update(json.dumps([str(c) for c in value.columns]).encode())
+        digest.update(
+            pd.util.hash_pandas_object(value, index=True).values.tobytes()
+        )
+    elif isinstance(value, (tuple, list)):
+        digest.update(f'seq{len(value)}'.encode())
+        for item in value:
+            _update_digest(digest, item)
+    elif isinstance(value, str):
+        digest.update(b'str')
+        digest.update(value.encode())
+    else:
+        digest.update(b'pickle')
+        digest.update(pickle.dumps(value))
+
+
+def content_digest(value):
+    """
+    Hashes a stage output by content.
+
+    DataFrames are hashed row-wise with pandas' hash_pandas_object (plus
+    their column names), strings by their bytes, and tuples/lists item by
+    item, so equal outputs get equal digests however they were produced.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    _update_digest(digest, value)
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Two-tier (memory, then disk) memo of pipeline stage outputs.
+
+    An entry is keyed by the stage name, its parameters and the content
+    digests of its inputs, so a stage is recomputed only when one of those
+    changes, and a recomputed stage whose output is unchanged does not
+    invalidate the stages after it. Both tiers evict least-recently-used
+    entries first. Every lookup, store and eviction is appended to
+    `events` and counted in stats(), so cache behaviour can be inspected.
+    """
+
+    def __init__(self, directory=None, max_memory_entries=32,
+                 max_disk_entries=256, max_events=1000):
+        """
+        Args:
+            directory (str): Folder for the disk tier (None = memory only).
+            max_memory_entries (int): Entries kept in memory.
+            max_disk_entries (int): Entries kept on disk (None = no limit).
+            max_events (int): Length of the recent-events log.
+        """
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self.events = deque(maxlen=max_events)
+        self.counters = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(stage, params, input_digests):
+        """
+        Hashes a stage invocation.
+
+        Args:
+            stage (str): Stage name.
+            params (dict): The stage's own settings.
+            input_digests (list): Content digests of the stage inputs.
+
+        Returns:
+            str: Hex digest identifying the stage output.
+        """
+        payload = json.dumps(
+            {'stage': stage, 'params': params, 'inputs': list(input_digests)},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _record(self, event, stage, key):
+        self.events.append((time.time(), event, stage, key))
+        self.counters[event] = self.counters.get(event, 0) + 1
+
+    def _path(self, stage, key):
+        return os.path.join(self.directory, f"{stage}-{key}.pkl")
+
+    def get(self, stage, key):
+        """
+        Looks up a stage output.
+
+        Returns:
+            tuple: (value, digest), or None on a miss.
+        """
+        entry = self._memory.get((stage, key))
+        if entry is not None:
+            self._memory.move_to_end((stage, key))
+            self._record('hit_memory', stage, key)
+            return entry
+        if self.directory is not None:
+            path = self._path(stage, key)
+            try:
+                with open(path, 'rb') as f:
+                    entry = pickle.load(f)
+            except FileNotFoundError:
+                pass
+            else:
+                os.utime(path)  # mtime tracks recency for LRU eviction.
+                self._record('hit_disk', stage, key)
+                self._remember(stage, key, entry)
+                return entry
+        self._record('miss', stage, key)
+        return None
+
+    def put(self, stage, key, value, digest):
+        """Stores a stage output in both tiers."""
+        entry = (value, digest)
+        self._remember(stage, key, entry)
+        self._record('store', stage, key)
+        if self.directory is not None:
+            path = self._path(stage, key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)  # Atomic, so readers never see halves.
+            self._evict_disk()
+
+    def _remember(self, stage, key, entry):
+        self._memory[(stage, key)] = entry
+        self._memory.move_to_end((stage, key))
+        while len(self._memory) > self.max_memory_entries:
+            (old_stage, old_key), _ = self._memory.popitem(last=False)
+            self._record('evict_memory', old_stage, old_key)
+
+    def _disk_entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pkl'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            stage, _, key = name[:-4].partition('-')
+            entries.append((stage, key, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[3])
+
+    def _evict_disk(self):
+        if self.max_disk_entries is None:
+            return
+        entries = self._disk_entries()
+        while len(entries) > self.max_disk_entries:
+            stage, key, _, _ = entries.pop(0)
+            try:
+                os.remove(self._path(stage, key))
+            except FileNotFoundError:
+                pass
+            self._record('evict_disk', stage, key)
+
+    def entries(self):
+        """
+        Lists what is cached, least recently used first per tier.
+
+        Returns:
+            list: Dicts with stage, key, tier ('memory' or 'disk') and, for
+                  disk entries, bytes and last_used.
+        """
+        listed = [
+            {'stage': stage, 'key': key, 'tier': 'memory'}
+            for stage, key in self._memory
+        ]
+        if self.directory is not None:
+            listed.extend(
+                {'stage': stage, 'key': key, 'tier': 'disk', 'bytes': size,
+                 'last_used': mtime}
+                for stage, key, size, mtime in self._disk_entries()
+            )
+        return listed
+
+    def invalidate(self, stage=None):
+        """
+        Drops cached outputs of one stage, or of every stage.
+
+        Only the named stage is dropped; later stages are recomputed
+        automatically if the recomputed output differs.
+
+        Returns:
+            int: Number of entries removed across both tiers.
+        """
+        removed = 0
+        for mem_stage, key in list(self._memory):
+            if stage is None or mem_stage == stage:
+                del self._memory[(mem_stage, key)]
+                self._record('invalidate', mem_stage, key)
+                removed += 1
+        if self.directory is not None:
+            for disk_stage, key, _, _ in self._disk_entries():
+                if stage is None or disk_stage == stage:
+                    os.remove(self._path(disk_stage, key))
+                    self._record('invalidate', disk_stage, key)
+                    removed += 1
+        return removed
+
+    def stats(self):
+        """
+        Returns:
+            dict: Event counters plus the number of entries per tier.
+        """
+        stats = dict(self.counters)
+        stats['memory_entries'] = len(self._memory)
+        stats['disk_entries'] = (
+            len(self._disk_entries()) if self.directory is not None else 0
+        )
+        return stats
@@ -0,0 +1,210 @@
+import os
+
+import pandas as pd
+
+# File name of each results format inside a run/scenario partition.
+FORMATS = {
+    'parquet': 'results.parquet',
+    'arrow': 'results.arrow',
+}
+
+
+def _pyarrow():
+    """
+    Imports pyarrow, which is only needed for the columnar store and for
+    loading metered data (see ingest).
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "The results store and metered data loading need pyarrow: "
+            "pip install pyarrow"
+        )
+    return pyarrow
+
+
+def _partition_dir(root, run_id, scenario=None):
+    path = os.path.join(root, f"run={run_id}")
+    if scenario is not None:
+        path = os.path.join(path, f"scenario={scenario}")
+    return path
+
+
+def write_results(df, root='data/results', run_id='latest', scenario=None,
+                  format='parquet'):
+    """
+    Writes simulation results as a columnar file.
+
+    Runs are partitioned Hive-style as <root>/run=<id>/[scenario=<s>/].
+    Timestamps keep their datetime64 dtype, so no re-parsing is needed on
+    read.
+
+    Args:
+        df (pd.DataFrame): Results from SmartGridSimulation.run().
+        root (str): Folder of the results store.
+        run_id (str): Identifier of the run.
+        scenario (str): Optional scenario partition inside the run.
+        format (str): 'parquet' (compressed, smallest on disk) or 'arrow'
+                      (uncompressed Arrow IPC, memory-mapped zero-copy
+                      reads for interactive use).
+
+    Returns:
+        str: Path of the written file.
+    """
+    if format not in FORMATS:
+        raise ValueError(
+            f"Unknown format '{format}'. Choose one of {sorted(FORMATS)}."
+        )
+    pa = _pyarrow()
+    directory = _partition_dir(root, run_id, scenario)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, FORMATS[format])
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # A run directory holds one format at a time, so readers are never
+    # confused by a stale file from an earlier write.
+    for other in FORMATS.values():
+        stale = os.path.join(directory, other)
+        if other != FORMATS[format] and os.path.exists(stale):
+            os.remove(stale)
+
+    tmp_path = f"{path}.tmp"
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, tmp_path, compression='zstd')
+    else:
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _read_file(path, columns):
+    pa = _pyarrow()
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        # Memory-mapped IPC: columns are views on the file, nothing is
+        # read until it is touched.
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    return table.to_pandas()
+
+
+def _find_file(directory):
+    for name in FORMATS.values():
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _read_frame(source, what='data'):
+    """
+    Loads a table given as a DataFrame or a CSV, Parquet or Arrow file.
+
+    Args:
+        source (str or pd.DataFrame): The frame (returned as is) or path.
+        what (str): What the table holds, for the error message.
+
+    Returns:
+        pd.DataFrame: The table.
+    """
+    if isinstance(source, pd.DataFrame):
+        return source
+    ext = os.path.splitext(str(source))[1].lower()
+    if ext == '.csv':
+        return pd.read_csv(source)
+    if ext == '.parquet':
+        return pd.read_parquet(source)
+    if ext in ('.arrow', '.feather'):
+        return pd.read_feather(source)
+    raise ValueError(
+        f"Unsupported {what} format '{ext}'. "
+        "Use .csv, .parquet or .arrow."
+    )
+
+
+def list_runs(root='data/results'):
+    """
+    Returns:
+        list: Run ids present in the store.
+    """
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        name[len('run='):] for name in os.listdir(root)
+        if name.startswith('run=')
+    )
+
+
+def list_scenarios(root='data/results', run_id='latest'):
+    """
+    Returns:
+        list: Scenario partitions of a run (empty if unpartitioned).
+    """
+    directory = _partition_dir(root, run_id)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        name[len('scenario='):] for name in os.listdir(directory)
+        if name.startswith('scenario=')
+    )
+
+
+def read_results(root='data/results', run_id='latest', scenario=None,
+                 columns=None):
+    """
+    Loads a run from the store.
+
+    Args:
+        root (str): Folder of the results store.
+        run_id (str): Identifier of the run.
+        scenario (str): Scenario partition to load. None loads the run's
+                        own file, or all scenarios concatenated (with a
+                        'scenario' column) if the run is partitioned.
+        columns (list): Only load these columns, e.g.
+                        ['ds', 'grid_import', 'soc'].
+
+    Returns:
+        pd.DataFrame: The stored results.
+    """
+    path = _find_file(_partition_dir(root, run_id, scenario))
+    if path is not None:
+        return _read_file(path, columns)
+
+    scenarios = list_scenarios(root, run_id) if scenario is None else []
+    if not scenarios:
+        raise FileNotFoundError(
+            f"No results for run '{run_id}'"
+            + (f", scenario '{scenario}'" if scenario is not None else '')
+            + f" in {root}."
+        )
+    frames = []
+    for name in scenarios:
+        df = _read_file(
+            _find_file(_partition_dir(root, run_id, name)), columns
+        )
+        df['scenario'] = name
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def export_csv(path, root='data/results', run_id='latest', scenario=None,
+               columns=None):
+    """
+    Exports a stored run to CSV for tools that need it.
+
+    Args:
+        path (str): Destination CSV file.
+        root, run_id, scenario, columns: As in read_results().
+
+    Returns:
+        str: The destination path.
+    """
+    read_results(root, run_id, scenario, columns).to_csv(path, index=False)
+    return path
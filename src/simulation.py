@@ -1,20 +1,149 @@
+from contextlib import contextmanager
+
+import numpy as np
 import pandas as pd
-from src.optimizer import GridOptimizer
+from src.optimizer import GridOptimizer, RollingDispatcher
 from src.forecaster import DemandForecaster
-from src.data_generator import (
-    generate_demand_data,
-    generate_solar_data,
-    generate_wind_data,
-    generate_price_data
+from src.data_generator import generate_scenario_data
+from src.metrics import cycle_metrics
+from src.pipeline import STAGE_GRAPH, StageOutput, content_digest
+
+# Stages of SmartGridSimulation.run(), in execution order.
+PIPELINE_STAGES = tuple(STAGE_GRAPH)
+
+# 'open_loop': forecast and dispatch the whole period in one go.
+# 'rolling': receding-horizon (MPC) re-forecasting and re-planning.
+SIMULATION_MODES = ('open_loop', 'rolling')
+
+
+# Numeric columns of a compact results frame, in order. There is no 'y':
+# it would only duplicate 'actual_demand'.
+COMPACT_COLUMNS = (
+    'actual_demand', 'solar', 'wind', 'price', 'battery_flow', 'soc',
+    'grid_import', 'forecast_demand', 'net_load', 'cost'
 )
 
 
+class SimulationCancelled(Exception):
+    """Raised by SmartGridSimulation.run() when cancellation is requested."""
+
+
+def _assemble_compact(sim_data, forecast, opt_results):
+    """
+    Writes every result column once into a single preallocated float32
+    block, which the returned frame wraps without copying.
+    """
+    n = len(sim_data)
+    block = np.empty((len(COMPACT_COLUMNS), n), dtype=np.float32)
+    (demand, solar, wind, price, battery_flow, soc, grid_import,
+     forecast_demand, net_load, cost) = block
+
+    demand[:] = sim_data['y'].to_numpy()
+    solar[:] = sim_data['solar'].to_numpy()
+    wind[:] = sim_data['wind'].to_numpy()
+    price[:] = sim_data['price'].to_numpy()
+    battery_flow[:] = opt_results['battery_flow'].to_numpy()
+    soc[:] = opt_results['soc'].to_numpy()
+    grid_import[:] = opt_results['grid_import'].to_numpy()
+    forecast_demand[:] = forecast['yhat'].to_numpy()
+    net_load[:] = opt_results['net_load'].to_numpy()
+    # Multiply the float64 sources so cost is only rounded once.
+    np.multiply(
+        opt_results['grid_import'].to_numpy(), sim_data['price'].to_numpy(),
+        out=cost, casting='same_kind'
+    )
+
+    results = pd.DataFrame(block.T, columns=list(COMPACT_COLUMNS), copy=False)
+    results.insert(0, 'ds', sim_data['ds'].to_numpy())
+    return results
+
+
+def assemble_results(sim_data, forecast, opt_results, compact=False):
+    """
+    Combines the simulated period, forecast and dispatch into one frame.
+
+    Args:
+        sim_data (pd.DataFrame): Simulated period (ds, y, solar, wind, price).
+        forecast (pd.DataFrame): Forecast with a 'yhat' column, row-aligned.
+        opt_results (pd.DataFrame): Output of GridOptimizer.optimize_dispatch.
+        compact (bool): Return float32 columns in one preallocated block,
+                        without the duplicate 'y' column (the demand is
+                        only stored as 'actual_demand'). Inputs are matched
+                        by position, not index.
+
+    Returns:
+        pd.DataFrame: The final simulation results.
+    """
+    if compact:
+        return _assemble_compact(sim_data, forecast, opt_results)
+
+    final_results = pd.concat([
+        sim_data,
+        opt_results[['battery_flow', 'soc', 'grid_import']]
+    ], axis=1)
+
+    # Add the forecast for comparison
+    final_results['forecast_demand'] = forecast['yhat'].values
+    # ...and its prediction interval, when the forecaster produced one.
+    if 'yhat_lower' in forecast and forecast['yhat_lower'].notna().any():
+        final_results['forecast_lower'] = forecast['yhat_lower'].values
+        final_results['forecast_upper'] = forecast['yhat_upper'].values
+
+    # Ensure all columns expected by tests and dashboard are present
+    # 'y' is 'actual_demand'
+    final_results['actual_demand'] = final_results['y']
+
+    # 'net_load' was calculated for optimizer but not saved in opt_results
+    # Recalculate or retrieve. It's in opt_results if we returned it.
+    # Let's check optimizer.py. Yes, it returns 'net_load'.
+    final_results['net_load'] = opt_results['net_load']
+
+    # 'cost' is not returned by optimizer in my updated version?
+    # Let's check optimizer.py.
+    # My updated optimizer.py returns:
+    # ['net_load', 'battery_flow', 'soc', 'grid_import'].
+    # It does NOT return 'cost'. I need to calculate it here.
+    # Cost = Grid Import * Price
+    final_results['cost'] = (
+        final_results['grid_import'] * final_results['price']
+    )
+    return final_results
+
+
+def memory_report(results):
+    """
+    Memory held by a results frame, per column and per simulated hour.
+
+    Args:
+        results (pd.DataFrame): Output of SmartGridSimulation.run().
+
+    Returns:
+        dict: 'rows', 'hours', 'total_bytes', 'bytes_per_hour' and
+              'columns' (bytes per column, including the index).
+    """
+    usage = results.memory_usage(index=True, deep=True)
+    rows = len(results)
+    hours = float(rows)
+    if rows > 1 and 'ds' in results:
+        step = results['ds'].iloc[1] - results['ds'].iloc[0]
+        hours = rows * step / pd.Timedelta(hours=1)
+    total = int(usage.sum())
+    return {
+        'rows': rows,
+        'hours': hours,
+        'total_bytes': total,
+        'bytes_per_hour': total / hours if hours else float('nan'),
+        'columns': {str(name): int(size) for name, size in usage.items()},
+    }
+
+
 class SmartGridSimulation:
     """
     Orchestrates the entire Smart Grid Digital Twin simulation.
 
     Workflow:
-    1. Generate synthetic data (Demand, Solar, Wind, Prices).
+    1. Generate synthetic data (Demand, Solar, Wind, Prices), or load
+       metered data from a MeteredDataSource.
     2. Split data into 'History' (for training) and 'Simulation' (for testing).
     3. Train the Demand Forecaster on historical data.
     4. Predict future demand.
@@ -22,96 +151,463 @@ class SmartGridSimulation:
     6. Combine and save results.
     """
 
-    def __init__(self, simulation_days=30):
+    def __init__(self, simulation_days=30, forecaster=None, optimizer=None,
+                 seed=None, verbose=True, instrumentation=None,
+                 mode='open_loop', mpc_window=24, mpc_step=1,
+                 mpc_refit_every=24, stage_cache=None, compact=False,
+                 data_source=None, degradation=None, tariff=None):
         """
         Args:
             simulation_days (int): Number of days to simulate in test phase.
                                    (We generate double this amount).
+            forecaster (DemandForecaster): Forecaster to use. Defaults to a
+                                           Prophet-backed DemandForecaster
+                                           without uncertainty bands.
+            optimizer (GridOptimizer): Battery optimizer to use. Defaults to
+                                       GridOptimizer() with its defaults.
+            seed (int): Seed for the synthetic data (None = random).
+            verbose (bool): Print progress messages while running.
+            instrumentation (Instrumentation): Optional per-stage timing,
+                                               memory and profiling
+                                               recorder.
+            mode (str): 'open_loop' (default) or 'rolling' (MPC).
+            mpc_window (int): Rolling mode planning window in hours.
+            mpc_step (int): Hours applied from each plan before re-planning
+                            (1 to mpc_window).
+            mpc_refit_every (int): Hours between incremental forecaster
+                                   updates in rolling mode. Forecasts in
+                                   between come from the last update.
+            stage_cache (StageCache): Optional memo of stage outputs, so
+                                      reruns only recompute the stages
+                                      whose inputs changed.
+            compact (bool): Memory-lean mode: float32 data and results,
+                            no copies when splitting and no duplicate
+                            'y' column (see assemble_results).
+            data_source (MeteredDataSource): Metered data to simulate on
+                                             instead of synthetic data; it
+                                             must cover twice
+                                             simulation_days.
+            degradation (DegradationModel): Battery wear model behind the
+                                            degradation metrics (default:
+                                            DegradationModel()).
+            tariff (Tariff): Retail tariff to bill at. Its energy rates
+                             replace the 'price' signal (so dispatch sees
+                             them) and its demand charges are added to
+                             the metrics. None keeps the price signal.
         """
+        if mode not in SIMULATION_MODES:
+            raise ValueError(
+                f"Unknown simulation mode '{mode}'. "
+                f"Choose one of {SIMULATION_MODES}."
+            )
+        if mpc_window < 1 or not 1 <= mpc_step <= mpc_window:
+            raise ValueError(
+                "mpc_window must be at least 1 and mpc_step between 1 "
+                f"and mpc_window (got mpc_window={mpc_window}, "
+                f"mpc_step={mpc_step})."
+            )
+        if mpc_refit_every < 1:
+            raise ValueError(
+                f"mpc_refit_every must be at least 1 (got {mpc_refit_every})."
+            )
         self.simulation_days = simulation_days
-        self.forecaster = DemandForecaster()
-        self.optimizer = GridOptimizer()
+        self.seed = seed
+        self.verbose = verbose
+        self.instrumentation = instrumentation
+        self.mode = mode
+        self.mpc_window = mpc_window
+        self.mpc_step = mpc_step
+        self.mpc_refit_every = mpc_refit_every
+        self.stage_cache = stage_cache
+        self.compact = compact
+        self.data_source = data_source
+        self.degradation = degradation
+        self.tariff = tariff
+        # Only yhat is used by default, so skip Prophet's Monte Carlo bands.
+        self.forecaster = forecaster or DemandForecaster(uncertainty='off')
+        self.optimizer = optimizer or GridOptimizer()
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    @contextmanager
+    def _stage(self, stage, progress, should_cancel, rows=None):
+        """
+        Wraps one pipeline stage: honours cancellation, reports progress
+        and, when instrumentation is configured, measures the stage.
+        """
+        if should_cancel is not None and should_cancel():
+            raise SimulationCancelled(f"Cancelled before stage '{stage}'.")
+        if progress is not None:
+            progress(
+                stage, PIPELINE_STAGES.index(stage) / len(PIPELINE_STAGES)
+            )
+        if self.instrumentation is None:
+            yield None
+        else:
+            with self.instrumentation.stage(stage, rows=rows) as handle:
+                yield handle
+
+    def _rolling_dispatch(self, sim_data):
+        """
+        Receding-horizon dispatch over the simulated period.
+
+        Every mpc_step hours the demand over the next mpc_window hours is
+        re-forecast and the battery re-planned from its current SoC; only
+        the first mpc_step hours of each plan are applied. The forecaster
+        is rolled forward with update() every mpc_refit_every hours (the
+        trailing history length stays fixed), and the optimizer set-up is
+        shared through a RollingDispatcher. Solar, wind and prices over
+        the window are taken as known (day-ahead).
+
+        Returns:
+            tuple: (forecast, opt_results) frames shaped like the
+                   open-loop ones, for assemble_results().
+        """
+        n = len(sim_data)
+        window, step = self.mpc_window, self.mpc_step
+        refit = self.mpc_refit_every
+        demand = sim_data['y'].to_numpy(dtype=np.float64)
+        renewables = (sim_data['solar'] + sim_data['wind']).to_numpy(
+            dtype=np.float64
+        )
+        prices = sim_data['price'].to_numpy(dtype=np.float64)
+        dispatcher = RollingDispatcher(self.optimizer, window=window)
+        history_window = pd.Timedelta(days=self.simulation_days)
+
+        forecast_demand = np.empty(n)
+        battery_flow = np.empty(n)
+        soc_path = np.empty(n)
+        soc = self.optimizer.battery_capacity * 0.5
+        origin, next_refit, yhat = 0, 0, None
+
+        for t in range(0, n, step):
+            if t >= next_refit:
+                if t > 0:
+                    self.forecaster.update(
+                        sim_data.iloc[origin:t][['ds', 'y']],
+                        window=history_window
+                    )
+                origin, next_refit = t, t + refit
+                horizon = min(refit + window, n - t)
+                yhat = self.forecaster.predict(
+                    horizon_hours=horizon
+                )['yhat'].to_numpy(dtype=np.float64)
+
+            end = min(t + window, n)
+            k = t - origin
+            plan_flow, plan_soc = dispatcher.plan(
+                yhat[k:k + end - t] - renewables[t:end], prices[t:end], soc
+            )
+            m = min(step, end - t)
+            battery_flow[t:t + m] = plan_flow[:m]
+            soc_path[t:t + m] = plan_soc[:m]
+            forecast_demand[t:t + m] = yhat[k:k + m]
+            soc = plan_soc[m - 1]
 
-    def run(self):
+        net_load = demand - renewables
+        forecast = pd.DataFrame(
+            {'ds': sim_data['ds'], 'yhat': forecast_demand}
+        )
+        opt_results = pd.DataFrame({
+            'net_load': net_load,
+            'battery_flow': battery_flow,
+            'soc': soc_path,
+            'grid_import': net_load + battery_flow,
+        })
+        return forecast, opt_results
+
+    def _run_stage(self, name, params, inputs, compute, progress,
+                   should_cancel, rows=None, cacheable=True):
+        """
+        Runs one node of the stage graph, or reuses its memoized output.
+
+        Args:
+            name (str): Stage name (see PIPELINE_STAGES).
+            params (dict): Settings of this stage only.
+            inputs (list): StageOutputs of the stages it reads.
+            compute (callable): Produces the stage output.
+            rows (int): Rows processed, for instrumentation.
+            cacheable (bool): False for non-deterministic stages.
+
+        Returns:
+            StageOutput: The value with its content digest.
+        """
+        cache = self.stage_cache
+        key = None
+        if (cache is not None and cacheable
+                and all(item.digest is not None for item in inputs)):
+            key = cache.make_key(
+                name, params, [item.digest for item in inputs]
+            )
+        with self._stage(name, progress, should_cancel, rows=rows):
+            if key is not None:
+                entry = cache.get(name, key)
+                if entry is not None:
+                    self._log(f"Reusing cached '{name}' output.")
+                    return StageOutput(entry[0], entry[1], True)
+            value = compute()
+            if key is None:
+                return StageOutput(value, None, False)
+            digest = content_digest(value)
+            cache.put(name, key, value, digest)
+            return StageOutput(value, digest, False)
+
+    def _forecaster_params(self):
+        backend = self.forecaster.backend
+        return {
+            'backend': self.forecaster.backend_name,
+            'params': getattr(backend, 'params', None),
+        }
+
+    def _optimizer_params(self):
+        opt = self.optimizer
+        return {
+            'battery_capacity': opt.battery_capacity,
+            'max_power': opt.max_power,
+            'efficiency': opt.efficiency,
+            'method': opt.method,
+            'soc_levels': opt.soc_levels,
+        }
+
+    def run(self, progress=None, should_cancel=None):
         """
         Executes the simulation pipeline.
 
+        The run is a graph of stages (see STAGE_GRAPH). With a stage_cache
+        configured, every stage output is memoized under a hash of the
+        stage settings and its inputs' content, so rerunning with e.g.
+        only new battery parameters recomputes just dispatch and assembly.
+
+        Args:
+            progress (callable): Optional progress(stage, fraction) callback,
+                                 called as each stage in PIPELINE_STAGES
+                                 starts and with ('done', 1.0) at the end.
+            should_cancel (callable): Optional callback checked between
+                                      stages; when it returns True the run
+                                      stops with SimulationCancelled.
+
         Returns:
             pd.DataFrame: The final results containing all simulation data.
+                          attrs['metrics'] holds the total cost, the
+                          battery cycle/degradation metrics and, with a
+                          tariff, the demand charge. With
+                          instrumentation configured, the per-stage
+                          measurements are in attrs['instrumentation'].
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.reset()
+
+        def stage(name, params, inputs, compute, rows=None, cacheable=True):
+            return self._run_stage(
+                name, params, inputs, compute, progress, should_cancel,
+                rows=rows, cacheable=cacheable
+            )
+
+        data = self._generate_stage(stage)
+        parts = self._split_stage(stage, data)
+        model = self._train_stage(stage, parts)
+        if self.mode == 'rolling':
+            # 4./5. Forecast and dispatch are interleaved step by step, so
+            # they are reported together as the 'dispatch' stage.
+            dispatch = self._rolling_stage(stage, parts, model)
+            forecast_value, opt_value = dispatch.value
+            assemble_inputs = [parts, dispatch]
+        else:
+            forecast = self._forecast_stage(stage, parts, model)
+            dispatch = self._dispatch_stage(stage, parts)
+            forecast_value, opt_value = forecast.value, dispatch.value
+            assemble_inputs = [parts, forecast, dispatch]
+        final_results = self._assemble_stage(
+            stage, parts, assemble_inputs, forecast_value, opt_value
+        )
+
+        final_results.attrs['metrics'] = self._metrics(final_results)
+        if self.instrumentation is not None:
+            final_results.attrs['instrumentation'] = (
+                self.instrumentation.summary()
+            )
+        self._log("Simulation complete.")
+        if progress is not None:
+            progress('done', 1.0)
+        return final_results
+
+    def _generate_stage(self, stage):
+        """
+        1. Generates (or loads) twice the simulated days: the first half
+        is training history, the second half the simulated period.
         """
-        # 1. Generate Data
-        # We generate 2x days: First half for training, second half for test.
         total_days = self.simulation_days * 2
-        print(f"Generating data for {total_days} days...")
-
-        demand = generate_demand_data(days=total_days)
-        solar = generate_solar_data(days=total_days)
-        wind = generate_wind_data(days=total_days)
-        prices = generate_price_data(days=total_days)
-
-        # Merge into one DataFrame for easier handling
-        data = demand.merge(solar, on='ds').merge(
-            wind, on='ds'
-        ).merge(prices, on='ds')
-
-        # 2. Split Data
-        # Training Data: First 'simulation_days'
-        # Simulation Data: The rest
-        cutoff_date = data['ds'].iloc[self.simulation_days * 24]
-        history_data = data[data['ds'] < cutoff_date].copy()
-        sim_data = data[
-            data['ds'] >= cutoff_date
-        ].copy().reset_index(drop=True)
-
-        print(
-            f"Training Forecaster on {len(history_data)} hours of history..."
+        dtype = np.float32 if self.compact else np.float64
+
+        def generate():
+            if self.data_source is not None:
+                self._log(
+                    f"Loading {total_days} days from "
+                    f"{self.data_source.path}..."
+                )
+                frame = self.data_source.load(days=total_days, dtype=dtype)
+            else:
+                self._log(f"Generating data for {total_days} days...")
+                # All four signals are built in one pass into one DataFrame
+                # (columns: ds, y, solar, wind, price), so no merges are
+                # needed.
+                frame = generate_scenario_data(
+                    days=total_days, seed=self.seed, dtype=dtype
+                )
+            if self.tariff is not None:
+                frame['price'] = self.tariff.energy_rates(
+                    frame['ds']
+                ).astype(dtype)
+            return frame
+
+        if self.data_source is not None:
+            params = {'source': self.data_source.describe()}
+        else:
+            params = {'seed': self.seed}
+        params.update(days=total_days, dtype=np.dtype(dtype).name)
+        if self.tariff is not None:
+            params['tariff'] = content_digest(vars(self.tariff))
+        return stage(
+            'generate', params, [], generate, rows=total_days * 24,
+            # Unseeded data is random, so it (and everything after it)
+            # must not be reused.
+            cacheable=self.seed is not None or self.data_source is not None
         )
 
-        # 3. Train Forecaster
-        self.forecaster.train(history_data[['ds', 'y']])
+    def _split_stage(self, stage, data):
+        """2. Splits the data into (history, simulated period)."""
+        periods = self.simulation_days * 24
+
+        def split():
+            # Training Data: First 'simulation_days'
+            # Simulation Data: The rest
+            frame = data.value
+            if self.compact:
+                # 'ds' is sorted, so positional slices give the same split
+                # as the date mask, as views instead of copies.
+                return frame.iloc[:periods], frame.iloc[periods:]
+            cutoff_date = frame['ds'].iloc[periods]
+            history_data = frame[frame['ds'] < cutoff_date].copy()
+            sim_data = frame[
+                frame['ds'] >= cutoff_date
+            ].copy().reset_index(drop=True)
+            return history_data, sim_data
 
-        # 4. Forecast Demand
-        print("Forecasting future demand...")
-        forecast = self.forecaster.predict(horizon_hours=len(sim_data))
+        return stage(
+            'split', {'periods': periods, 'compact': self.compact}, [data],
+            split, rows=len(data.value)
+        )
+
+    def _train_stage(self, stage, parts):
+        """3. Trains the forecaster on the history."""
+        history_data = parts.value[0]
 
-        # 5. Optimize Battery Dispatch
-        print("Optimizing battery dispatch...")
-        # Calculate Net Load: Demand - (Solar + Wind)
-        # This is the load the grid/battery needs to serve.
-        net_load = sim_data['y'] - (sim_data['solar'] + sim_data['wind'])
+        def train():
+            self._log(
+                f"Training Forecaster on {len(history_data)} hours "
+                "of history..."
+            )
+            self.forecaster.train(history_data[['ds', 'y']])
+            # Memoize the fitted model in its serialized form.
+            if self.stage_cache is not None:
+                return self.forecaster.backend.to_json()
+            return None
 
-        # Run the optimizer
-        opt_results = self.optimizer.optimize_dispatch(
-            net_load, sim_data['price']
+        model = stage(
+            'train', self._forecaster_params(), [parts], train,
+            rows=len(history_data)
         )
+        self._model_loaded = not model.cached
+        return model
+
+    def _fitted_forecaster(self, model):
+        # A reused fit is only deserialized when a later stage needs it.
+        if not self._model_loaded:
+            self.forecaster.backend.load_json(model.value)
+            self._model_loaded = True
+        return self.forecaster
 
-        # 6. Combine Results
-        final_results = pd.concat([
-            sim_data,
-            opt_results[['battery_flow', 'soc', 'grid_import']]
-        ], axis=1)
-
-        # Add the forecast for comparison
-        final_results['forecast_demand'] = forecast['yhat'].values
-
-        # Ensure all columns expected by tests and dashboard are present
-        # 'y' is 'actual_demand'
-        final_results['actual_demand'] = final_results['y']
-
-        # 'net_load' was calculated for optimizer but not saved in opt_results
-        # Recalculate or retrieve. It's in opt_results if we returned it.
-        # Let's check optimizer.py. Yes, it returns 'net_load'.
-        final_results['net_load'] = opt_results['net_load']
-
-        # 'cost' is not returned by optimizer in my updated version?
-        # Let's check optimizer.py.
-        # My updated optimizer.py returns:
-        # ['net_load', 'battery_flow', 'soc', 'grid_import'].
-        # It does NOT return 'cost'. I need to calculate it here.
-        # Cost = Grid Import * Price
-        final_results['cost'] = (
-            final_results['grid_import'] * final_results['price']
+    def _forecast_stage(self, stage, parts, model):
+        """4. Forecasts demand over the simulated period."""
+        sim_data = parts.value[1]
+
+        def predict():
+            self._log("Forecasting future demand...")
+            return self._fitted_forecaster(model).predict(
+                horizon_hours=len(sim_data)
+            )
+
+        params = {
+            'horizon': len(sim_data),
+            'uncertainty': getattr(self.forecaster, 'uncertainty', None),
+            'samples': getattr(self.forecaster, 'uncertainty_samples', None),
+        }
+        return stage(
+            'forecast', params, [model, parts], predict, rows=len(sim_data)
         )
 
-        print("Simulation complete.")
-        return final_results
+    def _dispatch_stage(self, stage, parts):
+        """5. Optimizes battery dispatch over the simulated period."""
+        sim_data = parts.value[1]
+
+        def optimize():
+            self._log("Optimizing battery dispatch...")
+            # Calculate Net Load: Demand - (Solar + Wind)
+            # This is the load the grid/battery needs to serve.
+            net_load = sim_data['y'] - (sim_data['solar'] + sim_data['wind'])
+
+            # Run the optimizer
+            return self.optimizer.optimize_dispatch(
+                net_load, sim_data['price']
+            )
+
+        return stage(
+            'dispatch', self._optimizer_params(), [parts], optimize,
+            rows=len(sim_data)
+        )
+
+    def _rolling_stage(self, stage, parts, model):
+        """4./5. Receding-horizon forecast and dispatch (rolling mode)."""
+        sim_data = parts.value[1]
+
+        def rolling():
+            self._log("Running receding-horizon dispatch...")
+            self._fitted_forecaster(model)
+            return self._rolling_dispatch(sim_data)
+
+        params = dict(
+            self._optimizer_params(), window=self.mpc_window,
+            step=self.mpc_step, refit_every=self.mpc_refit_every
+        )
+        return stage(
+            'dispatch', params, [parts, model], rolling, rows=len(sim_data)
+        )
+
+    def _assemble_stage(self, stage, parts, inputs, forecast, opt_results):
+        """6. Combines the results (including the cost column)."""
+        sim_data = parts.value[1]
+        final = stage(
+            'assemble', {'compact': self.compact}, inputs,
+            lambda: assemble_results(
+                sim_data, forecast, opt_results, compact=self.compact
+            ),
+            rows=len(sim_data)
+        )
+        # Callers own the returned frame; never hand out the cached one.
+        return final.value if final.digest is None else final.value.copy()
+
+    def _metrics(self, results):
+        """Total cost next to battery cycling and wear (see metrics)."""
+        metrics = dict(
+            cost=float(results['cost'].sum()),
+            **cycle_metrics(
+                results['soc'], self.optimizer.battery_capacity,
+                model=self.degradation
+            )
+        )
+        if self.tariff is not None:
+            bill = self.tariff.bill(results['ds'], results['grid_import'])
+            metrics['demand_charge'] = float(bill['demand_charge'].iloc[0])
+        return metrics
@@ -0,0 +1,169 @@
+import math
+from bisect import bisect_left, insort
+from collections import deque
+
+import numpy as np
+
+
+class RunningStats:
+    """
+    Streaming mean/variance/min/max using Welford's algorithm.
+
+    Memory is constant no matter how many values are added, and the update
+    is numerically stable (no large sums of squares).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, x):
+        """Adds one observation."""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1); NaN with fewer than two values."""
+        if self.count < 2:
+            return math.nan
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate with the P-square algorithm.
+
+    Jain & Chlamtac (1985): tracks five markers whose heights approximate
+    the min, p/2, p, (1+p)/2 quantiles and the max, adjusting them with a
+    piecewise-parabolic formula as values arrive. Uses O(1) memory and
+    O(1) time per value.
+    """
+
+    def __init__(self, p):
+        """
+        Args:
+            p (float): Quantile to estimate, between 0 and 1.
+        """
+        if not 0 < p < 1:
+            raise ValueError("p must be between 0 and 1.")
+        self.p = p
+        self.count = 0
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def update(self, x):
+        """Adds one observation."""
+        self.count += 1
+        q = self._heights
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        # Find the cell k with q[k] <= x < q[k + 1], extending the extremes.
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the three middle markers towards their desired positions.
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or \
+                    (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i])
+                    / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1])
+                    / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    # Parabolic step left the bracket; fall back to linear.
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    @property
+    def value(self):
+        """Current estimate (exact while fewer than five values seen)."""
+        if self.count == 0:
+            return math.nan
+        if self.count <= 5:
+            return float(np.quantile(self._heights, self.p))
+        return self._heights[2]
+
+
+class SlidingQuantile:
+    """
+    Exact quantiles over the last 'window' values.
+
+    Keeps the window both in arrival order (to know what to evict) and
+    sorted (to read any quantile by index). Memory is O(window); an update
+    is a binary search plus one insert/remove in a list of at most
+    'window' floats, which is a few microseconds for windows of a few
+    thousand values.
+    """
+
+    def __init__(self, window):
+        """
+        Args:
+            window (int): Number of most recent values to keep.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1.")
+        self.window = window
+        self._fifo = deque()
+        self._sorted = []
+
+    def __len__(self):
+        return len(self._fifo)
+
+    def update(self, x):
+        """Adds one observation, evicting the oldest if the window is full."""
+        if len(self._fifo) == self.window:
+            old = self._fifo.popleft()
+            del self._sorted[bisect_left(self._sorted, old)]
+        self._fifo.append(x)
+        insort(self._sorted, x)
+
+    def quantile(self, p):
+        """
+        Quantile of the current window with linear interpolation (the same
+        definition as np.quantile's default). NaN while empty.
+        """
+        values = self._sorted
+        if not values:
+            return math.nan
+        pos = p * (len(values) - 1)
+        lo = int(pos)
+        if lo + 1 >= len(values):
+            return values[-1]
+        return values[lo] + (pos - lo) * (values[lo + 1] - values[lo])
@@ -0,0 +1,243 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from src.results_store import _read_frame
+
+DAY_TYPES = ('weekday', 'weekend', 'holiday')
+
+# One schedule entry: 'rate' applies on the given months (1-12), day
+# types and hours [start, end) (end < start wraps past midnight). None
+# means every month / every day type. Later entries override earlier ones.
+TariffPeriod = namedtuple(
+    'TariffPeriod', ['rate', 'hours', 'months', 'day_types'],
+    defaults=((0, 24), None, None)
+)
+
+_NS_PER_HOUR = 3_600_000_000_000
+_NS_PER_DAY = 24 * _NS_PER_HOUR
+
+
+def _period_mask(period):
+    """(12, 3, 24) mask of the (month, day type, hour) cells of a period."""
+    mask = np.zeros((12, len(DAY_TYPES), 24), dtype=bool)
+    months = np.arange(12) if period.months is None else (
+        np.asarray(period.months) - 1
+    )
+    day_types = range(len(DAY_TYPES)) if period.day_types is None else [
+        DAY_TYPES.index(name) for name in period.day_types
+    ]
+    start, end = period.hours
+    hours = np.arange(24)
+    in_hours = (
+        (hours >= start) & (hours < end) if start <= end
+        else (hours >= start) | (hours < end)
+    )
+    for day_type in day_types:
+        mask[months, day_type] = in_hours
+    return mask
+
+
+def _read_prices(source):
+    """Loads real-time prices from a Series, frame or CSV/Parquet file."""
+    if isinstance(source, pd.Series):
+        return pd.DatetimeIndex(source.index).asi8, source.to_numpy()
+    source = _read_frame(source, 'price')
+    return pd.DatetimeIndex(source['ds']).asi8, source['price'].to_numpy()
+
+
+def _day_and_time(ns):
+    """
+    Epoch day, weekend flag and second of day of int64 nanosecond
+    timestamps (UTC-naive), without going through pandas.
+    """
+    days = ns // _NS_PER_DAY
+    # 1970-01-01 was a Thursday (dayofweek 3).
+    weekend = (days + 3) % 7 >= 5
+    seconds_of_day = (ns // 1_000_000_000) % 86_400
+    return days, weekend, seconds_of_day
+
+
+def _calendar(ns, holidays):
+    """
+    Flat (month, day type, hour) table index and billing month of each
+    timestamp, computed from the int64 nanoseconds directly.
+    """
+    months = ns.view('M8[ns]').astype('M8[M]').astype(np.int64)
+    days, weekend, seconds_of_day = _day_and_time(ns)
+    day_type = weekend.astype(np.int64)
+    if len(holidays):
+        day_type[np.isin(days, holidays)] = 2
+    hour = seconds_of_day // 3600
+    cell = ((months % 12) * len(DAY_TYPES) + day_type) * 24 + hour
+    return cell, months
+
+
+class Tariff:
+    """
+    Retail tariff: scheduled energy rates, optional real-time prices and
+    monthly demand charges.
+
+    The schedules are compiled once into lookup tables indexed by (month,
+    day type, hour), so pricing any number of samples is one gather per
+    table. Demand charges take the peak import of each calendar month
+    with a single grouped max (np.maximum.reduceat over the contiguous
+    billing months of time-sorted data).
+
+    Charges use the same convention as the 'cost' column: energy is
+    import (MW) x rate ($/kWh) x hours, demand is peak import (MW) x
+    rate ($/kW). Exports (negative import) are credited at the energy
+    rate, as 'cost' does.
+
+    Example:
+        tariff = Tariff(
+            base_rate=0.08,
+            energy=[TariffPeriod(0.22, hours=(16, 21), months=range(6, 10),
+                                 day_types=('weekday',))],
+            demand=[TariffPeriod(12.0),
+                    TariffPeriod(8.0, hours=(16, 21))],
+        )
+    """
+
+    def __init__(self, base_rate=0.10, energy=(), demand=(),
+                 real_time=None, holidays=()):
+        """
+        Args:
+            base_rate (float): Energy rate ($/kWh) outside any period.
+            energy (list): TariffPeriods of energy rates ($/kWh).
+            demand (list): TariffPeriods of demand charges ($/kW-month),
+                           each billed on the monthly peak within its own
+                           hours (e.g. a facility charge plus an on-peak
+                           charge).
+            real_time (pd.DataFrame, pd.Series or str): Real-time prices
+                ($/kWh) as a ['ds', 'price'] frame, a Series or a CSV or
+                Parquet file, added to the scheduled rate. Each price
+                holds until the next one.
+            holidays (list): Dates billed with the 'holiday' day type.
+        """
+        table = np.full((12, len(DAY_TYPES), 24), float(base_rate))
+        for period in energy:
+            table[_period_mask(period)] = period.rate
+        self.energy_table = table
+
+        self.demand_rates = np.array([p.rate for p in demand], dtype=float)
+        self.demand_tables = np.array(
+            [_period_mask(p) for p in demand], dtype=bool
+        ).reshape(len(demand), 12, len(DAY_TYPES), 24)
+
+        self.holidays = (
+            pd.DatetimeIndex(pd.to_datetime(list(holidays))).asi8
+            // _NS_PER_DAY
+        )
+        self.real_time = None
+        if real_time is not None:
+            ns, prices = _read_prices(real_time)
+            order = np.argsort(ns, kind='stable')
+            self.real_time = (ns[order], prices[order].astype(np.float64))
+
+    def _prepare(self, ds):
+        ns = pd.DatetimeIndex(ds).asi8
+        if len(ns) > 1 and (np.diff(ns) <= 0).any():
+            raise ValueError("Timestamps must be strictly increasing.")
+        return ns, _calendar(ns, self.holidays)
+
+    def _energy_rates(self, ns, cell):
+        rates = self.energy_table.ravel()[cell]
+        if self.real_time is not None:
+            rt_ns, rt_prices = self.real_time
+            idx = np.searchsorted(rt_ns, ns, side='right') - 1
+            if len(idx) and idx[0] < 0:
+                raise ValueError(
+                    "Real-time prices start after the first timestamp."
+                )
+            rates = rates + rt_prices[idx]
+        return rates
+
+    def energy_rates(self, ds):
+        """
+        Energy rate in effect at each timestamp.
+
+        Args:
+            ds (array-like): Strictly increasing timestamps.
+
+        Returns:
+            np.ndarray: Rates in $/kWh.
+        """
+        ns, (cell, _) = self._prepare(ds)
+        return self._energy_rates(ns, cell)
+
+    def _charges(self, ds, grid_import):
+        """Energy cost per sample and demand charge per billing month."""
+        ns, (cell, months) = self._prepare(ds)
+        load = np.asarray(grid_import, dtype=np.float64)
+        hours = (
+            (ns[1] - ns[0]) / _NS_PER_HOUR if len(ns) > 1 else 1.0
+        )
+        rates = self._energy_rates(ns, cell) * hours
+
+        starts = np.flatnonzero(np.diff(months, prepend=months[0] - 1))
+        n_periods = len(starts)
+        demand = np.zeros(load.shape[:-1] + (n_periods,))
+        for rate, table in zip(self.demand_rates, self.demand_tables):
+            in_window = table.ravel()[cell]
+            peaks = np.maximum.reduceat(
+                np.where(in_window, load, -np.inf), starts, axis=-1
+            )
+            # Months without any hour in the window, or net exporters,
+            # pay no demand charge.
+            demand += rate * np.maximum(peaks, 0.0)
+        return load, rates, months[starts], starts, demand
+
+    def bill(self, ds, grid_import):
+        """
+        Total bill of one or many import profiles over the same timestamps.
+
+        Args:
+            ds (array-like): Strictly increasing, evenly spaced timestamps.
+            grid_import (array-like): Grid import (MW), shape (n,) or
+                                      (n_configs, n), e.g. the
+                                      DispatchBatchResult.grid_import.
+
+        Returns:
+            pd.DataFrame: One row per profile with energy_cost,
+                          demand_charge and total.
+        """
+        load, rates, _, _, demand = self._charges(ds, grid_import)
+        energy = np.atleast_1d(load @ rates)
+        demand = np.atleast_2d(demand).sum(axis=1)
+        return pd.DataFrame({
+            'energy_cost': energy,
+            'demand_charge': demand,
+            'total': energy + demand,
+        })
+
+    def monthly_bill(self, ds, grid_import):
+        """
+        Bill of one import profile per billing month.
+
+        Returns:
+            pd.DataFrame: Indexed by month start, with energy_cost,
+                          demand_charge and total.
+        """
+        load, rates, months, starts, demand = self._charges(ds, grid_import)
+        if load.ndim != 1:
+            raise ValueError("monthly_bill takes a single import profile.")
+        energy = np.add.reduceat(load * rates, starts)
+        return pd.DataFrame(
+            {'energy_cost': energy, 'demand_charge': demand,
+             'total': energy + demand},
+            index=pd.DatetimeIndex(months.astype('M8[M]'), name='month')
+        )
+
+
+# The time-of-use schedule of the synthetic price data:
+# off-peak 00-06 and 22-24 ($0.05), mid-peak 06-16 and 20-22 ($0.10),
+# on-peak 16-20 ($0.20) every day.
+TOU_TARIFF = Tariff(
+    base_rate=0.05,
+    energy=[
+        TariffPeriod(0.10, hours=(6, 22)),
+        TariffPeriod(0.20, hours=(16, 20)),
+    ],
+)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from src.backtest import backtest, rolling_origin_folds, summarize_backtest
+from src.data_generator import generate_scenario_data
+
+
+@pytest.fixture(scope='module')
+def history():
+    return generate_scenario_data(days=12, seed=0)[['ds', 'y']]
+
+
+def test_rolling_origin_folds():
+    folds = rolling_origin_folds(100, horizon=10, initial=50, step=20)
+    assert [f.cutoff for f in folds] == [50, 70, 90]
+    assert all(f.train_start == 0 for f in folds)
+    sliding = rolling_origin_folds(100, 10, 50, 20, window=30)
+    assert [f.train_start for f in sliding] == [20, 40, 60]
+
+
+def test_backtest_table_and_summary(history):
+    table = backtest(history, horizon=24, initial=24 * 7, workers=1)
+    assert len(table) == 5 * 24
+    assert table['horizon'].max() == 24 and table['fold'].nunique() == 5
+
+    # Scored actuals are the true values after each cutoff.
+    first = table[table['fold'] == 0]
+    np.testing.assert_allclose(
+        first['y'], history['y'].iloc[24 * 7:24 * 8], rtol=1e-6
+    )
+
+    by_horizon = summarize_backtest(table)
+    assert len(by_horizon) == 24 and (by_horizon['count'] == 5).all()
+    overall = summarize_backtest(table, by=None)
+    assert 0 < overall['mape'].iloc[0] < 20
+    assert overall['pinball'].iloc[0] > 0
+
+
+def test_warm_start_and_parallel_match_cold_fits(history):
+    kwargs = dict(horizon=24, initial=24 * 7, step=24)
+    warm = backtest(history, workers=1, **kwargs)
+    cold = backtest(history, workers=1, warm_start=False, **kwargs)
+    parallel = backtest(history, workers=2, **kwargs)
+    np.testing.assert_allclose(warm['yhat'], cold['yhat'], rtol=1e-4)
+    np.testing.assert_allclose(warm['yhat'], parallel['yhat'], rtol=1e-4)
+
+
+def test_backtest_rejects_short_history(history):
+    with pytest.raises(ValueError):
+        backtest(history.iloc[:48], initial=24 * 7)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.controller import OnlineDispatchController, replay
+
+
+def _recording(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    hours = np.arange(n) % 24
+    return pd.DataFrame({
+        'ds': pd.date_range('2023-01-01', periods=n, freq='h'),
+        'net_load': 60 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 20, n),
+        'price': 0.1 + 0.05 * np.cos(2 * np.pi * hours / 24),
+    })
+
+
+def test_thresholds_track_the_sliding_window():
+    frame = _recording()
+    controller = OnlineDispatchController(window=48)
+    for load, price in zip(frame['net_load'], frame['price']):
+        controller.step(load, price)
+    low, high, peak = controller.thresholds()
+    assert low == pytest.approx(np.percentile(frame['price'][-48:], 25))
+    assert high == pytest.approx(np.percentile(frame['price'][-48:], 75))
+    assert peak == pytest.approx(np.percentile(frame['net_load'][-48:], 90))
+
+
+def test_first_sample_absorbs_excess_renewables():
+    controller = OnlineDispatchController(window=None)
+    assert controller.step(-20.0, 0.1) == 20.0
+    assert controller.soc == pytest.approx(50 + 20 * 0.9)
+
+
+@pytest.mark.parametrize("window", [24, None])
+def test_replay_from_parquet(tmp_path, window):
+    path = tmp_path / 'recording.parquet'
+    _recording().to_parquet(path)
+    controller = OnlineDispatchController(window=window)
+    results, latency = replay(str(path), controller)
+
+    assert len(results) == 500 and 'ds' in results
+    assert results['soc'].between(0, 100).all()
+    assert results['battery_flow'].abs().max() <= 50
+    np.testing.assert_allclose(
+        results['grid_import'], results['net_load'] + results['battery_flow']
+    )
+    assert set(latency) == {'p50', 'p90', 'p99', 'p99.9', 'max'}
+    assert 0 < latency['p50'] <= latency['max']
+
+
+def test_replay_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        replay('recording.xlsx')
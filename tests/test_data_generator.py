@@ -1,6 +1,10 @@
 import pytest
+import numpy as np
 import pandas as pd
-from src.data_generator import generate_demand_data, generate_solar_data, generate_wind_data, generate_price_data
+from src.data_generator import (
+    generate_demand_data, generate_solar_data, generate_wind_data, generate_price_data,
+    generate_scenario_chunk, generate_scenario_data, iter_scenario_chunks
+)
 
 def test_generate_demand_data():
     df = generate_demand_data(days=5)
@@ -28,3 +32,55 @@ def test_generate_price_data():
     assert len(df) == 5 * 24
     assert 'price' in df.columns
     assert df['price'].min() > 0
+
+
+def test_iter_scenario_chunks_sub_hourly():
+    chunks = list(iter_scenario_chunks(days=2, freq='15min', chunk_size=50, seed=1))
+    df = pd.concat(chunks, ignore_index=True)
+    assert len(chunks) == 4  # 192 rows in chunks of 50
+    assert len(df) == 2 * 24 * 4
+    assert list(df.columns) == ['ds', 'y', 'solar', 'wind', 'price']
+    assert (df['ds'].diff().dropna() == pd.Timedelta(minutes=15)).all()
+    assert df['y'].min() >= 0
+    assert df['solar'].between(0, 200).all()
+    assert df['wind'].between(0, 150).all()
+    assert df['price'].min() > 0
+
+
+def test_scenario_chunks_reproducible_out_of_order():
+    in_order = list(iter_scenario_chunks(days=3, chunk_size=20, seed=123))
+    periods = 3 * 24
+    for index in reversed(range(len(in_order))):
+        chunk = generate_scenario_chunk(index, periods, seed=123, chunk_size=20)
+        pd.testing.assert_frame_equal(chunk, in_order[index])
+
+    other = next(iter_scenario_chunks(days=3, chunk_size=20, seed=124))
+    assert not other['y'].equals(in_order[0]['y'])
+
+
+def test_scenario_calendar_matches_pandas():
+    chunk = next(iter_scenario_chunks(days=7, seed=0))
+    weekend = chunk['ds'].dt.dayofweek >= 5
+    night = chunk['ds'].dt.hour < 6
+    assert (chunk.loc[night, 'solar'] == 0).all()
+    assert chunk.loc[weekend, 'y'].mean() < chunk.loc[~weekend, 'y'].mean()
+
+
+def test_generate_scenario_data_single_frame():
+    df = generate_scenario_data(days=5, seed=42)
+    assert len(df) == 5 * 24
+    assert list(df.columns) == ['ds', 'y', 'solar', 'wind', 'price']
+    pd.testing.assert_frame_equal(df, generate_scenario_data(days=5, seed=42))
+
+    hours = df['ds'].dt.hour
+    on_peak = df.loc[(hours >= 16) & (hours < 20), 'price']
+    off_peak = df.loc[hours < 6, 'price']
+    assert on_peak.min() > off_peak.max()
+
+
+def test_unseeded_scenario_follows_global_seed():
+    np.random.seed(7)
+    first = generate_scenario_data(days=2)
+    np.random.seed(7)
+    pd.testing.assert_frame_equal(first, generate_scenario_data(days=2))
+    assert not first.equals(generate_scenario_data(days=2))
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from src.downsample import (
+    MultiResolutionSeries, downsample, lttb_indices, minmax_indices
+)
+
+
+def _series(n=100_000):
+    rng = np.random.default_rng(0)
+    ds = pd.date_range('2023-01-01', periods=n, freq='5min')
+    y = np.sin(np.arange(n) / 500) + rng.normal(0, 0.1, n)
+    y[min(12_345, n - 1)] = 50.0  # a single spike that must stay visible
+    return pd.DataFrame({'ds': ds, 'y': y})
+
+
+def test_lttb_keeps_endpoints_and_spike():
+    df = _series()
+    idx = lttb_indices(df['ds'].values, df['y'].values, 2000)
+    assert len(idx) == 2000
+    assert idx[0] == 0 and idx[-1] == len(df) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 12_345 in idx
+
+
+def test_minmax_keeps_extremes():
+    df = _series()
+    idx = minmax_indices(df['y'].values, 3000)
+    assert len(idx) <= 3000
+    assert df['y'].values[idx].max() == df['y'].max()
+    assert df['y'].values[idx].min() == df['y'].min()
+
+
+def test_downsample_small_input_untouched():
+    df = _series(100)
+    out = downsample(df, ['y'], max_points=500)
+    np.testing.assert_array_equal(out['y'][1], df['y'].values)
+
+
+def test_multiresolution_zoom():
+    df = _series()
+    pyramid = MultiResolutionSeries(df, ['y'])
+
+    overview = pyramid.query(max_points=4000)
+    assert len(overview) <= 4000
+    assert overview['y'].max() == 50.0
+
+    start = df['ds'].iloc[10_000]
+    end = df['ds'].iloc[11_000]
+    zoomed = pyramid.query(start, end, max_points=4000)
+    # Small ranges come straight from the raw level.
+    pd.testing.assert_frame_equal(
+        zoomed.reset_index(drop=True),
+        df.iloc[10_000:11_001].reset_index(drop=True),
+    )
@@ -0,0 +1,24 @@
+import numpy as np
+from src.ensemble import KPI_NAMES, run_ensemble
+
+
+def test_run_ensemble_parallel_matches_serial():
+    serial = run_ensemble(5, simulation_days=2, workers=1, seed=11)
+    parallel = run_ensemble(5, simulation_days=2, workers=2, seed=11)
+
+    assert list(serial.index) == list(KPI_NAMES)
+    assert (serial['count'] == 5).all()
+    assert {'mean', 'std', 'min', 'max', 'q5', 'q50', 'q95'} <= set(serial.columns)
+    np.testing.assert_allclose(parallel.values.astype(float),
+                               serial.values.astype(float), rtol=1e-9)
+    assert (serial.loc['soc_utilization', ['min', 'max']].between(0, 1)).all()
+
+
+def test_quantiles_independent_of_worker_count():
+    # More scenarios than the P-square initialisation (5), so the
+    # quantile estimates depend on the order rows are folded in.
+    serial = run_ensemble(9, simulation_days=1, workers=1, seed=3)
+    parallel = run_ensemble(9, simulation_days=1, workers=3, seed=3)
+    assert (serial['count'] == 9).all()
+    np.testing.assert_array_equal(parallel.values.astype(float),
+                                  serial.values.astype(float))
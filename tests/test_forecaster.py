@@ -1,6 +1,9 @@
 import pytest
 import pandas as pd
-from src.forecaster import DemandForecaster
+import numpy as np
+from src.forecaster import (
+    DemandForecaster, FORECAST_BACKENDS, forecast_many, register_backend
+)
 
 def test_forecaster_train_predict():
     # Create dummy history
@@ -19,3 +22,173 @@ def test_forecaster_not_trained():
     forecaster = DemandForecaster()
     with pytest.raises(ValueError):
         forecaster.predict(24)
+
+
+def test_harmonic_backend_train_predict():
+    dates = pd.date_range(start='2023-01-01', periods=24 * 21, freq='h')
+    hours = dates.hour.values
+    y = 500 + 100 * np.sin(2 * np.pi * hours / 24 - np.pi / 2)
+    history = pd.DataFrame({'ds': dates, 'y': y})
+
+    forecaster = DemandForecaster(backend='harmonic')
+    forecaster.train(history)
+    forecast = forecaster.predict(horizon_hours=48)
+
+    assert len(forecast) == 48
+    assert forecast['ds'].iloc[0] == dates[-1] + pd.Timedelta(hours=1)
+    expected = 500 + 100 * np.sin(2 * np.pi * forecast['ds'].dt.hour / 24 - np.pi / 2)
+    np.testing.assert_allclose(forecast['yhat'], expected, atol=1e-6)
+    assert (forecast['yhat_lower'] <= forecast['yhat']).all()
+    assert (forecast['yhat_upper'] >= forecast['yhat']).all()
+
+
+def test_harmonic_not_trained():
+    with pytest.raises(ValueError):
+        DemandForecaster(backend='harmonic').predict(24)
+
+
+def test_register_custom_backend():
+    class NaiveBackend:
+        name = 'naive'
+
+        def __init__(self, **params):
+            self.params = params
+            self.last = None
+
+        def fit(self, history_df):
+            self.last = history_df.iloc[-1]
+
+        def predict(self, horizon_hours):
+            ds = pd.date_range(self.last['ds'], periods=horizon_hours + 1, freq='h')[1:]
+            y = np.full(horizon_hours, self.last['y'])
+            return pd.DataFrame({'ds': ds, 'yhat': y, 'yhat_lower': y, 'yhat_upper': y})
+
+    register_backend(NaiveBackend)
+    try:
+        forecaster = DemandForecaster(backend='naive')
+        forecaster.train(pd.DataFrame({'ds': pd.date_range('2023-01-01', periods=3, freq='h'),
+                                       'y': [1.0, 2.0, 3.0]}))
+        assert (forecaster.predict(5)['yhat'] == 3.0).all()
+    finally:
+        FORECAST_BACKENDS.pop('naive')
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        DemandForecaster(backend='arima')
+
+
+def test_forecast_many_streams_results_and_isolates_failures():
+    dates = pd.date_range(start='2023-01-01', periods=24 * 7, freq='h')
+    series = {
+        f'feeder-{i}': pd.DataFrame({'ds': dates, 'y': 100.0 * (i + 1) + dates.hour})
+        for i in range(4)
+    }
+    series['broken'] = pd.DataFrame({'ds': dates[:0], 'y': []})
+
+    results = {r.series_id: r for r in forecast_many(series, horizon=12, workers=2,
+                                                     backend='harmonic')}
+
+    assert set(results) == set(series)
+    assert results['broken'].forecast is None
+    assert results['broken'].error is not None
+    for i in range(4):
+        forecast = results[f'feeder-{i}'].forecast
+        assert results[f'feeder-{i}'].error is None
+        assert len(forecast) == 12
+        assert forecast['ds'].iloc[0] == dates[-1] + pd.Timedelta(hours=1)
+
+
+def _rolling_demand(days, seed=0):
+    dates = pd.date_range(start='2023-01-01', periods=days * 24, freq='h')
+    rng = np.random.default_rng(seed)
+    y = (500 + 100 * np.sin(2 * np.pi * dates.hour.values / 24)
+         - 50 * (dates.dayofweek.values >= 5) + rng.normal(0, 10, len(dates)))
+    return pd.DataFrame({'ds': dates, 'y': y})
+
+
+def test_harmonic_update_matches_cold_fit():
+    data = _rolling_demand(40)
+    warm = DemandForecaster(backend='harmonic')
+    warm.train(data.iloc[:30 * 24])
+    for day in range(30, 40):
+        warm.update(data.iloc[day * 24:(day + 1) * 24], window='30D')
+
+    cold = DemandForecaster(backend='harmonic')
+    cold.train(data.iloc[10 * 24:])
+
+    np.testing.assert_allclose(
+        warm.predict(48)['yhat'].values, cold.predict(48)['yhat'].values, rtol=1e-8
+    )
+    assert warm.backend.sigma == pytest.approx(cold.backend.sigma, rel=1e-6)
+
+
+@pytest.mark.parametrize('revise', [False, True])
+def test_harmonic_warm_start_falls_back_to_cold_fit(revise):
+    data = _rolling_demand(40)
+    warm = DemandForecaster(backend='harmonic')
+    warm.train(data.iloc[5 * 24:35 * 24])
+    if revise:
+        # Same window, but revised demand values.
+        history = data.iloc[5 * 24:35 * 24].assign(
+            y=lambda df: df['y'] + 100.0
+        )
+    else:
+        # Starts inside the previous window but ends before it.
+        history = data.iloc[10 * 24:32 * 24]
+    warm.train(history, warm_start=True)
+
+    cold = DemandForecaster(backend='harmonic')
+    cold.train(history)
+    np.testing.assert_allclose(
+        warm.predict(48)['yhat'].values, cold.predict(48)['yhat'].values,
+        rtol=1e-8
+    )
+
+
+def test_prophet_warm_start_train():
+    data = _rolling_demand(4)
+    forecaster = DemandForecaster()
+    forecaster.train(data.iloc[:72])
+    forecaster.update(data.iloc[72:], window='3D')
+    forecast = forecaster.predict(24)
+    assert len(forecast) == 24
+    assert forecast['ds'].iloc[0] == data['ds'].iloc[-1] + pd.Timedelta(hours=1)
+
+
+def test_prophet_uncertainty_modes_predict_future_only():
+    history = _rolling_demand(7)
+    forecaster = DemandForecaster()
+    forecaster.train(history)
+    start = history['ds'].iloc[-1] + pd.Timedelta(hours=1)
+
+    for mode, samples in [('samples', 50), ('residual', None), ('off', None)]:
+        forecaster.uncertainty = mode
+        forecaster.uncertainty_samples = samples
+        forecast = forecaster.predict(24)
+        assert len(forecast) == 24 and forecast['ds'].iloc[0] == start
+        if mode == 'off':
+            assert forecast['yhat_lower'].isna().all()
+        else:
+            assert (forecast['yhat_lower'] < forecast['yhat']).all()
+            assert (forecast['yhat'] < forecast['yhat_upper']).all()
+    # The temporary sample count does not stick to the model.
+    assert forecaster.model.uncertainty_samples == 1000
+
+
+def test_harmonic_residual_interval_covers_new_data():
+    data = _rolling_demand(35, seed=3)
+    forecaster = DemandForecaster(
+        backend='harmonic', uncertainty='residual', interval_width=0.8
+    )
+    forecaster.train(data.iloc[:24 * 28])
+    forecast = forecaster.predict(24 * 7)
+    actual = data['y'].iloc[24 * 28:].values
+    inside = (actual >= forecast['yhat_lower'].values) & \
+        (actual <= forecast['yhat_upper'].values)
+    assert 0.7 < inside.mean() < 0.9
+
+
+def test_unknown_uncertainty_mode():
+    with pytest.raises(ValueError, match='uncertainty'):
+        DemandForecaster(backend='harmonic', uncertainty='bootstrap')
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_generator import generate_scenario_data
+from src.forecaster import DemandForecaster
+from src.ingest import MeteredDataSource, load_metered_data
+from src.simulation import SmartGridSimulation
+
+
+@pytest.fixture
+def recording():
+    """Two days of shuffled 15-minute data with SCADA-style names."""
+    data = generate_scenario_data(days=2, freq='15min', seed=0)
+    raw = data.rename(columns={'ds': 'timestamp', 'y': 'load_mw'})
+    return data, raw.sample(frac=1, random_state=0)
+
+
+@pytest.mark.parametrize('ext', ['csv', 'parquet'])
+def test_resamples_onto_hourly_grid(tmp_path, recording, ext):
+    data, raw = recording
+    path = tmp_path / f'meter.{ext}'
+    getattr(raw, f'to_{ext}')(path, index=False)
+
+    frame = load_metered_data(
+        path, columns={'ds': 'timestamp', 'y': 'load_mw'}, chunksize=50
+    )
+    expected = data.set_index('ds').resample('h').mean()
+    assert list(frame.columns) == ['ds', 'y', 'solar', 'wind', 'price']
+    np.testing.assert_allclose(frame['y'], expected['y'])
+    np.testing.assert_allclose(frame['solar'], expected['solar'])
+    assert frame.attrs['ingest']['rows_read'] == len(raw)
+
+
+def test_validation_and_gap_filling(tmp_path):
+    data = generate_scenario_data(days=2, seed=0)
+    data.loc[3, 'y'] = np.nan
+    data.loc[4, 'solar'] = -1.0
+    data = data.drop(index=range(10, 13))
+    path = tmp_path / 'meter.csv'
+    data.to_csv(path, index=False)
+
+    frame = load_metered_data(path, start='2023-01-01', periods=48)
+    report = frame.attrs['ingest']
+    assert report['invalid_values'] == 1 and report['out_of_range'] == 1
+    assert report['gaps_filled'] == 3 * 4 + 2 and not frame.isna().any().any()
+    # Linear interpolation across the three missing hours.
+    assert frame['y'].iloc[11] == pytest.approx(
+        (data.loc[9, 'y'] + data.loc[13, 'y']) / 2
+    )
+    with pytest.raises(ValueError, match='gaps'):
+        load_metered_data(path, max_gap=2)
+    with pytest.raises(ValueError, match='missing columns'):
+        load_metered_data(path, columns={'y': 'demand'})
+
+
+def test_short_coverage_is_not_padded(tmp_path):
+    path = tmp_path / 'meter.csv'
+    generate_scenario_data(days=2, seed=0).to_csv(path, index=False)
+
+    for fill in ('interpolate', 'ffill'):
+        with pytest.raises(ValueError, match='does not cover'):
+            load_metered_data(path, start='2023-01-01', periods=5 * 24,
+                              fill=fill)
+    frame = load_metered_data(path, start='2023-01-01', periods=5 * 24,
+                              fill='none')
+    assert frame['y'].iloc[48:].isna().all()
+    assert frame.attrs['ingest']['gaps_left'] == 4 * 3 * 24
+    with pytest.raises(ValueError, match='does not cover'):
+        MeteredDataSource(str(path), fill='none').load(days=5)
+
+
+def test_simulation_runs_on_metered_data(tmp_path):
+    generate_scenario_data(days=4, seed=0).to_parquet(tmp_path / 'm.parquet')
+    kwargs = dict(
+        simulation_days=2, forecaster=DemandForecaster(backend='harmonic'),
+        verbose=False
+    )
+    metered = SmartGridSimulation(
+        data_source=MeteredDataSource(str(tmp_path / 'm.parquet')), **kwargs
+    ).run()
+    synthetic = SmartGridSimulation(seed=0, **kwargs).run()
+    pd.testing.assert_frame_equal(metered, synthetic)
@@ -0,0 +1,74 @@
+import json
+import logging
+
+import pytest
+
+from src.forecaster import DemandForecaster
+from src.instrumentation import (
+    Instrumentation, JsonLinesSink, LoggingSink, MemorySink
+)
+from src.results_store import read_results, write_results
+from src.simulation import PIPELINE_STAGES, SmartGridSimulation
+
+
+def test_stage_records_time_memory_and_rows():
+    sink = MemorySink()
+    inst = Instrumentation(sinks=[sink])
+    with inst.stage('build') as stage:
+        data = [0.0] * 100_000
+        stage.rows = len(data)
+
+    (record,) = sink.records
+    assert record.stage == 'build' and record.rows == 100_000
+    assert record.wall_seconds > 0 and record.cpu_seconds >= 0
+    assert record.peak_bytes >= 800_000
+    assert record.rows_per_second == pytest.approx(
+        100_000 / record.wall_seconds
+    )
+
+
+def test_nested_stage_keeps_outer_peak():
+    inst = Instrumentation()
+    with inst.stage('outer'):
+        data = [0.0] * 1_000_000
+        del data
+        with inst.stage('inner'):
+            small = [0.0] * 1_000
+        del small
+
+    inner, outer = inst.records
+    assert inner.stage == 'inner' and inner.peak_bytes < 1_000_000
+    # The inner stage's reset must not hide the outer 8 MB allocation.
+    assert outer.peak_bytes >= 8_000_000
+
+
+def test_simulation_attaches_stages_and_profile(tmp_path, caplog):
+    path = tmp_path / 'stages.jsonl'
+    inst = Instrumentation(
+        sinks=[JsonLinesSink(str(path)), LoggingSink()],
+        profile_stage='train'
+    )
+    sim = SmartGridSimulation(
+        simulation_days=2, forecaster=DemandForecaster(backend='harmonic'),
+        seed=0, verbose=False, instrumentation=inst
+    )
+    with caplog.at_level(logging.INFO, logger='src.instrumentation'):
+        results = sim.run()
+
+    summary = results.attrs['instrumentation']
+    assert [s['stage'] for s in summary['stages']] == list(PIPELINE_STAGES)
+    assert summary['stages'][0]['rows'] == 4 * 24
+    assert 'fit' in summary['profiles']['train']
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)['stage'] for line in lines] == \
+        list(PIPELINE_STAGES)
+    assert len(caplog.records) == len(PIPELINE_STAGES)
+
+    # Attached measurements survive a round trip through the store.
+    write_results(results, root=str(tmp_path), run_id='r1')
+    assert len(read_results(root=str(tmp_path), run_id='r1')) == 2 * 24
+
+
+def test_unknown_profiler():
+    with pytest.raises(ValueError, match='Unknown profiler'):
+        Instrumentation(profiler='perf')
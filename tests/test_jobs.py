@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from src.jobs import SimulationJobManager
+from src.simulation import (
+    PIPELINE_STAGES, SimulationCancelled, SmartGridSimulation
+)
+from src.forecaster import DemandForecaster
+
+
+def test_run_reports_every_stage():
+    seen = []
+    sim = SmartGridSimulation(
+        simulation_days=2, forecaster=DemandForecaster(backend='harmonic'),
+        seed=0, verbose=False
+    )
+    sim.run(progress=lambda stage, fraction: seen.append((stage, fraction)))
+
+    assert [stage for stage, _ in seen] == list(PIPELINE_STAGES) + ['done']
+    fractions = [fraction for _, fraction in seen]
+    assert fractions == sorted(fractions) and fractions[-1] == 1.0
+
+
+def test_run_stops_when_cancelled():
+    sim = SmartGridSimulation(simulation_days=2, seed=0, verbose=False)
+    with pytest.raises(SimulationCancelled):
+        sim.run(should_cancel=lambda: True)
+
+
+def test_manager_caches_seeded_runs():
+    manager = SimulationJobManager(cache_size=1)
+    params = dict(simulation_days=2, seed=3, forecaster_backend='harmonic')
+    job = manager.submit(**params)
+    results = job.result(timeout=60)
+
+    assert job.status == 'done' and job.progress == 1.0
+    assert manager.submit(**params) is job
+    assert len(results) == 2 * 24
+
+    # Each reader gets its own frame; edits do not leak into the cache.
+    results['cost'] = 0.0
+    cached = manager.submit(**params).result()
+    assert cached is not results and (cached['cost'] != 0.0).any()
+    assert cached.attrs['metrics'] == results.attrs['metrics']
+
+    other = manager.submit(**dict(params, seed=4))
+    other.result(timeout=60)
+    assert manager.cached_keys() == [other.key]
+    manager.shutdown()
+
+
+def test_manager_dedups_and_cancels_in_flight_runs():
+    manager = SimulationJobManager()
+    gate = threading.Event()
+    blocker = manager._executor.submit(gate.wait)  # Keep the worker busy.
+
+    job = manager.submit(simulation_days=2, forecaster_backend='harmonic')
+    assert manager.submit(simulation_days=2,
+                          forecaster_backend='harmonic') is job
+    job.cancel()
+    # Cancelled before it started: no longer tracked as in flight.
+    assert job.key not in manager._active
+    gate.set()
+    blocker.result()
+
+    assert job.status == 'cancelled'
+    assert manager.submit(simulation_days=2,
+                          forecaster_backend='harmonic') is not job
+    manager.shutdown()
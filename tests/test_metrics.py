@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.forecaster import DemandForecaster
+from src.metrics import (
+    NUMBA_AVAILABLE, DegradationModel, batch_cycle_metrics, cycle_metrics,
+    rainflow
+)
+from src.optimizer import GridOptimizer
+from src.simulation import SmartGridSimulation
+
+KERNELS = [False] + ([True] if NUMBA_AVAILABLE else [])
+
+
+@pytest.mark.parametrize('use_numba', KERNELS)
+def test_rainflow_matches_astm_example(use_numba):
+    # ASTM E1049-85 (2017), Table X1.4.
+    ranges, counts = rainflow(
+        [-2, 1, -3, 5, -1, 3, -4, 4, -2], use_numba=use_numba
+    )
+    totals = {}
+    for r, c in zip(ranges, counts):
+        totals[r] = totals.get(r, 0) + c
+    assert totals == {3: 0.5, 4: 1.5, 6: 0.5, 8: 1.0, 9: 0.5}
+
+
+def test_full_cycles_and_wear_curve():
+    # Two full 0 -> 100 -> 0 cycles of a 100 MWh battery starting empty.
+    soc = [50, 100, 50, 0, 50, 100, 50, 0]
+    deep = cycle_metrics(soc, 100, initial_soc=0)
+    assert deep['equivalent_full_cycles'] == pytest.approx(2.0)
+    assert deep['degradation_cost'] == pytest.approx(
+        2 / 5000 * 100 * 150.0
+    )
+    # Same throughput in shallow cycles wears less when exponent > 1.
+    shallow = cycle_metrics([75, 50] * 8, 100, initial_soc=50)
+    assert shallow['equivalent_full_cycles'] == pytest.approx(2.0)
+    assert shallow['life_used'] < deep['life_used']
+    linear = cycle_metrics(
+        [75, 50] * 8, 100, initial_soc=50,
+        model=DegradationModel(dod_exponent=1.0)
+    )
+    assert linear['life_used'] == pytest.approx(deep['life_used'])
+
+
+def test_batch_matches_single_traces_and_kernels():
+    rng = np.random.default_rng(0)
+    soc = np.cumsum(rng.normal(size=(20, 200)), axis=1) + 50
+    capacity = rng.uniform(80, 120, 20)
+    table = batch_cycle_metrics(soc, capacity, use_numba=False)
+    assert table.iloc[3].to_dict() == pytest.approx(
+        cycle_metrics(soc[3], capacity[3], use_numba=False)
+    )
+    if NUMBA_AVAILABLE:
+        np.testing.assert_allclose(
+            batch_cycle_metrics(soc.T.copy().T, capacity, use_numba=True),
+            table
+        )
+
+
+def test_batch_summary_and_simulation_report_degradation():
+    rng = np.random.default_rng(1)
+    net_load = rng.normal(100, 50, 96)
+    prices = rng.uniform(0.1, 0.3, 96)
+    batch = GridOptimizer().optimize_dispatch_batch(
+        net_load, prices, battery_capacity=[50, 100, 200]
+    )
+    summary = batch.summary(prices)
+    np.testing.assert_allclose(
+        summary['cost'], (batch.grid_import * prices).sum(axis=1)
+    )
+    assert (summary['equivalent_full_cycles'] > 0).all()
+
+    results = SmartGridSimulation(
+        simulation_days=2, forecaster=DemandForecaster(backend='harmonic'),
+        seed=0, verbose=False
+    ).run()
+    metrics = results.attrs['metrics']
+    assert metrics['cost'] == pytest.approx(results['cost'].sum())
+    assert metrics['degradation_cost'] > 0
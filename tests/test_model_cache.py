@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.forecaster import DemandForecaster
+from src.model_cache import ModelCache
+
+
+def _history(days=21, level=500):
+    dates = pd.date_range(start='2023-01-01', periods=days * 24, freq='h')
+    y = level + 100 * np.sin(2 * np.pi * dates.hour.values / 24)
+    return pd.DataFrame({'ds': dates, 'y': y})
+
+
+@pytest.mark.parametrize("backend", ["harmonic", "prophet"])
+def test_cache_hit_returns_same_forecast(tmp_path, backend):
+    cache = ModelCache(directory=str(tmp_path))
+    history = _history(days=3)
+
+    first = DemandForecaster(backend=backend, cache=cache)
+    first.train(history)
+    assert cache.stats()['misses'] == 1
+
+    second = DemandForecaster(backend=backend, cache=cache)
+    second.train(history)
+    assert cache.hits == 1
+
+    pd.testing.assert_frame_equal(
+        first.predict(24)[['ds', 'yhat']].reset_index(drop=True),
+        second.predict(24)[['ds', 'yhat']].reset_index(drop=True),
+    )
+
+
+def test_cache_key_depends_on_data_and_params():
+    history = _history()
+    key = ModelCache.make_key(history, 'harmonic', {'daily_order': 4})
+    assert key == ModelCache.make_key(history.copy(), 'harmonic', {'daily_order': 4})
+    assert key != ModelCache.make_key(_history(level=501), 'harmonic', {'daily_order': 4})
+    assert key != ModelCache.make_key(history, 'harmonic', {'daily_order': 3})
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ModelCache(directory=str(tmp_path), max_entries=2)
+    for level in (100, 200, 300):
+        DemandForecaster(backend='harmonic', cache=cache).train(_history(level=level))
+
+    stats = cache.stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 1
+    assert stats['misses'] == 3
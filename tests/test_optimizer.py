@@ -1,7 +1,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from src.optimizer import GridOptimizer
+from src.optimizer import GridOptimizer, RollingDispatcher
 
 def test_optimizer_dispatch():
     optimizer = GridOptimizer(battery_capacity=100, max_power=50)
@@ -25,3 +25,203 @@ def test_optimizer_dispatch():
     net_load[2] = -200 # Huge excess
     results = optimizer.optimize_dispatch(net_load, prices)
     assert results['battery_flow'][2] <= 50 # Max power constraint
+
+
+def _reference_dispatch(optimizer, net_load, prices):
+    # Original per-hour loop, kept as the ground truth for the kernel.
+    n = len(net_load)
+    battery_flow = np.zeros(n)
+    soc = np.zeros(n)
+    current_soc = optimizer.battery_capacity * 0.5
+    price_low = np.percentile(prices, 25)
+    price_high = np.percentile(prices, 75)
+    load_peak = np.percentile(net_load, 90)
+    for i in range(n):
+        load = net_load.iloc[i]
+        price = prices.iloc[i]
+        action = 0
+        if load < 0:
+            action = -load
+        elif load > load_peak:
+            action = -(load - load_peak)
+        elif price > price_high:
+            action = -optimizer.max_power
+        elif price < price_low:
+            action = optimizer.max_power
+        action = np.clip(action, -optimizer.max_power, optimizer.max_power)
+        if action > 0:
+            max_possible_charge = (
+                (optimizer.battery_capacity - current_soc) / optimizer.efficiency
+            )
+            action = min(action, max_possible_charge)
+            current_soc += action * optimizer.efficiency
+        else:
+            max_possible_discharge = current_soc * optimizer.efficiency
+            if abs(action) > max_possible_discharge:
+                action = -max_possible_discharge
+            current_soc += action / optimizer.efficiency
+        battery_flow[i] = action
+        soc[i] = current_soc
+    return battery_flow, soc
+
+
+@pytest.mark.parametrize("use_numba", [False, None])
+def test_dispatch_kernel_matches_reference(use_numba):
+    rng = np.random.default_rng(42)
+    n = 24 * 14
+    hours = np.arange(n) % 24
+    net_load = pd.Series(300 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 80, n))
+    prices = pd.Series(0.1 + 0.05 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 0.01, n))
+
+    optimizer = GridOptimizer(battery_capacity=120, max_power=40,
+                              efficiency=0.85, use_numba=use_numba)
+    results = optimizer.optimize_dispatch(net_load, prices)
+    expected_flow, expected_soc = _reference_dispatch(optimizer, net_load, prices)
+
+    # The kernel clamps the SoC to [0, capacity], where the original loop
+    # can drift an ulp outside, so compare with a tight tolerance.
+    np.testing.assert_allclose(
+        results['battery_flow'].values, expected_flow, rtol=0, atol=1e-9
+    )
+    np.testing.assert_allclose(
+        results['soc'].values, expected_soc, rtol=0, atol=1e-9
+    )
+    np.testing.assert_allclose(
+        results['grid_import'].values, (net_load + expected_flow).values,
+        rtol=0, atol=1e-9
+    )
+
+
+def test_soc_stays_within_bounds_despite_rounding():
+    # Draining or filling the battery completely must land exactly on the
+    # bounds, not one ulp outside them.
+    optimizer = GridOptimizer(battery_capacity=100, max_power=1000, efficiency=0.9)
+    # Charging 26.4 MW then draining gives 50 + 23.76 - 73.76 * 0.9 / 0.9,
+    # which is -1.4e-14 in floating point without the clamp.
+    net_load = pd.Series([-26.4, 1000.0] + [0.0] * 22)
+    prices = pd.Series(np.full(24, 0.1))
+    results = optimizer.optimize_dispatch(net_load, prices)
+    assert results['soc'][1] == 0.0
+    assert results['soc'].min() >= 0
+    assert results['soc'].max() <= 100
+
+
+def test_optimize_dispatch_batch_matches_single():
+    rng = np.random.default_rng(7)
+    n = 24 * 7
+    hours = np.arange(n) % 24
+    net_load = pd.Series(250 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 60, n))
+    prices = pd.Series(0.1 + 0.05 * np.cos(2 * np.pi * hours / 24))
+
+    capacities = np.array([50.0, 100.0, 200.0])
+    powers = np.array([10.0, 50.0, 80.0])
+    efficiencies = np.array([0.95, 0.9, 0.8])
+
+    batch = GridOptimizer().optimize_dispatch_batch(
+        net_load, prices, battery_capacity=capacities,
+        max_power=powers, efficiency=efficiencies
+    )
+    assert len(batch) == 3
+    assert batch.soc.shape == (3, n)
+
+    for i in range(3):
+        single = GridOptimizer(capacities[i], powers[i], efficiencies[i])
+        expected = single.optimize_dispatch(net_load, prices)
+        np.testing.assert_array_equal(batch.battery_flow[i], expected['battery_flow'])
+        np.testing.assert_array_equal(batch.soc[i], expected['soc'])
+        np.testing.assert_array_equal(batch.grid_import[i], expected['grid_import'])
+
+
+def test_optimize_dispatch_batch_2d_net_load():
+    rng = np.random.default_rng(3)
+    loads = rng.normal(0, 100, size=(4, 48))
+    prices = rng.uniform(0.05, 0.2, 48)
+
+    batch = GridOptimizer(battery_capacity=80).optimize_dispatch_batch(loads, prices)
+    for i in range(4):
+        expected = GridOptimizer(battery_capacity=80).optimize_dispatch(
+            pd.Series(loads[i]), pd.Series(prices)
+        )
+        pd.testing.assert_frame_equal(batch.to_frame(i), expected)
+
+
+def _daily_profile(n, seed):
+    rng = np.random.default_rng(seed)
+    hours = np.arange(n) % 24
+    net_load = pd.Series(200 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 50, n))
+    prices = pd.Series(np.where((hours >= 16) & (hours < 20), 0.20, 0.08)
+                       + rng.normal(0, 0.005, n))
+    return net_load, prices
+
+
+@pytest.mark.parametrize("method", ["lp", "dp"])
+def test_exact_methods_beat_heuristic(method):
+    net_load, prices = _daily_profile(24 * 5, seed=1)
+    heuristic = GridOptimizer().optimize_dispatch(net_load, prices)
+    exact = GridOptimizer(method=method).optimize_dispatch(net_load, prices)
+
+    assert (exact['grid_import'] * prices).sum() <= (heuristic['grid_import'] * prices).sum()
+    assert exact['soc'].min() >= -1e-6
+    assert exact['soc'].max() <= 100 + 1e-6
+    assert exact['battery_flow'].abs().max() <= 50 + 1e-6
+
+    # SoC balance: charging stores flow * eff, discharging removes flow / eff.
+    flow = exact['battery_flow'].values
+    delta = np.diff(np.concatenate([[50.0], exact['soc'].values]))
+    expected = np.where(flow > 0, flow * 0.9, flow / 0.9)
+    np.testing.assert_allclose(delta, expected, atol=1e-6)
+
+
+def test_dp_close_to_lp():
+    net_load, prices = _daily_profile(24 * 3, seed=2)
+    lp = GridOptimizer(method="lp").optimize_dispatch(net_load, prices)
+    dp = GridOptimizer(method="dp", soc_levels=201).optimize_dispatch(net_load, prices)
+    lp_cost = (lp['grid_import'] * prices).sum()
+    dp_cost = (dp['grid_import'] * prices).sum()
+    assert lp_cost <= dp_cost + 1e-6
+    assert dp_cost - lp_cost < 0.01 * abs(lp_cost)
+
+
+@pytest.mark.parametrize("method", ["lp", "dp"])
+def test_negative_prices_keep_flow_and_soc_consistent(method):
+    net_load, prices = _daily_profile(48, seed=3)
+    prices = prices - 0.12  # Off-peak hours now pay consumers to import.
+    optimizer = GridOptimizer(method=method, efficiency=0.9)
+    results = optimizer.optimize_dispatch(net_load, prices)
+
+    flow = results['battery_flow'].to_numpy()
+    soc = np.concatenate([[50.0], results['soc'].to_numpy()])
+    expected = np.where(flow > 0, flow * 0.9, flow / 0.9)
+    np.testing.assert_allclose(np.diff(soc), expected, atol=1e-6)
+
+    plan_flow, plan_soc = RollingDispatcher(optimizer, window=48).plan(
+        net_load.to_numpy(), prices.to_numpy(), 50.0
+    )
+    np.testing.assert_allclose(plan_flow, flow, atol=1e-6)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        GridOptimizer(method="milp")
+
+
+def test_too_few_soc_levels():
+    with pytest.raises(ValueError):
+        GridOptimizer(method="dp", soc_levels=1)
+
+
+@pytest.mark.parametrize("method", ["heuristic", "lp", "dp"])
+def test_rolling_dispatcher_matches_full_solve(method):
+    # A single window covering the whole horizon is the open-loop solve;
+    # repeated windows reuse the cached LP matrix / DP tables.
+    net_load, prices = _daily_profile(24, seed=4)
+    optimizer = GridOptimizer(method=method, use_numba=False)
+    dispatcher = RollingDispatcher(optimizer, window=24)
+    expected = optimizer.optimize_dispatch(net_load, prices)
+    for _ in range(2):
+        flow, soc = dispatcher.plan(
+            net_load.to_numpy(), prices.to_numpy(), 50.0
+        )
+        np.testing.assert_allclose(flow, expected['battery_flow'], atol=1e-6)
+        np.testing.assert_allclose(soc, expected['soc'], atol=1e-6)
+
@@ -0,0 +1,85 @@
+import pandas as pd
+
+from src.forecaster import DemandForecaster
+from src.optimizer import GridOptimizer
+from src.pipeline import StageCache, content_digest
+from src.simulation import SmartGridSimulation
+
+
+def _run(cache, battery_capacity=100, seed=0, mode='open_loop'):
+    sim = SmartGridSimulation(
+        simulation_days=2, forecaster=DemandForecaster(backend='harmonic'),
+        optimizer=GridOptimizer(battery_capacity=battery_capacity),
+        seed=seed, verbose=False, stage_cache=cache, mode=mode
+    )
+    return sim.run()
+
+
+def _events(cache):
+    return [(event, stage) for _, event, stage, _ in cache.events]
+
+
+def test_battery_change_only_recomputes_dispatch():
+    cache = StageCache()
+    _run(cache)
+    cache.events.clear()
+    results = _run(cache, battery_capacity=150)
+
+    misses = [stage for event, stage in _events(cache) if event == 'miss']
+    assert misses == ['dispatch', 'assemble']
+    pd.testing.assert_frame_equal(
+        results, _run(None, battery_capacity=150)
+    )
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    first = _run(StageCache(str(tmp_path)))
+    cache = StageCache(str(tmp_path))
+    second = _run(cache)
+    assert cache.stats()['hit_disk'] == 6 and 'miss' not in cache.stats()
+    pd.testing.assert_frame_equal(first, second)
+    assert {entry['tier'] for entry in cache.entries()} == {'memory', 'disk'}
+
+    # Returned frames are copies; editing one must not touch the cache.
+    second['cost'] = 0.0
+    pd.testing.assert_frame_equal(_run(cache), first)
+
+
+def test_unseeded_runs_are_not_cached():
+    cache = StageCache()
+    _run(cache, seed=None)
+    assert cache.stats()['memory_entries'] == 0
+
+
+def test_invalidated_stage_with_same_output_keeps_later_stages():
+    cache = StageCache()
+    _run(cache)
+    assert cache.invalidate('train') == 1
+    cache.events.clear()
+    _run(cache)
+    events = _events(cache)
+    assert ('miss', 'train') in events
+    assert ('hit_memory', 'forecast') in events
+
+
+def test_memory_eviction_is_logged():
+    cache = StageCache(max_memory_entries=2)
+    _run(cache)
+    assert cache.stats()['evict_memory'] == 4
+    assert len(cache.entries()) == 2
+
+
+def test_rolling_mode_reuses_serialized_model():
+    cache = StageCache()
+    _run(cache, mode='rolling')
+    results = _run(cache, battery_capacity=80, mode='rolling')
+    assert ('hit_memory', 'train') in _events(cache)
+    pd.testing.assert_frame_equal(
+        results, _run(None, battery_capacity=80, mode='rolling')
+    )
+
+
+def test_content_digest_ignores_object_identity():
+    frame = pd.DataFrame({'a': [1.0, 2.0]})
+    assert content_digest((frame, 'x')) == content_digest((frame.copy(), 'x'))
+    assert content_digest(frame) != content_digest(frame.assign(a=[1.0, 3.0]))
@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+from src.results_store import (
+    export_csv, list_runs, list_scenarios, read_results, write_results
+)
+
+pytest.importorskip("pyarrow")
+
+
+def _results(n=48, offset=0.0):
+    return pd.DataFrame({
+        'ds': pd.date_range('2023-01-01', periods=n, freq='h'),
+        'grid_import': [100.0 + offset + i for i in range(n)],
+        'soc': [50.0] * n,
+        'price': [0.1] * n,
+    })
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_round_trip_keeps_dtypes(tmp_path, fmt):
+    df = _results()
+    write_results(df, root=str(tmp_path), run_id='r1', format=fmt)
+
+    loaded = read_results(root=str(tmp_path), run_id='r1')
+    pd.testing.assert_frame_equal(loaded, df)
+    assert pd.api.types.is_datetime64_any_dtype(loaded['ds'])
+
+    projected = read_results(root=str(tmp_path), run_id='r1', columns=['ds', 'soc'])
+    assert list(projected.columns) == ['ds', 'soc']
+
+
+def test_scenario_partitions(tmp_path):
+    root = str(tmp_path)
+    write_results(_results(offset=0), root=root, run_id='sweep', scenario='a')
+    write_results(_results(offset=1), root=root, run_id='sweep', scenario='b')
+
+    assert list_runs(root) == ['sweep']
+    assert list_scenarios(root, 'sweep') == ['a', 'b']
+    one = read_results(root=root, run_id='sweep', scenario='b')
+    assert one['grid_import'].iloc[0] == 101.0
+
+    everything = read_results(root=root, run_id='sweep', columns=['grid_import'])
+    assert len(everything) == 96
+    assert set(everything['scenario']) == {'a', 'b'}
+
+
+def test_missing_run_and_csv_export(tmp_path):
+    root = str(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        read_results(root=root, run_id='nope')
+
+    write_results(_results(), root=root)
+    out = export_csv(str(tmp_path / 'out.csv'), root=root)
+    assert len(pd.read_csv(out)) == 48
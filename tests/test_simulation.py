@@ -1,6 +1,8 @@
 import pytest
+import numpy as np
 import pandas as pd
-from src.simulation import SmartGridSimulation
+from src.forecaster import DemandForecaster
+from src.simulation import SmartGridSimulation, memory_report
 
 def test_simulation_run():
     # Run a short simulation (e.g., 2 days) to save time
@@ -36,3 +38,62 @@ def test_simulation_run():
     # The optimizer doc says SoC constraints.
     assert results['soc'].min() >= 0
     assert results['soc'].max() <= 100 # Assuming 100 is max, or check optimizer config
+
+
+def test_simulation_with_harmonic_forecaster():
+    sim = SmartGridSimulation(
+        simulation_days=2, forecaster=DemandForecaster(backend='harmonic')
+    )
+    results = sim.run()
+    assert len(results) == 2 * 24
+    assert not results.isnull().values.any()
+
+
+def test_rolling_mode():
+    from src.optimizer import GridOptimizer
+    sim = SmartGridSimulation(
+        simulation_days=2, forecaster=DemandForecaster(backend='harmonic'),
+        optimizer=GridOptimizer(method='dp'), seed=5, verbose=False,
+        mode='rolling', mpc_window=12, mpc_step=2, mpc_refit_every=6
+    )
+    results = sim.run()
+    assert len(results) == 2 * 24
+    assert not results.isnull().values.any()
+    assert results['soc'].between(0, 100).all()
+    assert results['battery_flow'].abs().max() <= 50 + 1e-6
+    grid = results['net_load'] + results['battery_flow']
+    assert np.allclose(results['grid_import'], grid)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        SmartGridSimulation(mode='closed_loop')
+
+
+@pytest.mark.parametrize('options', [
+    dict(mpc_window=0, mpc_step=1),
+    dict(mpc_window=2, mpc_step=0),
+    dict(mpc_window=2, mpc_step=6),
+    dict(mpc_refit_every=0),
+])
+def test_invalid_mpc_parameters(options):
+    # mpc_step > mpc_window would leave hours of the results unwritten.
+    with pytest.raises(ValueError):
+        SmartGridSimulation(mode='rolling', **options)
+
+
+def test_compact_mode_halves_result_memory():
+    def run(compact):
+        return SmartGridSimulation(
+            simulation_days=2, forecaster=DemandForecaster(backend='harmonic'),
+            seed=7, verbose=False, compact=compact
+        ).run()
+
+    full, compact = run(False), run(True)
+    assert 'y' not in compact.columns
+    assert (compact.drop(columns='ds').dtypes == np.float32).all()
+    for col in ['actual_demand', 'grid_import', 'soc', 'cost', 'net_load']:
+        np.testing.assert_allclose(compact[col], full[col], rtol=1e-3, atol=1e-3)
+    assert memory_report(compact)['bytes_per_hour'] <= \
+        0.55 * memory_report(full)['bytes_per_hour']
+
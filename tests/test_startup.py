@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Generous bound: interpreter start-up plus the lazy package import.
+# Eagerly importing Prophet/cmdstanpy takes several times longer.
+MAX_IMPORT_SECONDS = 1.5
+
+
+def _run(code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+
+def test_import_src_is_fast():
+    assert _run("import src") < MAX_IMPORT_SECONDS
+
+
+def test_optimizer_and_generators_do_not_load_prophet():
+    _run(
+        "import sys, src\n"
+        "src.GridOptimizer().optimize_dispatch\n"
+        "src.generate_demand_data\n"
+        "src.DemandForecaster(backend='harmonic')\n"
+        "assert 'prophet' not in sys.modules, 'prophet was imported'\n"
+    )
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from src.streaming_stats import P2Quantile, RunningStats, SlidingQuantile
+
+
+def test_running_stats_matches_numpy():
+    values = np.random.default_rng(0).normal(100, 15, 5000)
+    stats = RunningStats()
+    for x in values:
+        stats.update(x)
+    assert stats.count == 5000
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.std == pytest.approx(values.std(ddof=1))
+    assert stats.min == values.min()
+    assert stats.max == values.max()
+
+
+@pytest.mark.parametrize("p", [0.05, 0.5, 0.95])
+def test_p2_quantile_close_to_exact(p):
+    values = np.random.default_rng(1).normal(0, 1, 20000)
+    estimator = P2Quantile(p)
+    for x in values:
+        estimator.update(x)
+    assert estimator.value == pytest.approx(np.quantile(values, p), abs=0.05)
+
+
+def test_p2_quantile_exact_for_few_values():
+    estimator = P2Quantile(0.5)
+    for x in [3.0, 1.0, 2.0]:
+        estimator.update(x)
+    assert estimator.value == 2.0
+
+
+def test_sliding_quantile_matches_numpy_on_window():
+    values = np.random.default_rng(2).normal(0, 1, 1000)
+    window = SlidingQuantile(100)
+    for i, x in enumerate(values):
+        window.update(x)
+        if i % 97 == 0:
+            recent = values[max(0, i - 99):i + 1]
+            for p in (0.1, 0.5, 0.9):
+                assert window.quantile(p) == pytest.approx(np.quantile(recent, p))
+    assert len(window) == 100
+
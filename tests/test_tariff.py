@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.forecaster import DemandForecaster
+from src.optimizer import GridOptimizer
+from src.simulation import SmartGridSimulation
+from src.tariff import TOU_TARIFF, Tariff, TariffPeriod
+
+
+def _old_tou(hour):
+    return np.select(
+        [(hour >= 16) & (hour < 20),
+         ((hour >= 6) & (hour < 16)) | ((hour >= 20) & (hour < 22))],
+        [0.20, 0.10],
+        default=0.05,
+    )
+
+
+def test_tou_tariff_matches_price_tiers():
+    ds = pd.date_range('2023-01-01', periods=24 * 400, freq='h')
+    np.testing.assert_array_equal(
+        TOU_TARIFF.energy_rates(ds), _old_tou(ds.hour.to_numpy())
+    )
+
+
+def test_schedule_months_day_types_and_holidays():
+    tariff = Tariff(
+        base_rate=0.08,
+        energy=[TariffPeriod(0.30, hours=(16, 21), months=[7],
+                             day_types=('weekday',)),
+                TariffPeriod(0.04, hours=(22, 6))],
+        holidays=['2023-07-04'],
+    )
+    ds = pd.DatetimeIndex([
+        '2023-07-03 17:00',  # Monday on-peak
+        '2023-07-04 17:00',  # holiday
+        '2023-07-08 17:00',  # Saturday
+        '2023-08-01 17:00',  # outside the summer months
+        '2023-08-01 23:00',  # overnight, wraps midnight
+        '2023-08-02 03:00',
+    ])
+    np.testing.assert_allclose(
+        tariff.energy_rates(ds), [0.30, 0.08, 0.08, 0.08, 0.04, 0.04]
+    )
+    with pytest.raises(ValueError):
+        tariff.energy_rates(ds[::-1])
+
+
+def test_demand_charges_match_monthly_resample():
+    rng = np.random.default_rng(0)
+    ds = pd.date_range('2023-01-01', periods=24 * 90, freq='h')
+    load = rng.normal(100, 40, len(ds))
+    tariff = Tariff(
+        base_rate=0.1,
+        demand=[TariffPeriod(10.0), TariffPeriod(5.0, hours=(16, 20))],
+    )
+    monthly = tariff.monthly_bill(ds, load)
+
+    series = pd.Series(load, index=ds)
+    on_peak = series[(ds.hour >= 16) & (ds.hour < 20)]
+    expected = (
+        10.0 * series.resample('MS').max()
+        + 5.0 * on_peak.resample('MS').max()
+    )
+    np.testing.assert_allclose(monthly['demand_charge'], expected)
+    np.testing.assert_allclose(
+        monthly['energy_cost'], (series * 0.1).resample('MS').sum()
+    )
+    bill = tariff.bill(ds, load)
+    assert bill['total'].iloc[0] == pytest.approx(monthly['total'].sum())
+
+
+def test_real_time_prices_hold_until_next_and_scale_with_step():
+    real_time = pd.DataFrame({
+        'ds': pd.to_datetime(['2023-01-01 00:00', '2023-01-01 01:00']),
+        'price': [0.02, 0.05],
+    })
+    tariff = Tariff(base_rate=0.1, real_time=real_time)
+    ds = pd.date_range('2023-01-01', periods=8, freq='15min')
+    rates = tariff.energy_rates(ds)
+    np.testing.assert_allclose(rates, [0.12] * 4 + [0.15] * 4)
+    bill = tariff.bill(ds, np.full(8, 100.0))
+    assert bill['energy_cost'].iloc[0] == pytest.approx(
+        100.0 * 0.25 * rates.sum()
+    )
+    with pytest.raises(ValueError):
+        tariff.energy_rates(ds - pd.Timedelta('1h'))
+
+
+def test_batch_bill_matches_single_profiles():
+    rng = np.random.default_rng(1)
+    ds = pd.date_range('2023-01-30', periods=24 * 5, freq='h')
+    prices = TOU_TARIFF.energy_rates(ds)
+    batch = GridOptimizer().optimize_dispatch_batch(
+        rng.normal(100, 50, len(ds)), prices,
+        battery_capacity=[0, 100, 200]
+    )
+    tariff = Tariff(base_rate=0.05, demand=[TariffPeriod(12.0)])
+    bill = tariff.bill(ds, batch.grid_import)
+    assert len(bill) == 3
+    for row in range(3):
+        single = tariff.bill(ds, batch.grid_import[row])
+        np.testing.assert_allclose(bill.iloc[row], single.iloc[0])
+
+
+def test_simulation_bills_at_tariff():
+    tariff = Tariff(
+        base_rate=0.07, energy=[TariffPeriod(0.25, hours=(17, 21))],
+        demand=[TariffPeriod(9.0)],
+    )
+    results = SmartGridSimulation(
+        simulation_days=2, forecaster=DemandForecaster(backend='harmonic'),
+        seed=0, verbose=False, tariff=tariff
+    ).run()
+    np.testing.assert_allclose(
+        results['price'], tariff.energy_rates(results['ds'])
+    )
+    metrics = results.attrs['metrics']
+    assert metrics['demand_charge'] == pytest.approx(
+        9.0 * max(results['grid_import'].max(), 0.0)
+    )